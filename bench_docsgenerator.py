@@ -0,0 +1,301 @@
+import argparse
+import json
+import math
+import os
+import re
+import sys
+import time
+import tracemalloc
+
+import docsgenerator
+
+OPERATIONS = ["store", "update", "index", "show", "delete"]
+
+
+def _field_name(index):
+    """Letters-only field name, since the extractor only matches [a-zA-Z_] names."""
+    letters = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(ord("a") + remainder) + letters
+    return f"field_{letters}"
+
+
+def synthetic_controller(methods=5, fields=10, module="Procedure"):
+    """
+    Build a Laravel controller with the given number of methods and validated fields
+    per method. The first five methods are the standard resource operations.
+    """
+    variable = module.lower()
+    names = OPERATIONS + [f"action{i}" for i in range(max(0, methods - len(OPERATIONS)))]
+    blocks = []
+    for name in names[:methods]:
+        rules = "\n".join(
+            f"            '{_field_name(i)}' => '{'integer' if i % 3 == 0 else 'required'}',"
+            for i in range(fields)
+        )
+        assignments = "\n".join(
+            f"        ${variable}->{_field_name(i)} = $request->{_field_name(i)};" for i in range(fields)
+        )
+        signature = (
+            f"Request $request, {module} ${variable}"
+            if name in ("update", "show", "delete") else "Request $request"
+        )
+        blocks.append(
+            f"    public function {name}({signature})\n"
+            "    {\n"
+            "        $this->validate($request, [\n"
+            f"{rules}\n"
+            "        ]);\n"
+            f"        ${variable} = new {module}();\n"
+            f"{assignments}\n"
+            f"        ${variable}->save();\n"
+            "        return response()->json(['status' => 'success', 'message' => 'Recurso guardado']);\n"
+            "    }\n"
+        )
+    return (
+        "<?php\n\nnamespace App\\Http\\Controllers;\n\n"
+        f"class {module}Controller extends Controller\n{{\n"
+        + "\n".join(blocks)
+        + "}\n"
+    )
+
+
+# Inputs designed to trigger backtracking or rescanning, as a function of size n
+ADVERSARIAL_INPUTS = {
+    "unclosed_quotes": lambda n: "'field' =>  " * n,
+    "dangling_assignments": lambda n: "$model->field = " * n,
+    "long_identifier": lambda n: "$" + "a" * (n * 8) + "->",
+    "whitespace_runs": lambda n: ("'k'" + " " * 40 + "=>") * n,
+    "bodyless_methods": lambda n: "public function f()\n" * n,
+    "unbalanced_braces": lambda n: "public function f() {\n" * n,
+    "open_string": lambda n: "public function f() { '" + "x" * (n * 8),
+    "repeated_signatures": lambda n: "(Request $request, " * n,
+    "unclosed_rule_arrays": lambda n: "$this->validate($request, [" + "'field' => ['required', " * n,
+    "unclosed_validate_calls": lambda n: "$request->validate(['field' => 'required', " * n,
+    "bodyless_rules": lambda n: "function rules() " * n,
+}
+
+
+def _best_time(func, repeat):
+    """Best wall time of func over repeat runs."""
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _peak_memory(func):
+    """Peak traced allocation, in bytes, of a single run of func."""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def scaling_exponent(sizes, times):
+    """
+    Least-squares slope of log(time) against log(size): ~1 is linear, ~2 quadratic.
+    """
+    points = [(math.log(s), math.log(max(t, 1e-9))) for s, t in zip(sizes, times)]
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    variance = sum((x - mean_x) ** 2 for x, _ in points)
+    if not variance:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / variance
+
+
+def _stages(controller_code):
+    """The pipeline stages timed on one controller, as name -> callable."""
+    details = docsgenerator.extract_details_from_controller(controller_code)
+
+    def generate():
+        for operation_type in OPERATIONS:
+            docsgenerator.generate_swagger_doc(
+                details[0], details[1], "procedure", "/api/v1", operation_type,
+                details[2], details[3]
+            )
+
+    def spec():
+        openapi_spec = docsgenerator.OpenApiSpec()
+        for operation_type in OPERATIONS:
+            openapi_spec.add_operation(
+                details[0], details[1], "procedure", "/api/v1", operation_type,
+                details[2], details[3]
+            )
+        for _ in json.JSONEncoder(indent=2).iterencode(openapi_spec.to_dict()):
+            pass
+
+    docs = {operation_type: "/**\n * @OA\\Get()\n */" for operation_type in OPERATIONS}
+    return {
+        "split_methods": lambda: list(docsgenerator.iter_controller_methods(controller_code)),
+        "extract": lambda: docsgenerator.extract_details_from_controller(controller_code),
+        "generate": generate,
+        "spec": spec,
+        "write_back": lambda: docsgenerator.apply_annotations(controller_code, docs),
+    }
+
+
+def bench_stages(dimension, values, base_methods, base_fields, repeat):
+    """Time every stage while scaling the controller along one dimension."""
+    results = {}
+    for value in values:
+        methods = value if dimension == "methods" else base_methods
+        fields = value if dimension == "fields" else base_fields
+        controller_code = synthetic_controller(methods, fields)
+        for stage, func in _stages(controller_code).items():
+            seconds = _best_time(func, repeat)
+            results.setdefault(stage, []).append({
+                "size": len(controller_code),
+                dimension: value,
+                "seconds": seconds,
+                "mb_per_s": len(controller_code) / seconds / 1e6 if seconds else math.inf,
+                "peak_kb": _peak_memory(func) / 1024,
+            })
+    return results
+
+
+def bench_patterns(sizes, repeat):
+    """Time every compiled pattern of docsgenerator on each adversarial input."""
+    patterns = {
+        name: value for name, value in vars(docsgenerator).items()
+        if isinstance(value, re.Pattern)
+    }
+    results = {}
+    for input_name, make_input in ADVERSARIAL_INPUTS.items():
+        texts = [make_input(n) for n in sizes]
+        for pattern_name, pattern in patterns.items():
+            times = [_best_time(lambda: pattern.findall(text), repeat) for text in texts]
+            results[f"{pattern_name}/{input_name}"] = {
+                "sizes": [len(text) for text in texts],
+                "seconds": times,
+            }
+        for stage in ("split_methods", "extract", "write_back"):
+            times = [_best_time(_stages(text)[stage], repeat) for text in texts]
+            results[f"{stage}/{input_name}"] = {
+                "sizes": [len(text) for text in texts],
+                "seconds": times,
+            }
+    return results
+
+
+def run(args):
+    """Run the suite and return the report as a dict."""
+    sizes = [args.base_size * 2 ** i for i in range(args.steps)]
+    report = {
+        "methods": bench_stages(
+            "methods", [args.methods * 2 ** i for i in range(args.steps)],
+            args.methods, args.fields, args.repeat
+        ),
+        "fields": bench_stages(
+            "fields", [args.fields * 2 ** i for i in range(args.steps)],
+            args.methods, args.fields, args.repeat
+        ),
+        "adversarial": bench_patterns(sizes, args.repeat),
+    }
+
+    flags = []
+    for dimension in ("methods", "fields"):
+        for stage, rows in report[dimension].items():
+            exponent = scaling_exponent(
+                [row["size"] for row in rows], [row["seconds"] for row in rows]
+            )
+            if exponent > args.max_exponent:
+                flags.append(f"{stage} by {dimension}: exponent {exponent:.2f}")
+    for name, row in report["adversarial"].items():
+        # Ignore cases that stay too fast to measure meaningfully
+        if max(row["seconds"]) < args.min_seconds:
+            continue
+        exponent = scaling_exponent(row["sizes"], row["seconds"])
+        row["exponent"] = exponent
+        if exponent > args.max_exponent:
+            flags.append(f"{name}: exponent {exponent:.2f}")
+    report["super_linear"] = flags
+    return report
+
+
+def _baseline_times(report):
+    """Largest-size timing per measurement, the numbers compared against a baseline."""
+    times = {}
+    for dimension in ("methods", "fields"):
+        for stage, rows in report[dimension].items():
+            times[f"{stage} by {dimension}"] = rows[-1]["seconds"]
+    for name, row in report["adversarial"].items():
+        times[name] = row["seconds"][-1]
+    return times
+
+
+def compare_baseline(report, baseline, tolerance, min_seconds):
+    """List measurements that got slower than the baseline by more than tolerance."""
+    regressions = []
+    for name, seconds in _baseline_times(report).items():
+        previous = baseline.get(name)
+        if previous is None or max(seconds, previous) < min_seconds:
+            continue
+        if seconds > previous * tolerance:
+            regressions.append(f"{name}: {previous * 1e3:.2f} ms -> {seconds * 1e3:.2f} ms")
+    return regressions
+
+
+def print_report(report, out):
+    """Print the per-stage throughput tables and the flagged measurements."""
+    for dimension in ("methods", "fields"):
+        print(f"\n== Scaling by {dimension} ==", file=out)
+        print(f"{'stage':<14}{dimension:>8}{'bytes':>10}{'ms':>10}{'MB/s':>10}{'peak KB':>10}", file=out)
+        for stage, rows in report[dimension].items():
+            for row in rows:
+                print(
+                    f"{stage:<14}{row[dimension]:>8}{row['size']:>10}"
+                    f"{row['seconds'] * 1e3:>10.3f}{row['mb_per_s']:>10.2f}{row['peak_kb']:>10.1f}",
+                    file=out,
+                )
+
+    print("\n== Super-linear measurements ==", file=out)
+    for flag in report["super_linear"] or ["none"]:
+        print(f"  {flag}", file=out)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark docsgenerator extraction and generation")
+    parser.add_argument("--methods", type=int, default=5, help="methods in the smallest controller")
+    parser.add_argument("--fields", type=int, default=10, help="fields per method in the smallest controller")
+    parser.add_argument("--base-size", type=int, default=500, help="smallest adversarial input size")
+    parser.add_argument("--steps", type=int, default=4, help="number of doublings per dimension")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per measurement (best is kept)")
+    parser.add_argument("--max-exponent", type=float, default=1.3,
+                        help="flag measurements scaling worse than size**EXPONENT")
+    parser.add_argument("--min-seconds", type=float, default=0.001,
+                        help="ignore measurements faster than this")
+    parser.add_argument("--baseline", metavar="FILE", help="compare against a stored baseline")
+    parser.add_argument("--save-baseline", metavar="FILE", help="store this run as the baseline")
+    parser.add_argument("--tolerance", type=float, default=1.5,
+                        help="allowed slowdown factor against the baseline")
+    parser.add_argument("--json", metavar="FILE", help="also write the full report as JSON")
+    args = parser.parse_args(argv)
+
+    report = run(args)
+    print_report(report, sys.stdout)
+
+    regressions = []
+    if args.baseline and os.path.exists(args.baseline):
+        with open(args.baseline, "r") as file:
+            regressions = compare_baseline(report, json.load(file), args.tolerance, args.min_seconds)
+        print("\n== Regressions against baseline ==")
+        for regression in regressions or ["none"]:
+            print(f"  {regression}")
+    if args.save_baseline:
+        docsgenerator.atomic_write(args.save_baseline, json.dumps(_baseline_times(report), indent=4))
+    if args.json:
+        docsgenerator.atomic_write(args.json, json.dumps(report, indent=4))
+
+    return 1 if regressions or report["super_linear"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
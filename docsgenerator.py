@@ -1,19 +1,47 @@
 import re
-import tkinter as tk
-from tkinter import messagebox, ttk
-from tkinter.scrolledtext import ScrolledText
 import json
 import os
+import hashlib
+import math
+import sys
+import time
+import atexit
+import argparse
+import logging
+import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
+from functools import lru_cache, wraps
+try:
+    import fcntl
+except ImportError:  # Windows has no fcntl; locking is skipped there
+    fcntl = None
 class TagManager:
     """Manages tag types dynamically and saves them to a file."""
-    def __init__(self, filename="tags.json"):
+    def __init__(self, filename="tags.json", save_delay=0.5):
         self.filename = filename
-        self.tag_types = self.load_tags()
+        self.save_delay = save_delay
+        self.last_error = None
+        self._mtime = None
+        self._pending = []
+        self._timer = None
+        self._lock = threading.RLock()
+        self._tags = self._index(self.load_tags())
+        atexit.register(self._flush_quietly)
+
+    @property
+    def tag_types(self):
+        """Tags in insertion order."""
+        with self._lock:
+            self._reload_if_changed()
+            return list(self._tags.values())
 
     def load_tags(self):
         """Load tags from a file."""
         if os.path.exists(self.filename):
             try:
+                self._mtime = os.stat(self.filename).st_mtime_ns
                 with open(self.filename, "r") as file:
                     return json.load(file)
             except (json.JSONDecodeError, IOError):
@@ -24,167 +52,513 @@ class TagManager:
             {"name": "Portal", "route_prefix": "/api/v1/portal"}
         ]
 
+    @staticmethod
+    def _index(tag_list):
+        """Index a list of tags by name."""
+        return {tag['name']: tag for tag in tag_list if 'name' in tag}
+
+    @staticmethod
+    def _apply(tags, pending):
+        """Replay pending add/delete operations on top of an index of tags."""
+        tags = dict(tags)
+        for action, tag in pending:
+            if action == "add":
+                tags.setdefault(tag['name'], tag)
+            else:
+                tags.pop(tag, None)
+        return tags
+
+    def _reload_if_changed(self):
+        """Reload tags when another process has rewritten the file."""
+        try:
+            mtime = os.stat(self.filename).st_mtime_ns
+        except OSError:
+            return
+        if mtime != self._mtime:
+            # Local changes that are not saved yet win over the file content
+            self._tags = self._apply(self._index(self.load_tags()), self._pending)
+
     def save_tags(self):
-        """Save tags to a file."""
+        """Schedule a debounced save of the pending changes."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.save_delay, self._flush_quietly)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """
+        Write pending changes now. The file is re-read under an advisory lock and the
+        pending changes are merged into it, so concurrent writers do not clobber each other.
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._pending:
+                return
+            with _file_lock(self.filename + ".lock"):
+                tags = self._apply(self._index(self.load_tags()), self._pending)
+                atomic_write(self.filename, json.dumps(list(tags.values()), indent=4))
+                self._mtime = os.stat(self.filename).st_mtime_ns
+            self._tags = tags
+            self._pending = []
+            self.last_error = None
+
+    def _flush_quietly(self):
+        """Flush from the debounce timer, keeping the error for the caller to report."""
         try:
-            with open(self.filename, "w") as file:
-                json.dump(self.tag_types, file, indent=4)
-        except IOError as e:
-            messagebox.showerror("Error", f"Failed to save tags: {e}")
+            self.flush()
+        except (IOError, OSError) as e:
+            logger.error("Failed to save %s: %s", self.filename, e)
+            with self._lock:
+                self.last_error = e
+
+    def pop_error(self):
+        """Return the error of the last background save, if any, and clear it."""
+        with self._lock:
+            error, self.last_error = self.last_error, None
+        return error
 
     def add_tag(self, new_tag, route_prefix=""):
         """Add a new tag with an optional route prefix."""
-        # Check if tag already exists
-        for tag in self.tag_types:
-            if tag['name'] == new_tag:
+        with self._lock:
+            self._reload_if_changed()
+            # Check if tag already exists
+            if new_tag in self._tags:
                 return False
-        
-        # Add new tag
-        self.tag_types.append({
-            "name": new_tag,
-            "route_prefix": route_prefix.strip() or f"/api/v1/{new_tag.lower()}"
-        })
+
+            # Add new tag
+            tag = {
+                "name": new_tag,
+                "route_prefix": route_prefix.strip() or f"/api/v1/{new_tag.lower()}"
+            }
+            self._tags[new_tag] = tag
+            self._pending.append(("add", tag))
         self.save_tags()
         return True
 
     def delete_tag(self, tag):
-        """Delete a tag from the list."""
-        self.tag_types = [t for t in self.tag_types if t['name'] != tag]
+        """Delete a tag (given by name or as a tag dict) from the list."""
+        name = tag['name'] if isinstance(tag, dict) else tag
+        with self._lock:
+            self._reload_if_changed()
+            self._tags.pop(name, None)
+            self._pending.append(("delete", name))
         self.save_tags()
 
     def get_route_prefix(self, tag_name):
         """Get route prefix for a given tag name."""
-        for tag in self.tag_types:
-            if tag['name'] == tag_name:
-                return tag.get('route_prefix', '')
-        return ''
-
-
-
-# Initialize tag manager
-tag_manager = TagManager()
-
-
-def update_tag_list():
-    """Update the tag list with delete buttons."""
-    for widget in tag_list_frame.winfo_children():
-        widget.destroy()
-
-    for tag in tag_manager.tag_types:
-        frame = tk.Frame(tag_list_frame)
-        frame.pack(fill="x", pady=2)
-
-        tag_label = tk.Label(frame, text=tag, anchor="w")
-        tag_label.pack(side="left", padx=5)
+        with self._lock:
+            self._reload_if_changed()
+            tag = self._tags.get(tag_name)
+        return tag.get('route_prefix', '') if tag else ''
+
+
+@contextmanager
+def _file_lock(lock_filename):
+    """Hold an advisory exclusive lock on lock_filename (no-op where fcntl is missing)."""
+    with open(lock_filename, "a") as lock_file:
+        if fcntl is None:
+            yield
+            return
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
 
-        delete_button = tk.Button(
-            frame, text="X", fg="red", command=lambda t=tag: delete_tag(t)
-        )
-        delete_button.pack(side="right", padx=5)
 
 
-def delete_tag(tag):
-    """Delete a tag from the list."""
-    tag_manager.delete_tag(tag)
-    update_tag_dropdown()
-    update_tag_list()
+logger = logging.getLogger("docsgenerator")
+logger.addHandler(logging.NullHandler())
 
-def update_tag_dropdown():
-    """Update the tag dropdown with the latest tag types."""
-    tag_dropdown['values'] = [tag['name'] for tag in tag_manager.tag_types] + ["Add"]
 
-def handle_tag_selection(event):
-    """Handle the selection of a tag in the dropdown."""
-    selected = tag_type_var.get()
-    if selected == "Add":
-        add_tag_popup()
-    else:
-        # Automatically populate route prefix when a tag is selected
-        route_prefix = tag_manager.get_route_prefix(selected)
-        route_prefix_entry.delete(0, tk.END)
-        route_prefix_entry.insert(0, route_prefix)
-
-def add_tag_popup():
-    """Show a popup window for adding a new tag."""
-    popup = tk.Toplevel(root)
-    popup.title("Add New Tag")
-
-    # Tag name input
-    tag_label = tk.Label(popup, text="Enter new tag:")
-    tag_label.pack(pady=5)
-    tag_entry = tk.Entry(popup)
-    tag_entry.pack(pady=5)
-
-    # Route prefix input
-    route_prefix_label = tk.Label(popup, text="Route Prefix (optional):")
-    route_prefix_label.pack(pady=5)
-    route_prefix_entry = tk.Entry(popup)
-    route_prefix_entry.pack(pady=5)
-
-    def save_new_tag():
-        new_tag = tag_entry.get().strip()
-        route_prefix = route_prefix_entry.get().strip()
-        
-        if tag_manager.add_tag(new_tag, route_prefix):
-            messagebox.showinfo("Success", f"Tag '{new_tag}' added successfully.")
-            update_tag_dropdown()
-            update_tag_list()
+class Instrumentation:
+    """
+    Per-stage timers and per-file counters for a generation run. Disabled by default;
+    stage times are exclusive, so a stage nested in another is not counted twice.
+    """
+    def __init__(self):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._trace = None
+        self._stages = {}
+        self._files = {}
+
+    def enable(self, trace_filename=None):
+        """Start collecting, optionally streaming events to a JSON-lines trace."""
+        self.enabled = True
+        if trace_filename:
+            self._trace = open(trace_filename, "a", encoding="utf-8")
+
+    def close(self):
+        """Stop collecting and close the trace file."""
+        self.enabled = False
+        if self._trace is not None:
+            self._trace.close()
+            self._trace = None
+
+    def _emit(self, event):
+        if self._trace is not None:
+            with self._lock:
+                self._trace.write(json.dumps(event) + "\n")
+
+    def _file_stats(self, filename):
+        return self._files.setdefault(filename, {"seconds": 0.0, "stages": {}, "counters": {}})
+
+    @contextmanager
+    def stage(self, name):
+        """Time a stage, attributing it to the file being processed."""
+        if not self.enabled:
+            yield
+            return
+        stack = self._local.__dict__.setdefault("stack", [])
+        frame = [name, time.perf_counter(), 0.0]
+        stack.append(frame)
+        try:
+            yield
+        finally:
+            stack.pop()
+            elapsed = time.perf_counter() - frame[1]
+            exclusive = elapsed - frame[2]
+            if stack:
+                stack[-1][2] += elapsed
+            filename = getattr(self._local, "filename", None)
+            with self._lock:
+                calls_seconds = self._stages.setdefault(name, [0, 0.0])
+                calls_seconds[0] += 1
+                calls_seconds[1] += exclusive
+                if filename is not None:
+                    stages = self._file_stats(filename)["stages"]
+                    stages[name] = stages.get(name, 0.0) + exclusive
+            self._emit({"stage": name, "file": filename, "ms": round(exclusive * 1e3, 3)})
+
+    def timed(self, name):
+        """Decorator form of stage()."""
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.stage(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    @contextmanager
+    def file(self, filename):
+        """Attribute the stages and counters inside the block to filename."""
+        if not self.enabled:
+            yield
+            return
+        self._local.filename = filename
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self._local.filename = None
+            with self._lock:
+                stats = self._file_stats(filename)
+                stats["seconds"] += elapsed
+            self._emit({
+                "event": "file", "file": filename, "ms": round(elapsed * 1e3, 3),
+                "counters": stats["counters"],
+            })
+
+    def count(self, name, amount=1):
+        """Add to a counter of the file being processed."""
+        filename = getattr(self._local, "filename", None)
+        if not self.enabled or filename is None:
+            return
+        with self._lock:
+            counters = self._file_stats(filename)["counters"]
+            counters[name] = counters.get(name, 0) + amount
+
+    def report(self, top=10):
+        """Summary of the time spent per stage and in the slowest files."""
+        lines = [f"{'stage':<20}{'calls':>8}{'total ms':>12}{'mean ms':>10}"]
+        for name, (calls, seconds) in sorted(self._stages.items(), key=lambda item: -item[1][1]):
+            lines.append(f"{name:<20}{calls:>8}{seconds * 1e3:>12.2f}{seconds * 1e3 / calls:>10.3f}")
+        if self._files:
+            lines.append("")
+            lines.append(f"Slowest {min(top, len(self._files))} of {len(self._files)} controllers:")
+            slowest = sorted(self._files.items(), key=lambda item: -item[1]["seconds"])[:top]
+            for filename, stats in slowest:
+                counters = ", ".join(f"{k}={v}" for k, v in sorted(stats["counters"].items()))
+                lines.append(f"  {stats['seconds'] * 1e3:>9.2f} ms  {filename}  ({counters})")
+        return "\n".join(lines)
+
+
+# Shared by every generation call; enable() it to collect timings
+instrumentation = Instrumentation()
+
+
+# Patterns used to extract details from controller code
+# Where rule arrays start: $this->validate($request, [, $request->validate([,
+# Validator::make($data, [ and a form request's rules() { return [
+RULE_ARRAY_PATTERN = re.compile(
+    r"(?:->validate\w*|Validator::make)\s*\((?:[^\[;()]|\([^()]*\))*\["
+    r"|function\s+rules\s*\(\s*\)(?:\s*:\s*\??\w+)?\s*\{\s*return\s*\["
+)
+RULE_KEY_PATTERN = re.compile(r"'([a-zA-Z_][\w.*]*)'\s*=>\s*(?='|\[)")
+RULE_STRING_PATTERN = re.compile(r"'([^'\n]*)'")
+RULE_IN_PATTERN = re.compile(r"Rule::in\(([^)]*)\)")
+RULE_CALL_PATTERN = re.compile(r"(?:Rule::\w+|new\s+[\w\\]+)\([^)]*\)(?:->\w+\([^)]*\))*")
+QUOTED_PATTERN = re.compile(r"'([^']*)'|\"([^\"]*)\"")
+ASSIGNMENT_PATTERN = re.compile(r"\$[a-zA-Z_]+->([a-zA-Z_]+)\s*=\s*\$request->([a-zA-Z_]+)")
+STATUS_PATTERN = re.compile(r"'status'\s*=>\s*'(\w+)'")
+MESSAGE_PATTERN = re.compile(r"'message'\s*=>\s*'([^']+)'")
+ROUTE_PARAM_PATTERN = re.compile(r"\(Request \$\w+, \w+ (\$\w+)")
+FALLBACK_PARAM_PATTERN = re.compile(r"\(\w+ (\$\w+)")
+REQUEST_PARAM_PATTERN = re.compile(r"\$request->([a-zA-Z_]+)\b(?!\s*\()")
+
+
+# Rule arrays are lists, so a "=>" ends the lookahead for an unclosed '[': every
+# scan stops at the next validated key and extraction stays linear in the input
+_BRACKET_TOKEN_PATTERN = re.compile(r"""'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*"|[\[\]]|=>""")
+
+# PHP date() characters that put a time of day in a date_format pattern
+_TIME_FORMAT_CHARACTERS = set("aABgGhHisuvecIOPpTZUr")
+
+# Laravel rules mapped to OpenAPI types and formats
+_RULE_TYPES = {
+    "integer": ("integer", None),
+    "numeric": ("number", None),
+    "decimal": ("number", None),
+    "boolean": ("boolean", None),
+    "array": ("array", None),
+    "string": ("string", None),
+    "email": ("string", "email"),
+    "date": ("string", "date"),
+    "date_format": ("string", "date"),
+    "url": ("string", "uri"),
+    "uuid": ("string", "uuid"),
+    "ip": ("string", "ip"),
+    "file": ("string", "binary"),
+    "image": ("string", "binary"),
+    "mimes": ("string", "binary"),
+}
+_RULE_BOUNDS = {
+    "integer": ("minimum", "maximum"),
+    "number": ("minimum", "maximum"),
+    "string": ("minLength", "maxLength"),
+    "array": ("minItems", "maxItems"),
+}
+
+
+def _match_bracket(code, open_index):
+    """
+    Return the offset just after the bracket closing the one at open_index, or None
+    when a "=>" or the end of code comes first.
+    """
+    depth = 0
+    for token in _BRACKET_TOKEN_PATTERN.finditer(code, open_index):
+        if token.group() == "=>":
+            return None
+        if token.group() == "[":
+            depth += 1
+        elif token.group() == "]":
+            depth -= 1
+            if depth == 0:
+                return token.end()
+    return None
+
+
+def _normalize_rule_array(text):
+    """Turn array rule syntax into the equivalent pipe string, with Rule::in as in:..."""
+    enum = []
+
+    def take_in(match):
+        enum.extend(a or b for a, b in QUOTED_PATTERN.findall(match.group(1)))
+        return ""
+
+    rest = RULE_CALL_PATTERN.sub("", RULE_IN_PATTERN.sub(take_in, text))
+    parts = [a or b for a, b in QUOTED_PATTERN.findall(rest)]
+    if enum:
+        parts.append("in:" + ",".join(enum))
+    return "|".join(parts)
+
+
+def _match_rule_array(code, open_index, end_index):
+    """
+    Return the offset just after the bracket closing the rule array opened at
+    open_index, or None when it is still open at end_index.
+    """
+    depth = 0
+    for token in _BRACKET_TOKEN_PATTERN.finditer(code, open_index, end_index):
+        if token.group() == "[":
+            depth += 1
+        elif token.group() == "]":
+            depth -= 1
+            if depth == 0:
+                return token.end()
+    return None
+
+
+def extract_rules(controller_code):
+    """
+    Map each key validated by a validate(), Validator::make() or rules() array,
+    including nested ones like items.*.name, to its rule string, with array syntax
+    and Rule::in normalized to pipe syntax.
+    """
+    rules = {}
+    heads = list(RULE_ARRAY_PATTERN.finditer(controller_code))
+    for index, head in enumerate(heads):
+        # No rule array contains the next one, so an unclosed array ends there
+        limit = heads[index + 1].start() if index + 1 < len(heads) else len(controller_code)
+        array_end = _match_rule_array(controller_code, head.end() - 1, limit)
+        if array_end is None:
+            array_end = limit
+        position = head.end()
+        for match in RULE_KEY_PATTERN.finditer(controller_code, position, array_end):
+            if match.start() < position:
+                # Inside the previous key's rule array
+                continue
+            start = match.end()
+            if controller_code[start] == "'":
+                string_match = RULE_STRING_PATTERN.match(controller_code, start, array_end)
+                if string_match:
+                    rules.setdefault(match.group(1), string_match.group(1))
+                    position = string_match.end()
+            else:
+                end = _match_bracket(controller_code, start)
+                if end is not None:
+                    rules.setdefault(match.group(1), _normalize_rule_array(controller_code[start + 1:end - 1]))
+                    position = end
+    return rules
+
+
+@lru_cache(maxsize=None)
+def translate_rule(rule):
+    """
+    Translate a pipe-separated Laravel rule string into OpenAPI schema keywords plus
+    "required". Memoized for the whole run, since the same rule strings repeat across
+    controllers; the returned dict is shared and must not be modified.
+    """
+    translated = {"required": False}
+    bounds = {}
+    for part in rule.split("|"):
+        name, _, argument = part.strip().partition(":")
+        if name == "required":
+            translated["required"] = True
+        elif name == "nullable":
+            translated["nullable"] = True
+        elif name in _RULE_TYPES:
+            field_type, field_format = _RULE_TYPES[name]
+            if name == "date_format" and _TIME_FORMAT_CHARACTERS & set(re.sub(r"\\.", "", argument)):
+                field_format = "date-time"
+            # A specific format wins over a plain type ("string|email")
+            if "format" not in translated or field_format:
+                translated["type"] = field_type
+                if field_format:
+                    translated["format"] = field_format
+        elif name == "in" and argument:
+            translated["enum"] = [value.strip().strip("'\"") for value in argument.split(",")]
+        elif name in ("min", "max", "size", "between", "digits_between") and argument:
+            values = argument.split(",")
+            try:
+                values = [int(value) if value.strip().lstrip("-").isdigit() else float(value) for value in values]
+            except ValueError:
+                continue
+            if name == "min":
+                bounds["min"] = values[0]
+            elif name == "max":
+                bounds["max"] = values[0]
+            elif name == "size":
+                bounds["min"] = bounds["max"] = values[0]
+            elif len(values) == 2:
+                bounds["min"], bounds["max"] = values
+    # File sizes are in kilobytes, not a length of the value
+    if translated.get("format") != "binary":
+        low, high = _RULE_BOUNDS.get(translated.get("type", "string"), _RULE_BOUNDS["string"])
+        if "min" in bounds:
+            translated[low] = bounds["min"]
+        if "max" in bounds:
+            translated[high] = bounds["max"]
+    return translated
+
+
+def _field_details(field, rule, nested_rules=None):
+    """
+    Field details from its rule string, falling back to the old name-based type guess
+    for fields without a typed rule. nested_rules maps sub-keys ("*.name") to rules.
+    """
+    details = dict(translate_rule(rule)) if rule is not None else {"required": False}
+    if "type" not in details:
+        details["type"] = "integer" if "id" in field.lower() else "string"
+    if nested_rules:
+        children = {}
+        for key, child_rule in nested_rules.items():
+            head, _, tail = key.partition(".")
+            child = children.setdefault(head, [None, {}])
+            if tail:
+                child[1][tail] = child_rule
+            else:
+                child[0] = child_rule
+        properties = {
+            name: _field_details(name, child_rule, child_nested)
+            for name, (child_rule, child_nested) in children.items()
+        }
+        if "*" in properties:
+            details["type"] = "array"
+            details["items"] = properties["*"]
         else:
-            messagebox.showwarning("Duplicate", f"Tag '{new_tag}' already exists.")
-        popup.destroy()
-
-    save_button = tk.Button(popup, text="Save", command=save_new_tag)
-    save_button.pack(pady=10)
+            details["type"] = "object"
+            details["properties"] = properties
+    return details
 
 
+@instrumentation.timed("rule_extraction")
 def extract_details_from_controller(controller_code):
     """
     Extract fields, types, and requirements from a Laravel controller.
     """
     try:
         # Extract validations from $this->validate() or Validator::make()
-        validation_matches = re.findall(
-            r"'([a-zA-Z_]+)'\s*=>\s*'(\w+)'", controller_code
-        )
-        validations = {match[0]: match[1] for match in validation_matches}
+        validations = extract_rules(controller_code)
 
-        # Extract fields from $request-> assignments
-        field_matches = re.findall(
-            r"\$[a-zA-Z_]+->([a-zA-Z_]+)\s*=\s*\$request->([a-zA-Z_]+)", controller_code
-        )
-        fields = {field[1] for field in field_matches}
+        # Every validated top-level key, nested keys (items.*.name) under their head,
+        # then fields only assigned from $request->. Source order keeps regenerated
+        # docblocks byte-stable across runs
+        field_matches = ASSIGNMENT_PATTERN.findall(controller_code)
+        fields = list(dict.fromkeys(
+            [key.partition(".")[0] for key in validations] + [field[1] for field in field_matches]
+        ))
 
         status, message = '', ''
-        status_match = re.search(r"'status'\s*=>\s*'(\w+)'", controller_code)
-        message_match = re.search(r"'message'\s*=>\s*'([^']+)'", controller_code)
+        status_match = STATUS_PATTERN.search(controller_code)
+        message_match = MESSAGE_PATTERN.search(controller_code)
         if status_match:
             status = status_match.group(1)
 
         if message_match:
             message = message_match.group(1)
         # Extract route parameter name
-        param_match = re.search(r"\(Request \$\w+, \w+ (\$\w+)", controller_code)
+        param_match = ROUTE_PARAM_PATTERN.search(controller_code)
         if not param_match:
-            param_match = re.search(r"\(\w+ (\$\w+)", controller_code)
+            param_match = FALLBACK_PARAM_PATTERN.search(controller_code)
         route_param = param_match.group(1).removeprefix("$") if param_match else "id"
 
-        # Combine validations and fields, infer types and required status
+        nested = {}
+        for key, rule in validations.items():
+            head, _, tail = key.partition(".")
+            if tail:
+                nested.setdefault(head, {})[tail] = rule
+
+        # Combine validations and fields into types, formats and required status
         all_fields = {}
         for field in fields:
-            field_type = (
-                "integer"
-                if "id" in field.lower() or validations.get(field) == "integer"
-                else "string"
-            )
-            is_required = field in validations
-            all_fields[field] = {"type": field_type, "required": is_required}
+            all_fields[field] = _field_details(field, validations.get(field), nested.get(field))
 
         # Extract query parameters for index method
-        query_params_matches = re.findall(r"\$request->([a-zA-Z_]+)", controller_code)
+        query_params_matches = REQUEST_PARAM_PATTERN.findall(controller_code)
         for param in query_params_matches:
             if param not in all_fields:
                 all_fields[param] = {"type": "string", "required": False}
-        print(all_fields)
+        logger.debug("Extracted fields: %s", all_fields)
+        instrumentation.count("fields", len(all_fields))
         return all_fields, route_param, status, message
     except Exception as e:
         raise ValueError(f"Error extracting details from controller: {e}")
@@ -196,9 +570,147 @@ def generate_example(field_name, field_type, module_name):
     """
     if field_type == "integer":
         return 1
+    if field_type == "number":
+        return 1.5
+    if field_type == "boolean":
+        return True
     return f"{module_name.capitalize()} {field_name.replace('_', ' ').capitalize()}"
 
 
+_FORMAT_EXAMPLES = {"email": "user@example.com", "date": "2024-01-01", "date-time": "2024-01-01 00:00:00",
+                    "uri": "https://example.com", "uuid": "123e4567-e89b-12d3-a456-426614174000"}
+_SCHEMA_KEYWORDS = ("format", "enum", "minimum", "maximum", "minLength", "maxLength", "minItems", "maxItems",
+                    "nullable")
+
+
+def field_example(field_name, props, module_name):
+    """Example value for a field, using its enum or format when the rules give one."""
+    if props.get("enum"):
+        return props["enum"][0]
+    if props.get("format") in _FORMAT_EXAMPLES:
+        return _FORMAT_EXAMPLES[props["format"]]
+    return generate_example(field_name, props["type"], module_name)
+
+
+def field_schema(field_name, props, module_name, description=True):
+    """OpenAPI schema object for extracted field details."""
+    schema = {"type": props["type"]}
+    schema.update((keyword, props[keyword]) for keyword in _SCHEMA_KEYWORDS if keyword in props)
+    if description:
+        schema["description"] = field_name.replace('_', ' ').capitalize()
+    if "items" in props:
+        schema["items"] = field_schema("*", props["items"], module_name, description=False)
+    elif "properties" in props:
+        schema["properties"] = {
+            name: field_schema(name, child, module_name) for name, child in props["properties"].items()
+        }
+        required = [name for name, child in props["properties"].items() if child["required"]]
+        if required:
+            schema["required"] = required
+    if props["type"] not in ("array", "object"):
+        schema["example"] = field_example(field_name, props, module_name)
+    return schema
+
+
+def _annotation_value(value):
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, list):
+        return "{" + ", ".join(f'"{item}"' for item in value) + "}"
+    if isinstance(value, str):
+        return f'"{value}"'
+    return str(value)
+
+
+def _annotation_keywords(props):
+    """Extra swagger-php attributes (format, enum, bounds...) for field details, with a leading ", "."""
+    return "".join(
+        f", {keyword}={_annotation_value(props[keyword])}" for keyword in _SCHEMA_KEYWORDS if keyword in props
+    )
+
+
+def _annotation_children(props, module_name):
+    """Nested @OA\\Items / @OA\\Property annotations of an array or object field, with a leading ", "."""
+    if "items" in props:
+        items = props["items"]
+        return (
+            f", @OA\\Items(type=\"{items['type']}\"{_annotation_keywords(items)}"
+            f"{_annotation_children(items, module_name)})"
+        )
+    if "properties" in props:
+        return "".join(
+            f", @OA\\Property(property=\"{name}\", type=\"{child['type']}\"{_annotation_keywords(child)}"
+            f"{_annotation_children(child, module_name)})"
+            for name, child in props["properties"].items()
+        )
+    return ""
+
+
+def _annotation_example(field, props, module_name):
+    """The ', example="..."' attribute of a field, empty for arrays and objects."""
+    if props["type"] in ("array", "object"):
+        return ""
+    value = field_example(field, props, module_name)
+    return f", example=\"{_annotation_value(value) if isinstance(value, bool) else value}\""
+
+
+def property_annotation(field, props, module_name):
+    """The @OA\\Property line documenting one request field."""
+    return (
+        f" * @OA\\Property(property=\"{field}\", type=\"{props['type']}\"{_annotation_keywords(props)}, "
+        f"description=\"{field.replace('_', ' ').capitalize()}\"{_annotation_example(field, props, module_name)}"
+        f"{_annotation_children(props, module_name)}),"
+    )
+
+
+def operation_id_for(operation_type, module_name):
+    """The operationId of an operation, e.g. store_medical_record."""
+    return f"{operation_type}_{module_name.replace(' ', '_').lower()}"
+
+
+def response_schema_attributes(schema):
+    """swagger-php attributes describing an inferred response schema, nested properties included."""
+    attributes = []
+    if "type" in schema:
+        attributes.append(f'type="{schema["type"]}"')
+    if schema.get("nullable"):
+        attributes.append("nullable=true")
+    if "anyOf" in schema:
+        options = ", ".join(
+            f"@OA\\Schema({', '.join(response_schema_attributes(option))})" for option in schema["anyOf"]
+        )
+        attributes.append(f"anyOf={{{options}}}")
+    if schema.get("required"):
+        attributes.append(f"required={_annotation_value(schema['required'])}")
+    for name, child in schema.get("properties", {}).items():
+        child_attributes = [f'property="{name}"'] + response_schema_attributes(child)
+        attributes.append(f"@OA\\Property({', '.join(child_attributes)})")
+    if "items" in schema:
+        attributes.append(f"@OA\\Items({', '.join(response_schema_attributes(schema['items']))})")
+    return attributes
+
+
+# Route suffix and HTTP method for each operation type
+OPERATION_ROUTES = {
+    "store": ("", "POST"),
+    "index": ("", "GET"),
+    "update": ("/{{{param}}}/update", "POST"),
+    "show": ("/{{{param}}}/show", "GET"),
+    "delete": ("/{{{param}}}/delete", "DELETE"),
+}
+
+
+@instrumentation.timed("route_resolution")
+def resolve_route(route_prefix, module_name, operation_type, route_param):
+    """
+    Resolve the route path and HTTP method for an operation type.
+    """
+    suffix, method = OPERATION_ROUTES.get(operation_type, OPERATION_ROUTES["store"])
+    route = f"{route_prefix}/{module_name.lower()}" + suffix.format(param=route_param)
+    return route, method
+
+
+@instrumentation.timed("rendering")
 def generate_swagger_doc(
     details,
     route_param,
@@ -206,40 +718,48 @@ def generate_swagger_doc(
     route_prefix="/api/v1",
     operation_type="store",
     status = '', 
-    message= ''
+    message= '',
+    tag_type="Backoffice",
+    response_schema=None
 ):
     """
-    Generate Swagger documentation based on the operation type.
+    Generate Swagger documentation based on the operation type. response_schema,
+    inferred from recorded responses, documents the success response exactly.
     """
     try:
         required_fields = [
             field for field, props in details.items() if props["required"]
         ]
         properties = "\n".join(
-            f" * @OA\\Property(property=\"{field}\", type=\"{props['type']}\", "
-            f"description=\"{field.replace('_', ' ').capitalize()}\", "
-            f"example=\"{generate_example(field, props['type'], module_name)}\"),"
-            for field, props in details.items()
+            property_annotation(field, props, module_name) for field, props in details.items()
         )
         # Set up dynamic descriptions and tags
-        tag_name = f"{module_name.title()} {tag_type_var.get()}"
+        tag_name = f"{module_name.title()} {tag_type}"
         description = f"{operation_type.capitalize()} {module_name.title()}"
-        operation_id = f"{operation_type}_{module_name.replace(' ', '_').lower()}"
-        route = f"{route_prefix}/{module_name.lower()}"
+        operation_id = operation_id_for(operation_type, module_name)
         comillas = '"'
         query_parameters = ""
-        print(query_parameters)
+        if response_schema:
+            success_content = (
+                " *        @OA\\JsonContent(\n"
+                + "".join(f" *           {attribute},\n" for attribute in response_schema_attributes(response_schema))
+                + " *        )\n"
+            )
+        else:
+            success_content = (
+                ' *        @OA\\JsonContent(@OA\\Property(property="data", type="object", example="[...]")\n'
+                " *        )\n"
+            )
         correctresponse = (
             f" *     @OA\\Response(\n"
             f" *        response={'201' if operation_type.lower()=='store' else '200'},\n"
             f' *        description="Successful {operation_type}",\n'
-            f' *        @OA\\JsonContent(@OA\\Property(property="data", type="object", example="[...]")\n'
-            f" *        )\n"
+            f"{success_content}"
             f" *     ),\n"
         )
         notfoundresponse = ""
+        route, operation_method = resolve_route(route_prefix, module_name, operation_type, route_param)
         if operation_type == "update":
-            route += f"/{{{route_param}}}/update"
             path_parameter = (
                 " *     @OA\\Parameter(\n"
                 f" *         name={comillas+route_param+comillas},\n"
@@ -258,7 +778,6 @@ def generate_swagger_doc(
                 "*        )\n"
                 "*     ),\n"
             )
-            operation_method = "POST"
             request_body = (
                 f" *     @OA\\RequestBody(\n"
                 f" *        required=true,\n"
@@ -271,7 +790,6 @@ def generate_swagger_doc(
                 f" *     ),\n"
             )
         elif operation_type == "show":
-            route += f"/{{{route_param}}}/show"
             path_parameter = (
                 " *     @OA\\Parameter(\n"
                 f" *         name={comillas+route_param+comillas},\n"
@@ -290,10 +808,8 @@ def generate_swagger_doc(
                 "*        )\n"
                 "*     ),\n"
             )
-            operation_method = "GET"
             request_body = ""
         elif operation_type == "delete":
-            route += f"/{{{route_param}}}/delete"
             statusResponse =  'successful' if status == '' else status
             responseMessage ='Recurso borrado' if message == '' else message
             path_parameter = (
@@ -314,19 +830,21 @@ def generate_swagger_doc(
                 "*        )\n"
                 "*     ),\n"
             )
+            if not response_schema:
+                success_content = (
+                    f'*        @OA\JsonContent(@OA\Property(property="status", type="string", example="{statusResponse}"),\n'
+                    f'*                     @OA\Property(property="message", type="string", example="{responseMessage}"),\n'
+                    "*         )\n"
+                )
             correctresponse = (
                 "*     @OA\Response(\n"
                 "*        response=200,\n"
                 '*        description="Successful Deleted",\n'
-                f'*        @OA\JsonContent(@OA\Property(property="status", type="string", example="{statusResponse}"),\n'
-                f'*                     @OA\Property(property="message", type="string", example="{responseMessage}"),\n'
-                "*         )\n"
+                f"{success_content}"
                 "*     ),\n"
             )
-            operation_method = "DELETE"
             request_body = ""
         elif operation_type == "index":
-            route += ""
             path_parameter = ""
             query_parameters = "\n".join(
                 f" *     @OA\\Parameter(\n"
@@ -334,14 +852,13 @@ def generate_swagger_doc(
                 ' *         in="query",\n'
                 f" *         description=\"{field.replace('_', ' ').capitalize()}\",\n"
                 " *         required=false,\n"
-                f" *         @OA\\Schema(type=\"{props['type']}\", example=\"{generate_example(field, props['type'], module_name)}\")\n"
+                f" *         @OA\\Schema(type=\"{props['type']}\"{_annotation_keywords(props)}"
+                f"{_annotation_example(field, props, module_name)})\n"
                 " *     ),"
                 for field, props in details.items()
             )
             request_body = ""
-            operation_method = "GET"
         else:
-            operation_method = "POST"
             path_parameter = ""
             query_parameters = ""
             request_body = (
@@ -389,135 +906,1155 @@ def generate_swagger_doc(
         raise ValueError(f"Error generating Swagger doc: {e}")
 
 
-def generate_documentation():
-    """
-    Main function to generate documentation and display it in the UI.
+def _iter_refs(node):
+    """Yield every $ref target inside a JSON-like tree."""
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            ref = node.get("$ref")
+            if isinstance(ref, str):
+                yield ref
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+
+
+def _input_hash(*args):
+    """Short digest of the add_operation arguments, stored as x-input-hash."""
+    text = json.dumps(args, sort_keys=True, default=str)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+class OpenApiSpec:
     """
-    try:
-        controller_input = controller_text.get("1.0", tk.END).strip()
-        route_prefix = route_prefix_entry.get().strip()
-        module_name = module_name_entry.get().strip() or "Example"
-        operation_type = operation_type_var.get()
+    Aggregates operations into a single OpenAPI document with shared components.
 
-        if not controller_input:
-            raise ValueError("Controller input is required.")
+    Operations are indexed by operationId, so a spec loaded from an existing
+    openapi.json can be updated in place: re-adding an operation whose inputs
+    did not change keeps it as is, and two different operations claiming the
+    same operationId or the same path and method raise ValueError.
+    """
+    def __init__(self, title="Laravel API", version="1.0.0"):
+        self.title = title
+        self.version = version
+        self.paths = {}
+        self.schemas = {}
+        self.responses = {}
+        self.security_schemes = {}
+        # operationId -> (route, method, source), and (route, method) -> operationId
+        self.operations = {}
+        self._locations = {}
+        # operationIds added since loading; the others are stale until re-added
+        self._live = set()
+        # schema names registered by the operation being built, and the location
+        # of the operation it replaces
+        self._pending = set()
+        self._replacing = None
+        self.modified = False
+
+    @classmethod
+    def load(cls, filename):
+        """
+        Load an existing JSON or YAML spec to merge new operations into. A missing
+        file gives an empty spec. Reading YAML needs PyYAML; without it, ValueError
+        is raised rather than overwriting the spec from scratch.
+        """
+        if not os.path.exists(filename):
+            return cls()
+        with open(filename, "r", encoding="utf-8") as file:
+            if filename.lower().endswith((".yaml", ".yml")):
+                data = _load_yaml(file, filename)
+            else:
+                data = json.load(file)
+        info = data.get("info", {})
+        spec = cls(info.get("title", "Laravel API"), info.get("version", "1.0.0"))
+        spec.paths = data.get("paths", {})
+        components = data.get("components", {})
+        spec.schemas = components.get("schemas", {})
+        spec.responses = components.get("responses", {})
+        spec.security_schemes = components.get("securitySchemes", {})
+        for route, path_item in spec.paths.items():
+            for method, operation in path_item.items():
+                operation_id = operation.get("operationId") if isinstance(operation, dict) else None
+                if operation_id:
+                    spec.operations[operation_id] = (route, method, None)
+                    spec._locations[(route, method)] = operation_id
+        return spec
+
+    def _claim(self, operation_id, route, method, input_hash, source):
+        """
+        Reserve operation_id at route and method. Returns the current operation when
+        it was built from the same inputs, otherwise clears the way and returns None.
+        """
+        indexed = self.operations.get(operation_id)
+        if indexed and operation_id in self._live:
+            if indexed[:2] != (route, method):
+                raise ValueError(
+                    f"operationId {operation_id} already documents {indexed[1].upper()} {indexed[0]}"
+                )
+            if source and indexed[2] and indexed[2] != source:
+                raise ValueError(f"operationId {operation_id} is already generated from {indexed[2]}")
+        occupant = self._locations.get((route, method))
+        if occupant not in (None, operation_id) and occupant in self._live:
+            raise ValueError(f"{method.upper()} {route} is already documented by {occupant}")
+
+        if indexed and indexed[:2] == (route, method):
+            current = self.paths[route][method]
+            if current.get("x-input-hash") == input_hash:
+                self.operations[operation_id] = (route, method, source or indexed[2])
+                self._live.add(operation_id)
+                return current
+        elif indexed:
+            self.remove_operation(operation_id)
+        if occupant is not None:
+            # The replacement is stored under the same key, keeping the path item's
+            # order; until then the old operation's components do not count as used
+            self.operations.pop(occupant, None)
+            self._live.discard(occupant)
+            self._replacing = (route, method)
+        return None
+
+    def remove_operation(self, operation_id):
+        """Drop an operation from the spec. Returns False when it is not there."""
+        indexed = self.operations.pop(operation_id, None)
+        if indexed is None:
+            return False
+        route, method, _ = indexed
+        self._locations.pop((route, method), None)
+        self._live.discard(operation_id)
+        path_item = self.paths.get(route, {})
+        path_item.pop(method, None)
+        if not path_item:
+            self.paths.pop(route, None)
+        self.modified = True
+        return True
 
-        details, route_param, status, message = extract_details_from_controller(controller_input)
-        swagger_doc = generate_swagger_doc(
-            details, route_param, module_name, route_prefix, operation_type, status, message
+    def remove_stale_operations(self):
+        """Drop the loaded operations that were not added again. Returns how many."""
+        stale = [operation_id for operation_id in self.operations if operation_id not in self._live]
+        for operation_id in stale:
+            self.remove_operation(operation_id)
+        return len(stale)
+
+    def _referenced_components(self, exclude=None):
+        """Names of the schemas and responses reachable from the paths, ignoring exclude."""
+        schemas, responses = set(), set()
+        pending = []
+        for route, path_item in self.paths.items():
+            for method, operation in path_item.items():
+                if (route, method) != exclude:
+                    pending.extend(_iter_refs(operation))
+        while pending:
+            kind, _, name = pending.pop().rpartition("/")
+            if kind == "#/components/schemas" and name not in schemas:
+                schemas.add(name)
+                pending.extend(_iter_refs(self.schemas.get(name)))
+            elif kind == "#/components/responses" and name not in responses:
+                responses.add(name)
+                pending.extend(_iter_refs(self.responses.get(name)))
+        return schemas, responses
+
+    def _ref_schema(self, name, schema):
+        """Register a schema under components and return a $ref to it."""
+        base_name = name
+        counter = 2
+        referenced = None
+        while name in self.schemas and self.schemas[name] != schema:
+            # A name only left behind by a replaced operation is reused
+            if referenced is None:
+                referenced = self._pending | self._referenced_components(self._replacing)[0]
+            if name not in referenced:
+                break
+            name = f"{base_name}{counter}"
+            counter += 1
+        if self.schemas.get(name) != schema:
+            self.schemas[name] = schema
+            self.modified = True
+        self._pending.add(name)
+        return {"$ref": f"#/components/schemas/{name}"}
+
+    def _ref_response(self, name):
+        """Register one of the shared responses and return a $ref to it."""
+        if name not in self.responses:
+            if name == "Unauthenticated":
+                self.responses[name] = {
+                    "description": "Bad Request",
+                    "content": {"application/json": {"schema": {
+                        "type": "object",
+                        "properties": {"message": {"type": "string", "example": "Unauthenticated"}},
+                    }}},
+                }
+            elif name == "NotFound":
+                self.responses[name] = {
+                    "description": "Error recurso no encontrado",
+                    "content": {"application/json": {
+                        "schema": self._ref_schema("StatusMessage", STATUS_MESSAGE_SCHEMA),
+                        "example": {"status": "error", "message": "Recurso no encontrado"},
+                    }},
+                }
+        return {"$ref": f"#/components/responses/{name}"}
+
+    def _ref_security(self):
+        """Register the token security scheme and return the security requirement."""
+        self.security_schemes["token"] = {"type": "http", "scheme": "bearer"}
+        return [{"token": []}]
+
+    @instrumentation.timed("rendering")
+    def add_operation(
+        self,
+        details,
+        route_param,
+        module_name="Example",
+        route_prefix="/api/v1",
+        operation_type="store",
+        status='',
+        message='',
+        tag_type="Backoffice",
+        source=None
+    ):
+        """
+        Add an operation built from extracted controller details to the spec. When the
+        spec already holds it with the same inputs it is returned untouched. source,
+        such as the controller filename, lets two files claiming one operationId clash.
+        """
+        route, method = resolve_route(route_prefix, module_name, operation_type, route_param)
+        method = method.lower()
+        operation_id = operation_id_for(operation_type, module_name)
+        input_hash = _input_hash(
+            details, route_param, module_name, route_prefix, operation_type, status, message, tag_type
         )
+        self._replacing = None
+        current = self._claim(operation_id, route, method, input_hash, source)
+        if current is not None:
+            return current
+
+        self._pending = set()
+        operation = {
+            "tags": [f"{module_name.title()} {tag_type}"],
+            "description": f"{operation_type.capitalize()} {module_name.title()}",
+            "operationId": operation_id,
+            "x-input-hash": input_hash,
+            "security": self._ref_security(),
+        }
+
+        if operation_type in ("update", "show", "delete"):
+            operation["parameters"] = [{
+                "name": route_param,
+                "in": "path",
+                "description": f"ID of the resource to {operation_type}",
+                "required": True,
+                "schema": {"type": "integer", "example": 1},
+            }]
+        elif operation_type == "index":
+            operation["parameters"] = [
+                {
+                    "name": field,
+                    "in": "query",
+                    "description": field.replace('_', ' ').capitalize(),
+                    "required": False,
+                    "schema": field_schema(field, props, module_name, description=False),
+                }
+                for field, props in details.items()
+            ]
+
+        if operation_type not in ("index", "show", "delete"):
+            request_schema = {
+                "type": "object",
+                "properties": {
+                    field: field_schema(field, props, module_name) for field, props in details.items()
+                },
+            }
+            required_fields = [field for field, props in details.items() if props["required"]]
+            if required_fields:
+                request_schema["required"] = required_fields
+            schema_name = f"{module_name.title().replace(' ', '')}Request"
+            operation["requestBody"] = {
+                "required": True,
+                "content": {"multipart/form-data": {
+                    "schema": self._ref_schema(schema_name, request_schema)
+                }},
+            }
+
+        if operation_type == "delete":
+            success_code = "200"
+            success = {
+                "description": "Successful Deleted",
+                "content": {"application/json": {
+                    "schema": self._ref_schema("StatusMessage", STATUS_MESSAGE_SCHEMA),
+                    "example": {
+                        "status": status or "successful",
+                        "message": message or "Recurso borrado",
+                    },
+                }},
+            }
+        else:
+            success_code = "201" if operation_type.lower() == "store" else "200"
+            success = {
+                "description": f"Successful {operation_type}",
+                "content": {"application/json": {
+                    "schema": self._ref_schema("DataResponse", DATA_RESPONSE_SCHEMA)
+                }},
+            }
+
+        operation["responses"] = {success_code: success, "401": self._ref_response("Unauthenticated")}
+        if operation_type in ("update", "show", "delete"):
+            operation["responses"]["404"] = self._ref_response("NotFound")
+
+        self.paths.setdefault(route, {})[method] = operation
+        self._replacing = None
+        self.operations[operation_id] = (route, method, source)
+        self._locations[(route, method)] = operation_id
+        self._live.add(operation_id)
+        self.modified = True
+        return operation
+
+    def apply_response_schemas(self, schemas_by_operation):
+        """
+        Replace the generic success response of each operation with the schema inferred
+        from its recorded responses. Object subtrees shared between schemas, such as the
+        pagination meta, are emitted once under components and referenced with $ref.
+        """
+        shared = _shared_subtrees(schemas_by_operation.values())
+        refs = {}
+        self._pending = set()
+        for path_item in self.paths.values():
+            for operation in path_item.values():
+                operation_id = operation.get("operationId")
+                schema = schemas_by_operation.get(operation_id)
+                if schema is None:
+                    continue
+                for code, response in operation["responses"].items():
+                    if code.startswith("2") and "content" in response:
+                        content = response["content"]["application/json"]
+                        factored = self._factor_schema(schema, f"{operation_id}_response", shared, refs)
+                        if content.get("schema") != factored:
+                            content["schema"] = factored
+                            self.modified = True
+                        break
+
+    def _factor_schema(self, schema, name, shared, refs):
+        """Swap shared object subtrees of schema for $refs to components."""
+        if schema.get("type") == "object" and "properties" in schema:
+            factored = dict(schema, properties={
+                key: self._factor_schema(value, key, shared, refs)
+                for key, value in schema["properties"].items()
+            })
+            canonical = _canonical_schema(schema)
+            if canonical not in shared:
+                return factored
+            if canonical not in refs:
+                component_name = "".join(
+                    part.capitalize() for part in re.split(r"[^A-Za-z0-9]+", name) if part
+                ) or "Schema"
+                refs[canonical] = self._ref_schema(component_name, factored)
+            return refs[canonical]
+        if schema.get("type") == "array":
+            return dict(schema, items=self._factor_schema(schema["items"], f"{name}_item", shared, refs))
+        if "anyOf" in schema:
+            return dict(schema, anyOf=[
+                self._factor_schema(option, name, shared, refs) for option in schema["anyOf"]
+            ])
+        return schema
+
+    def to_dict(self):
+        """Return the whole spec as a plain dictionary, without orphaned components."""
+        schema_names, response_names = self._referenced_components()
+        components = {}
+        if schema_names:
+            components["schemas"] = {
+                name: schema for name, schema in self.schemas.items() if name in schema_names
+            }
+        if response_names:
+            components["responses"] = {
+                name: response for name, response in self.responses.items() if name in response_names
+            }
+        if self.security_schemes:
+            components["securitySchemes"] = self.security_schemes
+        return {
+            "openapi": "3.0.3",
+            "info": {"title": self.title, "version": self.version},
+            "paths": self.paths,
+            "components": components,
+        }
+
+    @instrumentation.timed("writing")
+    def write(self, filename):
+        """Stream the spec to disk as JSON or YAML depending on the file extension."""
+        spec = self.to_dict()
+        if filename.lower().endswith((".yaml", ".yml")):
+            chunks = _iter_yaml(spec)
+        else:
+            chunks = json.JSONEncoder(indent=2, ensure_ascii=False).iterencode(spec)
+        with atomic_open(filename) as file:
+            for chunk in chunks:
+                file.write(chunk)
 
-        output_text.delete("1.0", tk.END)
-        output_text.insert(tk.END, swagger_doc)
-    except Exception as e:
-        messagebox.showerror("Error", str(e))
-
-
-# UI Setup
-root = tk.Tk()
-root.title("Laravel Swagger Documentation Generator")
-tag_frame = tk.Frame(root)
-tag_frame.pack(pady=10, padx=10, fill="x")
-# Input Frame
-input_frame = tk.Frame(root)
-input_frame.pack(pady=10, padx=10, fill="x")
-
-# Create a BooleanVar to hold the state of the checkbox
-boolean_var = tk.BooleanVar(value=False)
-
-# Function to update the visibility of the tag list
-def update_tag_list_visibility():
-    if boolean_var.get():
-        tag_list_label.pack(anchor="w", padx=10)
-        tag_list_frame.pack(pady=10, padx=10, fill="x")
-        update_tag_list()
+
+def infer_response_schema(data):
+    """
+    Typed counterpart of pather's parse_json_structure: walk the keys of a decoded
+    JSON response and record an OpenAPI type for every value. Unlike
+    parse_json_structure, every list item is merged instead of only the first.
+    """
+    return finalize_response_schema(_infer_schema(data))
+
+
+def _infer_schema(data):
+    """
+    infer_response_schema before finalizing: a null is kept as the typeless
+    {"nullable": True}, so merging it with a typed sample makes that type nullable.
+    """
+    if isinstance(data, dict):
+        schema = {"type": "object"}
+        if data:
+            schema["required"] = list(data)
+        schema["properties"] = {key: _infer_schema(value) for key, value in data.items()}
+        return schema
+    if isinstance(data, list):
+        items = {}
+        for item in data:
+            items = merge_response_schemas(items, _infer_schema(item))
+        return {"type": "array", "items": items}
+    if isinstance(data, bool):
+        return {"type": "boolean"}
+    if isinstance(data, int):
+        return {"type": "integer"}
+    if isinstance(data, float):
+        return {"type": "number"}
+    if isinstance(data, str):
+        return {"type": "string"}
+    return {"nullable": True}
+
+
+def merge_response_schemas(left, right):
+    """
+    Merge two inferred schemas: object properties are united and only keys present
+    in both stay required, nulls make a schema nullable and mismatched types
+    become anyOf.
+    """
+    if not left or left == right:
+        return right
+    if not right:
+        return left
+    if set(left) == {"nullable"}:
+        return dict(right, nullable=True)
+    if set(right) == {"nullable"}:
+        return dict(left, nullable=True)
+
+    left_type, right_type = left.get("type"), right.get("type")
+    if left_type == right_type == "object":
+        properties = dict(left.get("properties", {}))
+        for key, value in right.get("properties", {}).items():
+            properties[key] = merge_response_schemas(properties.get(key), value)
+        right_required = set(right.get("required", []))
+        required = [key for key in left.get("required", []) if key in right_required]
+        merged = {"type": "object"}
+        if required:
+            merged["required"] = required
+        merged["properties"] = properties
+    elif left_type == right_type == "array":
+        merged = {"type": "array", "items": merge_response_schemas(left["items"], right["items"])}
+    elif {left_type, right_type} == {"integer", "number"}:
+        merged = {"type": "number"}
     else:
-        tag_list_label.pack_forget()
-        tag_list_frame.pack_forget()
+        options = list(left.get("anyOf", [left]))
+        options += [option for option in right.get("anyOf", [right]) if option not in options]
+        merged = {"anyOf": options}
 
-tag_label = tk.Label(tag_frame, text="Tag Type:")
-tag_label.pack(anchor="w")
-tag_type_var = tk.StringVar(value="Backoffice")
-tag_dropdown = ttk.Combobox(tag_frame, textvariable=tag_type_var, state="readonly")
-update_tag_dropdown()
-tag_dropdown.bind("<<ComboboxSelected>>", handle_tag_selection)
-tag_dropdown.pack(side="left")
+    if left.get("nullable") or right.get("nullable"):
+        merged["nullable"] = True
+    return merged
 
-# Create a Checkbutton and place it to the right of the dropdown
-boolean_checkbutton = tk.Checkbutton(tag_frame, text="Delete", variable=boolean_var, command=update_tag_list_visibility)
-boolean_checkbutton.pack(side="right")
 
+def finalize_response_schema(schema):
+    """
+    Make a merged schema valid OpenAPI 3.0: properties only ever seen as null are
+    left out, since their type is unknown, and typeless items become any value.
+    """
+    if "properties" in schema:
+        properties = {
+            key: finalize_response_schema(value) for key, value in schema["properties"].items()
+            if set(value) != {"nullable"}
+        }
+        schema = dict(schema, properties=properties)
+        if "required" in schema:
+            required = [key for key in schema["required"] if key in properties]
+            if required:
+                schema["required"] = required
+            else:
+                del schema["required"]
+    if "items" in schema:
+        items = schema["items"]
+        schema = dict(schema, items={} if set(items) <= {"nullable"} else finalize_response_schema(items))
+    if "anyOf" in schema:
+        schema = dict(schema, anyOf=[finalize_response_schema(option) for option in schema["anyOf"]])
+    return {} if set(schema) == {"nullable"} else schema
+
+
+def _canonical_schema(schema):
+    """Stable text form of a schema, used to spot identical subtrees."""
+    return json.dumps(schema, sort_keys=True)
+
+
+def _shared_subtrees(schemas):
+    """Canonical forms of the object subtrees (2+ properties) that occur more than once."""
+    counts = {}
+
+    def visit(schema):
+        if schema.get("type") == "object" and len(schema.get("properties", {})) > 1:
+            canonical = _canonical_schema(schema)
+            counts[canonical] = counts.get(canonical, 0) + 1
+        for value in schema.get("properties", {}).values():
+            visit(value)
+        if schema.get("type") == "array":
+            visit(schema["items"])
+        for option in schema.get("anyOf", []):
+            visit(option)
+
+    for schema in schemas:
+        visit(schema)
+    return {canonical for canonical, count in counts.items() if count > 1}
+
+
+def _infer_schema_file(filename):
+    """Worker: infer the schema of one recorded response file."""
+    try:
+        with open(filename, "r", encoding="utf-8") as file:
+            return filename, _infer_schema(json.load(file)), None
+    except (IOError, ValueError) as e:
+        return filename, None, str(e)
 
 
-# # Tag List Frame
-# if boolean_var.get():
-#     tag_list_label = tk.Label(root, text="Tag List:")
-#     tag_list_label.pack(anchor="w", padx=10)
+@instrumentation.timed("schema_inference")
+def infer_response_schemas(directory, max_workers=None, processes=True):
+    """
+    Infer one merged response schema per operationId from a directory of recorded
+    JSON responses named after the operation, e.g. index_procedure.json. Several
+    recordings of one route (index_procedure.page2.json, ...) are merged. Files
+    are parsed in parallel worker processes unless processes is False, which the
+    GUI needs: spawned workers would re-import its __main__.
+    """
+    filenames = sorted(
+        entry.path for entry in os.scandir(directory)
+        if entry.is_file() and entry.name.endswith(".json")
+    )
+    if processes and len(filenames) > 1:
+        # Imported here so the headless core does not load multiprocessing on import
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers) as executor:
+            results = list(executor.map(_infer_schema_file, filenames, chunksize=16))
+    else:
+        results = [_infer_schema_file(filename) for filename in filenames]
 
-#     tag_list_frame = tk.Frame(root)
-#     tag_list_frame.pack(pady=10, padx=10, fill="x")
-#     update_tag_list()
+    schemas = {}
+    for filename, schema, error in results:
+        if error is not None:
+            logger.warning("Skipping recorded response %s: %s", filename, error)
+            continue
+        operation_id = os.path.basename(filename).split(".", 1)[0]
+        schemas[operation_id] = merge_response_schemas(schemas.get(operation_id), schema)
+    return {operation_id: finalize_response_schema(schema) for operation_id, schema in schemas.items()}
 
 
-# Tag List Frame
-tag_list_label = tk.Label(root, text="Tag List:")
-tag_list_label.pack(anchor="w", padx=10)
+STATUS_MESSAGE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "status": {"type": "string"},
+        "message": {"type": "string"},
+    },
+}
 
-tag_list_frame = tk.Frame(root)
-tag_list_frame.pack(pady=10, padx=10, fill="x")
-update_tag_list()
+DATA_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {"data": {"type": "object"}},
+}
 
-# Initially update the visibility based on the boolean variable
-update_tag_list_visibility()
-controller_label = tk.Label(input_frame, text="Controller Code:")
-controller_label.pack(anchor="w")
+_YAML_PLAIN_KEY = re.compile(r"^[A-Za-z_][A-Za-z0-9_\-.]*$")
 
-controller_text = ScrolledText(input_frame, height=15)
-controller_text.pack(fill="x")
+# Plain words that YAML 1.1 loaders (PyYAML) resolve to booleans or null
+_YAML_RESERVED_WORDS = {"y", "yes", "n", "no", "true", "false", "on", "off", "null"}
 
-route_prefix_label = tk.Label(input_frame, text="Route Prefix (optional):")
-route_prefix_label.pack(anchor="w")
 
-route_prefix_entry = tk.Entry(input_frame)
-route_prefix_entry.pack(fill="x")
+def _load_yaml(file, filename):
+    """Parse a YAML spec with PyYAML, an optional dependency only needed to read YAML."""
+    try:
+        import yaml
+    except ImportError:
+        raise ValueError(f"Merging into {filename} needs PyYAML (pip install pyyaml), or use a .json spec")
+    try:
+        return yaml.safe_load(file) or {}
+    except yaml.YAMLError as e:
+        raise ValueError(f"Invalid YAML in {filename}: {e}")
+
+
+def _yaml_key(key):
+    """Render a mapping key, quoting it unless it reads back as the same string."""
+    key = str(key)
+    if _YAML_PLAIN_KEY.match(key) and key.lower() not in _YAML_RESERVED_WORDS:
+        return key
+    return json.dumps(key, ensure_ascii=False)
+
+
+def _yaml_scalar(value):
+    """Render a scalar (or empty container) as a YAML flow value."""
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, float):
+        if math.isnan(value):
+            return ".nan"
+        if math.isinf(value):
+            return ".inf" if value > 0 else "-.inf"
+        text = repr(value)
+        # YAML 1.1 floats need a dot: 1e-05 would read back as a string
+        mantissa, _, exponent = text.partition("e")
+        if "." not in mantissa:
+            mantissa += ".0"
+        return f"{mantissa}e{exponent}" if exponent else mantissa
+    if isinstance(value, dict):
+        return "{}"
+    if isinstance(value, list):
+        return "[]"
+    return json.dumps(str(value), ensure_ascii=False)
+
+
+def _iter_yaml(value, indent=0):
+    """Yield the YAML representation of a JSON-compatible value line by line."""
+    pad = "  " * indent
+    if isinstance(value, dict):
+        for key, item in value.items():
+            key = _yaml_key(key)
+            if isinstance(item, (dict, list)) and item:
+                yield f"{pad}{key}:\n"
+                yield from _iter_yaml(item, indent + 1)
+            else:
+                yield f"{pad}{key}: {_yaml_scalar(item)}\n"
+    elif isinstance(value, list):
+        for item in value:
+            if isinstance(item, (dict, list)) and item:
+                yield f"{pad}-\n"
+                yield from _iter_yaml(item, indent + 1)
+            else:
+                yield f"{pad}- {_yaml_scalar(item)}\n"
+    else:
+        yield f"{pad}{_yaml_scalar(value)}\n"
 
-module_name_label = tk.Label(input_frame, text="Module Name (optional):")
-module_name_label.pack(anchor="w")
 
-module_name_entry = tk.Entry(input_frame)
-module_name_entry.pack(fill="x")
+def _current_umask():
+    """The process umask, which can only be read by setting it."""
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
 
-# Dropdown for operation type
-operation_type_label = tk.Label(input_frame, text="Operation Type:")
-operation_type_label.pack(anchor="w")
 
-operation_type_var = tk.StringVar(value="store")
-operation_type_dropdown = ttk.Combobox(
-    input_frame, textvariable=operation_type_var, state="readonly"
-)
-operation_type_dropdown["values"] = ["store", "update", "index", "show", "delete"]
-operation_type_dropdown.pack(fill="x")
+@contextmanager
+def atomic_open(filename):
+    """Open a temp file next to filename and rename it over filename on success."""
+    directory = os.path.dirname(os.path.abspath(filename))
+    fd, temp_name = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as file:
+            yield file
+        if os.path.exists(filename):
+            shutil.copymode(filename, temp_name)
+        else:
+            # mkstemp creates 0600 files; give new files the mode open() would have
+            os.chmod(temp_name, 0o666 & ~_current_umask())
+        os.replace(temp_name, filename)
+    except BaseException:
+        if os.path.exists(temp_name):
+            os.unlink(temp_name)
+        raise
 
 
+def atomic_write(filename, text):
+    """
+    Atomically replace filename with text. Returns False without touching the
+    file when its content would not change.
+    """
+    try:
+        with open(filename, "r", encoding="utf-8", newline="") as file:
+            if file.read() == text:
+                return False
+    except FileNotFoundError:
+        pass
+    with atomic_open(filename) as file:
+        file.write(text)
+    return True
+
+
+# Controller method names that each operation type documents
+OPERATION_METHODS = {
+    "store": ("store",),
+    "update": ("update",),
+    "index": ("index",),
+    "show": ("show",),
+    "delete": ("delete", "destroy"),
+}
+
+_METHOD_PATTERN = re.compile(
+    r"^([ \t]*)(?:(?:public|protected|private|static|final|abstract)\s+)*function\s+(\w+)\s*\(",
+    re.MULTILINE,
+)
 
-# Buttons
-button_frame = tk.Frame(root)
-button_frame.pack(pady=10)
 
-generate_button = tk.Button(
-    button_frame, text="Generate Documentation", command=generate_documentation
+# Tokens that matter for brace matching: strings and comments are skipped whole
+_BRACE_TOKEN_PATTERN = re.compile(
+    r"""'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*"|//[^\n]*|#[^\n]*|/\*.*?\*/|[{}]""",
+    re.DOTALL,
 )
-generate_button.pack()
+_BODY_START_PATTERN = re.compile(r"[{;]")
 
-# Output Frame
-output_frame = tk.Frame(root)
-output_frame.pack(pady=10, padx=10, fill="x")
 
-output_label = tk.Label(output_frame, text="Generated Documentation:")
-output_label.pack(anchor="w")
+def _match_brace(code, open_index, limit):
+    """
+    Return the offset just after the brace closing the one at open_index, or limit
+    when it is not closed before limit.
+    """
+    depth = 0
+    for token in _BRACE_TOKEN_PATTERN.finditer(code, open_index, limit):
+        if token.group() == "{":
+            depth += 1
+        elif token.group() == "}":
+            depth -= 1
+            if depth == 0:
+                return token.end()
+    return limit
+
+
+def iter_controller_methods(controller_code):
+    """
+    Yield (name, indent, start, end) for each method of a controller, where start is
+    the offset of the signature line and end the offset after the method body.
+    A body never extends past the next method signature, which keeps unbalanced
+    input linear instead of rescanning the rest of the file for every method.
+    """
+    matches = list(_METHOD_PATTERN.finditer(controller_code))
+    for position, match in enumerate(matches):
+        limit = matches[position + 1].start() if position + 1 < len(matches) else len(controller_code)
+        body = _BODY_START_PATTERN.search(controller_code, match.end(), limit)
+        if body is None:
+            end = limit
+        elif body.group() == ";":
+            # Abstract or interface method without a body
+            end = body.end()
+        else:
+            end = _match_brace(controller_code, body.start(), limit)
+        yield match.group(2), match.group(1), match.start(), end
+
+
+def _indent_docblock(swagger_doc, indent, newline="\n"):
+    """Re-indent a generated docblock so it sits above a method."""
+    lines = []
+    for line in swagger_doc.strip().splitlines():
+        line = line.strip()
+        lines.append(indent + (line if line.startswith("/**") else " " + line))
+    return newline.join(lines) + newline
+
+
+def _paren_depth(text):
+    """Net number of parentheses opened by a line, ignoring quoted strings."""
+    text = QUOTED_PATTERN.sub("", text)
+    return text.count("(") - text.count(")")
 
-output_text = ScrolledText(output_frame, height=20)
-output_text.pack(fill="x")
 
-# Run UI
-root.mainloop()
+def _merge_docblock(existing, swagger_doc, indent, newline="\n"):
+    """
+    Merge a generated @OA docblock into the docblock already above a method: any
+    @OA annotation in it is replaced, and the description and other tags stay where
+    they were, before or after it. PHP only attaches the last docblock to a method,
+    so the two can't be stacked.
+    """
+    generated = _indent_docblock(swagger_doc, indent, newline).split(newline)[:-1]
+    before, after = [], []
+    kept = before
+    depth = 0
+    for line in existing.strip()[3:-2].splitlines():
+        text = line.strip()
+        if depth > 0:
+            depth = max(0, depth + _paren_depth(text))
+            continue
+        if text.lstrip("*").strip().startswith("@OA\\"):
+            # Skip the whole annotation, up to the line closing its parentheses
+            depth = max(0, _paren_depth(text))
+            kept = after
+            continue
+        if text.startswith("*"):
+            kept.append(line.rstrip())
+        elif text:
+            # Text on the /** line itself, or a line without the leading star
+            kept.append(f"{indent} * {text}")
+    while before and before[-1].strip() == "*":
+        before.pop()
+    while after and after[0].strip() == "*":
+        after.pop(0)
+    while after and after[-1].strip() == "*":
+        after.pop()
+    separator = [f"{indent} *"]
+    lines = generated[:1]
+    if before:
+        lines += before + separator
+    lines += generated[1:-1]
+    if after:
+        lines += separator + after
+    return newline.join(lines + generated[-1:]) + newline
+
+
+def apply_annotations(controller_code, docs_by_method):
+    """
+    Place or replace the @OA docblock above each method named in docs_by_method,
+    merging it into a doc comment the method already has.
+    """
+    newline = "\r\n" if "\r\n" in controller_code else "\n"
+    edits = []
+    for name, indent, start, _ in iter_controller_methods(controller_code):
+        if name not in docs_by_method:
+            continue
+        replace_from = start
+        docblock = _indent_docblock(docs_by_method[name], indent, newline)
+        preceding_end = start
+        while preceding_end > 0 and controller_code[preceding_end - 1].isspace():
+            preceding_end -= 1
+        if controller_code.endswith("*/", 0, preceding_end):
+            doc_start = controller_code.rfind("/**", 0, preceding_end)
+            if doc_start != -1 and "*/" not in controller_code[doc_start:preceding_end - 2]:
+                replace_from = controller_code.rfind("\n", 0, doc_start) + 1
+                docblock = _merge_docblock(
+                    controller_code[doc_start:preceding_end], docs_by_method[name], indent, newline
+                )
+        edits.append((replace_from, start, docblock))
+
+    # Stitch the untouched spans and the new docblocks together in one pass
+    pieces = []
+    position = 0
+    for replace_from, start, docblock in edits:
+        pieces.append(controller_code[position:replace_from])
+        pieces.append(docblock)
+        position = start
+    pieces.append(controller_code[position:])
+    return "".join(pieces)
+
+
+@instrumentation.timed("lexing")
+def find_operation_method(controller_code, operation_type):
+    """
+    Return the source of the method that documents operation_type, or None.
+    """
+    method_names = OPERATION_METHODS.get(operation_type, (operation_type,))
+    for name, _, start, end in iter_controller_methods(controller_code):
+        if name in method_names:
+            return controller_code[start:end]
+    return None
+
+
+@lru_cache(maxsize=512)
+def extract_method_details(method_code):
+    """
+    Memoized extract_details_from_controller for a single method's source, so
+    methods whose text did not change are not parsed again.
+    """
+    return extract_details_from_controller(method_code)
+
+
+def operation_args(controller_code, module_name, route_prefix, operation_type, tag_type):
+    """
+    generate_swagger_doc / OpenApiSpec.add_operation arguments for one operation,
+    extracted from only the method that implements it, or from the whole controller
+    when no such method is found; the same scope generate_all_operations uses.
+    """
+    method_code = find_operation_method(controller_code, operation_type) or controller_code
+    details, route_param, status, message = extract_method_details(method_code)
+    return (
+        details, route_param, module_name, route_prefix, operation_type,
+        status, message, tag_type
+    )
+
+
+def generate_operation_doc(controller_code, module_name, route_prefix, operation_type, tag_type,
+                           response_schema=None):
+    """
+    Generate the docblock for one operation. Generate and the live preview both use
+    this, so the preview always shows what Generate will produce.
+    """
+    return generate_swagger_doc(
+        *operation_args(controller_code, module_name, route_prefix, operation_type, tag_type),
+        response_schema
+    )
+
+
+def generate_all_operations(
+    controller_code,
+    module_name="Example",
+    route_prefix="/api/v1",
+    tag_type="Backoffice",
+    fallback=True,
+    response_schemas=None
+):
+    """
+    Parse a controller once and generate the docblock of every operation type, each
+    paired with the method that implements it. Returns an ordered dict of
+    operation type -> {"method", "indent", "source", "args", "doc"}, where args are
+    the generate_swagger_doc / OpenApiSpec.add_operation arguments. Operations
+    without a matching method use the whole controller, or are skipped when
+    fallback is False. response_schemas maps operationIds to inferred schemas.
+    """
+    with instrumentation.stage("lexing"):
+        methods = {}
+        for name, indent, start, end in iter_controller_methods(controller_code):
+            methods.setdefault(name, (indent, controller_code[start:end]))
+
+    results = {}
+    for operation_type, method_names in OPERATION_METHODS.items():
+        method = next((name for name in method_names if name in methods), None)
+        if method is None and not fallback:
+            continue
+        indent, source = methods[method] if method else ("", None)
+        details, route_param, status, message = extract_method_details(source or controller_code)
+        args = (
+            details, route_param, module_name, route_prefix, operation_type,
+            status, message, tag_type
+        )
+        results[operation_type] = {
+            "method": method,
+            "indent": indent,
+            "source": source,
+            "args": args,
+            "doc": generate_swagger_doc(
+                *args, (response_schemas or {}).get(operation_id_for(operation_type, module_name))
+            ),
+        }
+        instrumentation.count("operations")
+    return results
+
+
+def format_all_operations(results):
+    """
+    Render generate_all_operations results as one PHP snippet, each docblock placed
+    above its method body.
+    """
+    sections = []
+    for operation_type, result in results.items():
+        header = f"// {operation_type}: {result['method'] + '()' if result['method'] else 'no matching method'}"
+        if result["source"]:
+            body = _indent_docblock(result["doc"], result["indent"]) + result["source"]
+        else:
+            body = result["doc"]
+        sections.append(f"{header}\n{body}")
+    return "\n\n".join(sections) + "\n"
+
+
+@instrumentation.timed("writing")
+def write_back_annotations(filename, docs_by_operation):
+    """
+    Write generated docblocks above the matching methods of a controller file in a
+    single atomic rewrite. Returns True if the file changed.
+    """
+    docs_by_method = {
+        method: swagger_doc
+        for operation_type, swagger_doc in docs_by_operation.items()
+        for method in OPERATION_METHODS.get(operation_type, (operation_type,))
+    }
+    with open(filename, "r", encoding="utf-8", newline="") as file:
+        controller_code = file.read()
+    return atomic_write(filename, apply_annotations(controller_code, docs_by_method))
+
+
+def module_name_from_controller(filename):
+    """
+    Derive a module name such as "medical_record" from MedicalRecordController.php.
+    """
+    base = os.path.splitext(os.path.basename(filename))[0]
+    base = base.removesuffix("Controller") or base
+    return re.sub(r"(?<!^)(?=[A-Z])", "_", base).lower()
+
+
+class ControllerWatcher:
+    """Polls a controllers directory and regenerates docs for changed files only."""
+    def __init__(
+        self,
+        directory,
+        route_prefix="/api/v1",
+        tag_type="Backoffice",
+        spec_filename=None,
+        write_back=False,
+        response_schemas=None
+    ):
+        self.directory = directory
+        self.route_prefix = route_prefix
+        self.tag_type = tag_type
+        self.spec_filename = spec_filename
+        self.write_back = write_back
+        self.response_schemas = response_schemas or {}
+        self._stats = {}
+        # add_operation arguments and resulting operationIds per controller file
+        self._operations = {}
+        self._operation_ids = {}
+        # Merge into the existing spec so unchanged operations are left as they are
+        self.spec = OpenApiSpec.load(spec_filename) if spec_filename else None
+        self._merged_once = False
+
+    def scan(self):
+        """Return (changed, removed) controller files since the previous scan."""
+        stats = {}
+        for dirpath, _, filenames in os.walk(self.directory):
+            for name in filenames:
+                if not name.endswith(".php"):
+                    continue
+                path = os.path.join(dirpath, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                stats[path] = (stat.st_mtime_ns, stat.st_size)
+        changed = sorted(path for path, stat in stats.items() if self._stats.get(path) != stat)
+        removed = sorted(set(self._stats) - set(stats))
+        self._stats = stats
+        return changed, removed
+
+    def process(self, filename):
+        """Generate the docblocks of every operation implemented in one controller file."""
+        module_name = module_name_from_controller(filename)
+        with open(filename, "r", encoding="utf-8") as file:
+            controller_code = file.read()
+        instrumentation.count("bytes", len(controller_code))
+
+        results = generate_all_operations(
+            controller_code, module_name, self.route_prefix, self.tag_type, fallback=False,
+            response_schemas=self.response_schemas
+        )
+        docs = {operation_type: result["doc"] for operation_type, result in results.items()}
+        self._operations[filename] = [result["args"] for result in results.values()]
+
+        if self.write_back and docs and write_back_annotations(filename, docs):
+            # Our own rewrite must not count as a change on the next scan
+            stat = os.stat(filename)
+            self._stats[filename] = (stat.st_mtime_ns, stat.st_size)
+        return docs
+
+    def run_once(self):
+        """Process the files changed since the last call. Returns docs per file."""
+        changed, removed = self.scan()
+        results = {}
+        for filename in changed:
+            try:
+                with instrumentation.file(filename):
+                    results[filename] = self.process(filename)
+            except (IOError, ValueError) as e:
+                logger.error("%s: %s", filename, e)
+        for filename in removed:
+            self._operations.pop(filename, None)
+
+        if self.spec is not None and (changed or removed):
+            for filename in removed:
+                for operation_id in self._operation_ids.pop(filename, ()):
+                    self.spec.remove_operation(operation_id)
+            for filename in changed:
+                if filename in results:
+                    self.merge(filename)
+            if not self._merged_once:
+                # Operations of controllers deleted while we were not watching
+                self.spec.remove_stale_operations()
+                self._merged_once = True
+            if self.response_schemas:
+                self.spec.apply_response_schemas(self.response_schemas)
+            if self.spec.modified:
+                self.spec.write(self.spec_filename)
+                self.spec.modified = False
+        return results
+
+    def merge(self, filename):
+        """Update the spec with the operations of one processed controller file."""
+        operation_ids = set()
+        for args in self._operations.get(filename, ()):
+            try:
+                operation = self.spec.add_operation(*args, source=filename)
+            except ValueError as e:
+                logger.error("%s: %s", filename, e)
+                continue
+            operation_ids.add(operation["operationId"])
+        for operation_id in self._operation_ids.get(filename, set()) - operation_ids:
+            self.spec.remove_operation(operation_id)
+        self._operation_ids[filename] = operation_ids
+
+    def watch(self, interval=1.0):
+        """Poll the directory forever."""
+        while True:
+            yield self.run_once()
+            time.sleep(interval)
+
+
+def main(argv=None):
+    """
+    Launch the GUI, or watch a controllers directory when --watch is given.
+    """
+    parser = argparse.ArgumentParser(description="Laravel Swagger Documentation Generator")
+    parser.add_argument("--watch", metavar="DIRECTORY",
+                        help="regenerate docs whenever controllers in DIRECTORY change")
+    parser.add_argument("--once", action="store_true",
+                        help="with --watch, process the directory once and exit")
+    parser.add_argument("--interval", type=float, default=1.0,
+                        help="seconds between directory scans (default: 1.0)")
+    parser.add_argument("--tag-type", default="Backoffice")
+    parser.add_argument("--route-prefix",
+                        help="route prefix (default: the tag's prefix from tags.json)")
+    parser.add_argument("--spec", metavar="FILE",
+                        help="write an aggregated openapi.json or openapi.yaml")
+    parser.add_argument("--responses", metavar="DIRECTORY",
+                        help="recorded JSON responses named <operationId>.json, used to "
+                             "document exact response schemas in --spec")
+    parser.add_argument("--write-back", action="store_true",
+                        help="write the docblocks above the controller methods")
+    parser.add_argument("-v", "--verbose", action="count", default=0,
+                        help="log progress (-v) or debug details (-vv) to stderr")
+    parser.add_argument("--profile", action="store_true",
+                        help="print per-stage and per-controller timings on exit")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="append per-stage timing events to FILE as JSON lines")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=[logging.WARNING, logging.INFO, logging.DEBUG][min(args.verbose, 2)],
+        format="%(levelname)s %(name)s: %(message)s",
+    )
+    if args.profile or args.trace:
+        instrumentation.enable(args.trace)
+
+    if not args.watch:
+        from docsgenerator_gui import main as run_gui
+        run_gui()
+        return
+
+    route_prefix = args.route_prefix
+    if route_prefix is None:
+        route_prefix = TagManager().get_route_prefix(args.tag_type) or "/api/v1"
+    response_schemas = infer_response_schemas(args.responses) if args.responses else None
+    try:
+        watcher = ControllerWatcher(
+            args.watch, route_prefix, args.tag_type, args.spec, args.write_back, response_schemas
+        )
+    except (IOError, ValueError) as e:
+        parser.error(str(e))
+    try:
+        for results in watcher.watch(args.interval):
+            for filename, docs in results.items():
+                print(f"Regenerated {len(docs)} operation(s) for {filename}")
+                if not args.spec and not args.write_back:
+                    print("\n\n".join(docs.values()))
+            if args.once:
+                break
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if args.profile:
+            print(instrumentation.report(), file=sys.stderr)
+            rules = translate_rule.cache_info()
+            print(f"Validation rules: {rules.currsize} distinct translated, {rules.hits} reused", file=sys.stderr)
+        instrumentation.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,649 @@
+import queue
+import threading
+import tkinter as tk
+from tkinter import filedialog, messagebox, ttk
+from tkinter.scrolledtext import ScrolledText
+from docsgenerator import (
+    OpenApiSpec,
+    TagManager,
+    atomic_write,
+    format_all_operations,
+    generate_all_operations,
+    generate_operation_doc,
+    infer_response_schemas,
+    operation_args,
+    operation_id_for,
+    write_back_annotations,
+)
+from highlighter import Highlighter
+
+# Initialize tag manager
+tag_manager = TagManager()
+
+
+# Search text per tag name, and the names currently attached to the tag tree
+tag_search_index = {}
+visible_tags = set()
+last_tag_query = ""
+
+
+def tag_matches(name, query):
+    """Whether a tag matches the search query."""
+    return query in tag_search_index[name]
+
+
+def update_tag_list():
+    """Rebuild the tag tree from the tag manager (only when the list is opened)."""
+    tag_tree.delete(*tag_tree.get_children())
+    tag_search_index.clear()
+    visible_tags.clear()
+    for tag in tag_manager.tag_types:
+        insert_tag_row(tag)
+
+
+def insert_tag_row(tag):
+    """Add a single tag row, hidden right away if it does not match the search."""
+    name = tag['name']
+    route_prefix = tag.get('route_prefix', '')
+    tag_search_index[name] = f"{name} {route_prefix}".lower()
+    tag_tree.insert("", "end", iid=name, values=(name, route_prefix))
+    if tag_matches(name, last_tag_query):
+        visible_tags.add(name)
+    else:
+        tag_tree.detach(name)
+
+
+def delete_tag_row(name):
+    """Remove a single tag row."""
+    if tag_tree.exists(name):
+        tag_tree.delete(name)
+    tag_search_index.pop(name, None)
+    visible_tags.discard(name)
+
+
+def filter_tag_list(*args):
+    """
+    Filter the tag tree by the search text. Typing more only re-checks the visible
+    rows; erasing only re-checks the hidden ones.
+    """
+    global last_tag_query
+    query = tag_search_var.get().strip().lower()
+    if query.startswith(last_tag_query):
+        for name in [name for name in visible_tags if not tag_matches(name, query)]:
+            tag_tree.detach(name)
+            visible_tags.discard(name)
+    else:
+        # Reattach newly matching rows in their original order
+        candidates = [name for name in tag_search_index if name in visible_tags or tag_matches(name, query)]
+        if not last_tag_query.startswith(query):
+            for name in [name for name in visible_tags if not tag_matches(name, query)]:
+                tag_tree.detach(name)
+                visible_tags.discard(name)
+            candidates = [name for name in candidates if tag_matches(name, query)]
+        for index, name in enumerate(candidates):
+            tag_tree.move(name, "", index)
+            visible_tags.add(name)
+    last_tag_query = query
+
+
+def delete_tag(tag):
+    """Delete a tag from the list."""
+    tag_manager.delete_tag(tag)
+    update_tag_dropdown()
+    delete_tag_row(tag['name'] if isinstance(tag, dict) else tag)
+
+
+def delete_selected_tags(event=None):
+    """Delete the tags selected in the tag tree."""
+    for name in tag_tree.selection():
+        delete_tag(name)
+
+def update_tag_dropdown():
+    """Update the tag dropdown with the latest tag types."""
+    tag_dropdown['values'] = [tag['name'] for tag in tag_manager.tag_types] + ["Add"]
+
+def handle_tag_selection(event):
+    """Handle the selection of a tag in the dropdown."""
+    selected = tag_type_var.get()
+    if selected == "Add":
+        add_tag_popup()
+    else:
+        # Automatically populate route prefix when a tag is selected
+        route_prefix = tag_manager.get_route_prefix(selected)
+        route_prefix_entry.delete(0, tk.END)
+        route_prefix_entry.insert(0, route_prefix)
+
+def add_tag_popup():
+    """Show a popup window for adding a new tag."""
+    popup = tk.Toplevel(root)
+    popup.title("Add New Tag")
+
+    # Tag name input
+    tag_label = tk.Label(popup, text="Enter new tag:")
+    tag_label.pack(pady=5)
+    tag_entry = tk.Entry(popup)
+    tag_entry.pack(pady=5)
+
+    # Route prefix input
+    route_prefix_label = tk.Label(popup, text="Route Prefix (optional):")
+    route_prefix_label.pack(pady=5)
+    route_prefix_entry = tk.Entry(popup)
+    route_prefix_entry.pack(pady=5)
+
+    def save_new_tag():
+        new_tag = tag_entry.get().strip()
+        route_prefix = route_prefix_entry.get().strip()
+        
+        if tag_manager.add_tag(new_tag, route_prefix):
+            messagebox.showinfo("Success", f"Tag '{new_tag}' added successfully.")
+            update_tag_dropdown()
+            insert_tag_row({"name": new_tag, "route_prefix": tag_manager.get_route_prefix(new_tag)})
+        else:
+            messagebox.showwarning("Duplicate", f"Tag '{new_tag}' already exists.")
+        popup.destroy()
+
+    save_button = tk.Button(popup, text="Save", command=save_new_tag)
+    save_button.pack(pady=10)
+
+
+# Operations collected for the aggregated OpenAPI document, with their
+# add_operation arguments to replay into an existing spec on export
+openapi_spec = OpenApiSpec()
+spec_operations = []
+
+# Live preview state: pending after() job, latest request number and worker results
+PREVIEW_DELAY_MS = 400
+preview_job = None
+preview_generation = 0
+preview_results = queue.Queue()
+
+# (schemas, error) from the recorded-responses worker thread
+response_results = queue.Queue()
+
+# Response schemas inferred from recorded responses, keyed by operationId
+response_schemas = {}
+
+# Docblocks generated this session, keyed by (module name, operation type)
+generated_docs = {}
+
+# Combined output of the last "Generate All Operations" run, for export
+all_operations_output = ""
+
+
+def generate_documentation():
+    """
+    Main function to generate documentation and display it in the UI.
+    """
+    try:
+        controller_input = controller_text.get("1.0", tk.END).strip()
+        route_prefix = route_prefix_entry.get().strip()
+        module_name = module_name_entry.get().strip() or "Example"
+        operation_type = operation_type_var.get()
+
+        if not controller_input:
+            raise ValueError("Controller input is required.")
+
+        swagger_doc = generate_operation_doc(
+            controller_input, module_name, route_prefix, operation_type, tag_type_var.get(),
+            response_schemas.get(operation_id_for(operation_type, module_name))
+        )
+
+        generated_docs[(module_name, operation_type)] = swagger_doc
+
+        output_text.delete("1.0", tk.END)
+        output_text.insert(tk.END, swagger_doc)
+    except Exception as e:
+        messagebox.showerror("Error", str(e))
+
+
+def generate_all_documentation():
+    """
+    Parse the controller once and show the docblocks of all operations together.
+    """
+    global all_operations_output
+    try:
+        controller_input = controller_text.get("1.0", tk.END).strip()
+        route_prefix = route_prefix_entry.get().strip()
+        module_name = module_name_entry.get().strip() or "Example"
+
+        if not controller_input:
+            raise ValueError("Controller input is required.")
+
+        results = generate_all_operations(
+            controller_input, module_name, route_prefix, tag_type_var.get(),
+            response_schemas=response_schemas
+        )
+        for operation_type, result in results.items():
+            generated_docs[(module_name, operation_type)] = result["doc"]
+        all_operations_output = format_all_operations(results)
+
+        output_text.delete("1.0", tk.END)
+        output_text.insert(tk.END, all_operations_output)
+    except Exception as e:
+        messagebox.showerror("Error", str(e))
+
+
+def export_all_documentation():
+    """
+    Save the output of the last "Generate All Operations" run to a single file.
+    """
+    if not all_operations_output:
+        messagebox.showwarning("Empty", "Generate all operations first.")
+        return
+    filename = filedialog.asksaveasfilename(
+        initialfile=f"{module_name_entry.get().strip() or 'Example'}_docs.php",
+        defaultextension=".php",
+        filetypes=[("PHP files", "*.php"), ("Text files", "*.txt")],
+    )
+    if not filename:
+        return
+    try:
+        atomic_write(filename, all_operations_output)
+        messagebox.showinfo("Success", f"Documentation written to {filename}.")
+    except (IOError, OSError) as e:
+        messagebox.showerror("Error", f"Failed to write documentation: {e}")
+
+
+def schedule_preview(*args):
+    """
+    Debounce live preview requests so the docs regenerate once typing pauses.
+    """
+    global preview_job
+    if preview_job is not None:
+        root.after_cancel(preview_job)
+        preview_job = None
+    if live_preview_var.get():
+        preview_job = root.after(PREVIEW_DELAY_MS, start_preview)
+
+
+def start_preview():
+    """
+    Snapshot the inputs and regenerate the preview in a background thread.
+    """
+    global preview_job, preview_generation
+    preview_job = None
+    preview_generation += 1
+    controller_input = controller_text.get("1.0", tk.END).strip()
+    if not controller_input:
+        return
+    module_name = module_name_entry.get().strip() or "Example"
+    operation_type = operation_type_var.get()
+    threading.Thread(
+        target=run_preview,
+        args=(
+            preview_generation,
+            controller_input,
+            module_name,
+            route_prefix_entry.get().strip(),
+            operation_type,
+            tag_type_var.get(),
+            response_schemas.get(operation_id_for(operation_type, module_name)),
+        ),
+        daemon=True,
+    ).start()
+
+
+def run_preview(generation, controller_input, module_name, route_prefix, operation_type, tag_type,
+                response_schema=None):
+    """
+    Worker thread body: generate the docblock and hand it back to the UI thread.
+    """
+    try:
+        swagger_doc = generate_operation_doc(
+            controller_input, module_name, route_prefix, operation_type, tag_type, response_schema
+        )
+    except ValueError as e:
+        swagger_doc = f"Preview error: {e}"
+    preview_results.put((generation, swagger_doc))
+
+
+def poll_preview():
+    """
+    Show the newest finished preview; results of superseded edits are dropped.
+    """
+    try:
+        while True:
+            generation, swagger_doc = preview_results.get_nowait()
+            if generation == preview_generation and live_preview_var.get():
+                output_text.delete("1.0", tk.END)
+                output_text.insert(tk.END, swagger_doc)
+    except queue.Empty:
+        pass
+
+
+def poll_response_results():
+    """
+    Merge the schemas inferred by the recorded-responses worker, or report its error.
+    """
+    try:
+        while True:
+            schemas, error = response_results.get_nowait()
+            load_responses_button.config(state=tk.NORMAL)
+            if error is not None:
+                messagebox.showerror("Error", f"Failed to read recorded responses: {error}")
+                continue
+            response_schemas.update(schemas)
+            spec_status_label.config(
+                text=f"Operations in spec: {sum(len(m) for m in openapi_spec.paths.values())}, "
+                     f"recorded schemas: {len(response_schemas)}"
+            )
+    except queue.Empty:
+        pass
+
+
+def poll_tag_errors():
+    """
+    Report a failed debounced save of the tags file.
+    """
+    error = tag_manager.pop_error()
+    if error is not None:
+        messagebox.showerror("Error", f"Failed to save tags: {error}")
+
+
+def poll_background():
+    """
+    Hand the results of background work back to the UI thread.
+    """
+    poll_preview()
+    poll_response_results()
+    poll_tag_errors()
+    root.after(100, poll_background)
+
+
+def on_controller_modified(event=None):
+    """Schedule a preview whenever the controller text changes."""
+    if controller_text.edit_modified():
+        controller_text.edit_modified(False)
+        schedule_preview()
+
+
+def write_back_to_controller():
+    """
+    Write every docblock generated for the current module into a controller file.
+    """
+    module_name = module_name_entry.get().strip() or "Example"
+    docs_by_operation = {
+        operation_type: swagger_doc
+        for (module, operation_type), swagger_doc in generated_docs.items()
+        if module == module_name
+    }
+    if not docs_by_operation:
+        messagebox.showwarning("Empty", f"Generate documentation for '{module_name}' first.")
+        return
+    filename = filedialog.askopenfilename(filetypes=[("PHP files", "*.php")])
+    if not filename:
+        return
+    try:
+        if write_back_annotations(filename, docs_by_operation):
+            messagebox.showinfo("Success", f"Annotations written to {filename}.")
+        else:
+            messagebox.showinfo("Unchanged", f"{filename} is already up to date.")
+    except (IOError, ValueError) as e:
+        messagebox.showerror("Error", f"Failed to write annotations: {e}")
+
+
+def add_to_openapi_spec():
+    """
+    Add the current operation to the aggregated OpenAPI document.
+    """
+    try:
+        controller_input = controller_text.get("1.0", tk.END).strip()
+        route_prefix = route_prefix_entry.get().strip()
+        module_name = module_name_entry.get().strip() or "Example"
+        operation_type = operation_type_var.get()
+
+        if not controller_input:
+            raise ValueError("Controller input is required.")
+
+        args = operation_args(
+            controller_input, module_name, route_prefix, operation_type, tag_type_var.get()
+        )
+        openapi_spec.add_operation(*args)
+        spec_operations.append(args)
+        operation_count = sum(len(methods) for methods in openapi_spec.paths.values())
+        spec_status_label.config(text=f"Operations in spec: {operation_count}")
+    except Exception as e:
+        messagebox.showerror("Error", str(e))
+
+
+def export_openapi_spec():
+    """
+    Write the aggregated OpenAPI document to an openapi.json/openapi.yaml file. An
+    existing openapi.json is updated in place, replacing only the operations added here.
+    """
+    if not openapi_spec.paths:
+        messagebox.showwarning("Empty", "Add at least one operation to the spec first.")
+        return
+    filename = filedialog.asksaveasfilename(
+        initialfile="openapi.json",
+        defaultextension=".json",
+        filetypes=[("OpenAPI JSON", "*.json"), ("OpenAPI YAML", "*.yaml *.yml")],
+    )
+    if not filename:
+        return
+    try:
+        spec = OpenApiSpec.load(filename)
+        for args in spec_operations:
+            spec.add_operation(*args)
+        if response_schemas:
+            spec.apply_response_schemas(response_schemas)
+        spec.write(filename)
+        messagebox.showinfo("Success", f"OpenAPI spec written to {filename}.")
+    except (IOError, ValueError) as e:
+        messagebox.showerror("Error", f"Failed to write spec: {e}")
+
+
+# UI Setup
+root = tk.Tk()
+root.title("Laravel Swagger Documentation Generator")
+tag_frame = tk.Frame(root)
+tag_frame.pack(pady=10, padx=10, fill="x")
+# Input Frame
+input_frame = tk.Frame(root)
+input_frame.pack(pady=10, padx=10, fill="x")
+
+# Create a BooleanVar to hold the state of the checkbox
+boolean_var = tk.BooleanVar(value=False)
+
+# Function to update the visibility of the tag list
+def update_tag_list_visibility():
+    if boolean_var.get():
+        tag_list_label.pack(anchor="w", padx=10)
+        tag_list_frame.pack(pady=10, padx=10, fill="x")
+        update_tag_list()
+    else:
+        tag_list_label.pack_forget()
+        tag_list_frame.pack_forget()
+
+tag_label = tk.Label(tag_frame, text="Tag Type:")
+tag_label.pack(anchor="w")
+tag_type_var = tk.StringVar(value="Backoffice")
+tag_dropdown = ttk.Combobox(tag_frame, textvariable=tag_type_var, state="readonly")
+update_tag_dropdown()
+tag_dropdown.bind("<<ComboboxSelected>>", handle_tag_selection)
+tag_dropdown.pack(side="left")
+
+# Create a Checkbutton and place it to the right of the dropdown
+boolean_checkbutton = tk.Checkbutton(tag_frame, text="Delete", variable=boolean_var, command=update_tag_list_visibility)
+boolean_checkbutton.pack(side="right")
+
+
+
+# # Tag List Frame
+# if boolean_var.get():
+#     tag_list_label = tk.Label(root, text="Tag List:")
+#     tag_list_label.pack(anchor="w", padx=10)
+
+#     tag_list_frame = tk.Frame(root)
+#     tag_list_frame.pack(pady=10, padx=10, fill="x")
+#     update_tag_list()
+
+
+# Tag List Frame
+tag_list_label = tk.Label(root, text="Tag List:")
+tag_list_label.pack(anchor="w", padx=10)
+
+tag_list_frame = tk.Frame(root)
+tag_list_frame.pack(pady=10, padx=10, fill="x")
+
+tag_search_var = tk.StringVar()
+tag_search_entry = tk.Entry(tag_list_frame, textvariable=tag_search_var)
+tag_search_entry.pack(fill="x")
+tag_search_var.trace_add("write", filter_tag_list)
+
+tag_tree = ttk.Treeview(
+    tag_list_frame, columns=("name", "route_prefix"), show="headings", height=6
+)
+tag_tree.heading("name", text="Tag")
+tag_tree.heading("route_prefix", text="Route Prefix")
+tag_tree_scrollbar = ttk.Scrollbar(tag_list_frame, orient="vertical", command=tag_tree.yview)
+tag_tree.configure(yscrollcommand=tag_tree_scrollbar.set)
+tag_tree_scrollbar.pack(side="right", fill="y")
+tag_tree.pack(fill="x")
+tag_tree.bind("<Delete>", delete_selected_tags)
+
+delete_tag_button = tk.Button(
+    tag_list_frame, text="Delete Selected", fg="red", command=delete_selected_tags
+)
+delete_tag_button.pack(anchor="e", pady=(5, 0))
+update_tag_list()
+
+# Initially update the visibility based on the boolean variable
+update_tag_list_visibility()
+controller_label = tk.Label(input_frame, text="Controller Code:")
+controller_label.pack(anchor="w")
+
+controller_text = ScrolledText(input_frame, height=15)
+controller_text.pack(fill="x")
+controller_text.bind("<<Modified>>", on_controller_modified)
+
+route_prefix_label = tk.Label(input_frame, text="Route Prefix (optional):")
+route_prefix_label.pack(anchor="w")
+
+route_prefix_entry = tk.Entry(input_frame)
+route_prefix_entry.pack(fill="x")
+
+module_name_label = tk.Label(input_frame, text="Module Name (optional):")
+module_name_label.pack(anchor="w")
+
+module_name_entry = tk.Entry(input_frame)
+module_name_entry.pack(fill="x")
+
+# Dropdown for operation type
+operation_type_label = tk.Label(input_frame, text="Operation Type:")
+operation_type_label.pack(anchor="w")
+
+operation_type_var = tk.StringVar(value="store")
+operation_type_dropdown = ttk.Combobox(
+    input_frame, textvariable=operation_type_var, state="readonly"
+)
+operation_type_dropdown["values"] = ["store", "update", "index", "show", "delete"]
+operation_type_dropdown.pack(fill="x")
+operation_type_var.trace_add("write", schedule_preview)
+tag_type_var.trace_add("write", schedule_preview)
+route_prefix_entry.bind("<KeyRelease>", schedule_preview)
+module_name_entry.bind("<KeyRelease>", schedule_preview)
+
+
+
+# Buttons
+button_frame = tk.Frame(root)
+button_frame.pack(pady=10)
+
+generate_button = tk.Button(
+    button_frame, text="Generate Documentation", command=generate_documentation
+)
+generate_button.pack()
+
+generate_all_button = tk.Button(
+    button_frame, text="Generate All Operations", command=generate_all_documentation
+)
+generate_all_button.pack(pady=(5, 0))
+
+export_all_button = tk.Button(
+    button_frame, text="Export All...", command=export_all_documentation
+)
+export_all_button.pack(pady=(5, 0))
+
+live_preview_var = tk.BooleanVar(value=False)
+live_preview_checkbutton = tk.Checkbutton(
+    button_frame, text="Live Preview", variable=live_preview_var, command=schedule_preview
+)
+live_preview_checkbutton.pack(pady=(5, 0))
+
+write_back_button = tk.Button(
+    button_frame, text="Write Back to Controller...", command=write_back_to_controller
+)
+write_back_button.pack(pady=(5, 0))
+
+add_to_spec_button = tk.Button(
+    button_frame, text="Add to OpenAPI Spec", command=add_to_openapi_spec
+)
+add_to_spec_button.pack(pady=(5, 0))
+
+def load_recorded_responses():
+    """
+    Infer response schemas from a directory of recorded <operationId>.json responses.
+    """
+    directory = filedialog.askdirectory(title="Recorded responses directory")
+    if not directory:
+        return
+    load_responses_button.config(state=tk.DISABLED)
+    threading.Thread(target=run_response_inference, args=(directory,), daemon=True).start()
+
+
+def run_response_inference(directory):
+    """
+    Worker thread body: infer the schemas in this process, since pool workers
+    started with spawn would re-import this module and open their own window.
+    """
+    try:
+        response_results.put((infer_response_schemas(directory, processes=False), None))
+    except (IOError, OSError) as e:
+        response_results.put((None, e))
+
+
+load_responses_button = tk.Button(
+    button_frame, text="Load Recorded Responses...", command=load_recorded_responses
+)
+load_responses_button.pack(pady=(5, 0))
+
+export_spec_button = tk.Button(
+    button_frame, text="Export OpenAPI Spec...", command=export_openapi_spec
+)
+export_spec_button.pack(pady=(5, 0))
+
+spec_status_label = tk.Label(button_frame, text="Operations in spec: 0")
+spec_status_label.pack(pady=(5, 0))
+
+# Output Frame
+output_frame = tk.Frame(root)
+output_frame.pack(pady=10, padx=10, fill="x")
+
+output_label = tk.Label(output_frame, text="Generated Documentation:")
+output_label.pack(anchor="w")
+
+output_text = ScrolledText(output_frame, height=20)
+output_text.pack(fill="x")
+output_highlighter = Highlighter(output_text, "php")
+
+def on_close():
+    """Flush pending tag changes before closing the window."""
+    try:
+        tag_manager.flush()
+    except (IOError, OSError) as e:
+        messagebox.showerror("Error", f"Failed to save tags: {e}")
+    root.destroy()
+
+
+root.protocol("WM_DELETE_WINDOW", on_close)
+
+
+def main():
+    """Run the documentation generator window."""
+    poll_background()
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+import re
+from functools import lru_cache
+
+# Text tag options per token kind, shared by every language
+TOKEN_STYLES = {
+    "comment": {"foreground": "#6a737d"},
+    "annotation": {"foreground": "#6f42c1"},
+    "keyword": {"foreground": "#d73a49"},
+    "variable": {"foreground": "#e36209"},
+    "function": {"foreground": "#005cc5"},
+    "key": {"foreground": "#22863a"},
+    "string": {"foreground": "#032f62"},
+    "number": {"foreground": "#005cc5"},
+    "literal": {"foreground": "#d73a49"},
+}
+
+PHP_KEYWORDS = (
+    "abstract", "array", "as", "class", "extends", "fn", "foreach", "function", "if", "else",
+    "namespace", "new", "private", "protected", "public", "return", "static", "use", "void",
+)
+
+# One pattern per language, each named group a token kind. Tokenization is per line:
+# docblock continuation lines are recognized by their leading "*" instead of by
+# tracking comment state across lines, which keeps every line independently cacheable.
+LANGUAGES = {
+    "php": re.compile(
+        r"(?P<comment>//.*|\#.*|/\*\*?(?=\s|$)|/\*.*?(?:\*/|$)|^\s*\*/?(?=\s|$))"
+        r"|(?P<string>'(?:[^'\\]|\\.)*'?|\"(?:[^\"\\]|\\.)*\"?)"
+        r"|(?P<annotation>@[A-Za-z_]\w*(?:\\\w+)*)"
+        r"|(?P<variable>\$\w+)"
+        r"|(?P<literal>\b(?i:true|false|null)\b)"
+        r"|(?P<keyword>\b(?:" + "|".join(PHP_KEYWORDS) + r")\b)"
+        r"|(?P<key>\b[A-Za-z_]\w*(?==(?![=>])))"
+        r"|(?P<function>\b[A-Za-z_]\w*(?=\())"
+        r"|(?P<number>\b\d+(?:\.\d+)?\b)"
+    ),
+    "json": re.compile(
+        r"(?P<key>\"(?:[^\"\\]|\\.)*\"(?=\s*:))"
+        r"|(?P<string>\"(?:[^\"\\]|\\.)*\"?)"
+        r"|(?P<literal>\b(?:true|false|null)\b)"
+        r"|(?P<number>-?\b\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)"
+    ),
+}
+
+
+def iter_tokens(pattern, text):
+    """Yield (kind, start, end) for every token of one line."""
+    for match in pattern.finditer(text):
+        yield match.lastgroup, match.start(), match.end()
+
+
+@lru_cache(maxsize=8192)
+def tokenize_line(language, text):
+    """Token spans of one line, memoized since generated output repeats lines a lot."""
+    return tuple(iter_tokens(LANGUAGES[language], text))
+
+
+def _line(index):
+    """Line number of a Tk text index such as '12.0'."""
+    return int(index.split(".")[0])
+
+
+class Highlighter:
+    """
+    Highlights a Tk text widget incrementally. Only the visible lines plus a margin
+    are tokenized, after() batches scroll and edit notifications into one pass,
+    and lines already tagged with their current text are skipped. Tags move with
+    the text, so after an edit only the lines brought into view are retagged.
+    """
+    def __init__(self, widget, language, margin=50, delay=30, max_line_length=4000):
+        self.widget = widget
+        self.language = language
+        self.margin = margin
+        self.delay = delay
+        # Longer lines, such as minified JSON, are tokenized only around the viewport
+        self.max_line_length = max_line_length
+        # line number -> text the line's tags were computed from
+        self._painted = {}
+        self._job = None
+        for kind, options in TOKEN_STYLES.items():
+            widget.tag_configure(kind, **options)
+
+        # Scrolling, resizing and content changes all go through yscrollcommand
+        self._scrollbar = getattr(widget, "vbar", None)
+        widget.configure(yscrollcommand=self._on_scroll)
+        widget.bind("<<Modified>>", self._on_modified, add="+")
+
+    def _on_scroll(self, first, last):
+        if self._scrollbar is not None:
+            self._scrollbar.set(first, last)
+        self.schedule()
+
+    def _on_modified(self, event=None):
+        if self.widget.edit_modified():
+            self.widget.edit_modified(False)
+            # Line numbers may have shifted, so no painted line can be trusted
+            self._painted.clear()
+            self.schedule()
+
+    def schedule(self):
+        """Highlight the visible region once pending events have settled."""
+        if self._job is None:
+            self._job = self.widget.after(self.delay, self.highlight_visible)
+
+    def highlight_visible(self):
+        """Tag the tokens of the visible lines, plus the margin, that changed."""
+        self._job = None
+        widget = self.widget
+        if not widget.winfo_viewable():
+            return
+        top = widget.index("@0,0")
+        bottom = widget.index(f"@{widget.winfo_width()},{widget.winfo_height()}")
+        first, last = _line(top), _line(bottom)
+        start = max(1, first - self.margin)
+        end = min(last + self.margin, _line(widget.index("end-1c")))
+
+        ranges = {kind: [] for kind in TOKEN_STYLES}
+        runs = []
+        lines = widget.get(f"{start}.0", f"{end}.end").split("\n")
+        for number, text in enumerate(lines, start):
+            if self._painted.get(number) == text:
+                continue
+            if len(text) <= self.max_line_length:
+                tokens = tokenize_line(self.language, text)
+                offset = 0
+                self._painted[number] = text
+            elif first <= number <= last:
+                # Never marked painted: the window follows the viewport on every pass
+                begin = int(top.split(".")[1]) if number == first else 0
+                stop = int(bottom.split(".")[1]) if number == last else len(text)
+                offset = max(0, begin - self.max_line_length // 2)
+                window = text[offset:stop + self.max_line_length // 2]
+                tokens = iter_tokens(LANGUAGES[self.language], window)
+            else:
+                continue
+            for kind, token_start, token_end in tokens:
+                ranges[kind] += (f"{number}.{token_start + offset}", f"{number}.{token_end + offset}")
+            if runs and runs[-1][1] == number - 1:
+                runs[-1][1] = number
+            else:
+                runs.append([number, number])
+
+        for run_start, run_end in runs:
+            for kind in TOKEN_STYLES:
+                widget.tag_remove(kind, f"{run_start}.0", f"{run_end}.end")
+        for kind, indices in ranges.items():
+            if indices:
+                widget.tag_add(kind, *indices)
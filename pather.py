@@ -1,247 +1,1251 @@
+import os
+import sys
 import json
+import queue
+import math
+import random
+import mimetypes
+import hashlib
+import sqlite3
+import re
+import argparse
+import itertools
+import shlex
+import ssl
 import subprocess
+import threading
+import time
+import uuid
+import base64
+import http.client
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from functools import cached_property, lru_cache
 import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext
-from urllib.parse import urlparse, parse_qs, unquote
-
-class CurlJSONFormatterApp:
-    def __init__(self, root):
-        self.root = root
-        self.history = []
-        self.future = []
-        self.show_formatted_structure = tk.BooleanVar(value=True)
-
-        self.setup_ui()
-
-        # Bindings for undo and redo on macOS
-        self.root.bind('<Command-z>', self.undo)
-        self.root.bind('<Command-Shift-Z>', self.redo)
-
-    def setup_ui(self):
-        self.root.title("Curl JSON Formatter")
-        self.root.geometry("1000x1000")
-        self.root.resizable(True, True)
-        
-         # Prefix input field
-        prefix_frame = tk.Frame(self.root)
-        prefix_frame.pack(fill=tk.X, padx=10, pady=10)
-        prefix_label = tk.Label(prefix_frame, text="Prefix:")
-        prefix_label.pack(side=tk.LEFT)
-        self.prefix_input = tk.Entry(prefix_frame)
-        self.prefix_input.pack(side=tk.RIGHT)
-        self.prefix_input.insert(0, "api/v1")  # Default value
-
-
-        # Status code label
-        self.status_label = tk.Label(self.root, text="Status Code: N/A", font=('Arial', 14))
-        self.status_label.pack(pady=(10, 0))
-
-        # Curl input label and text area
-        tk.Label(self.root, text="Enter curl command:").pack(pady=(10, 0))
-        self.curl_input = scrolledtext.ScrolledText(self.root, wrap=tk.WORD, width=110, height=8)
-        self.curl_input.pack(padx=10, pady=(0, 10))
-
-        # Request type selector
-        tk.Label(self.root, text="Select Request Type:").pack(pady=(10, 0))
-        self.request_type = ttk.Combobox(self.root, values=["GET", "POST"], state="readonly")
-        self.request_type.current(0)  # Set default to GET
-        self.request_type.pack(pady=(0, 10))
-        
-          # Test type selector
-        tk.Label(self.root, text="Select Test Type:").pack(pady=(10, 0))
-        self.test_type = ttk.Combobox(self.root, values=["List", "Create", "Show", "Update"], state="readonly")
-        self.test_type.current(0)  # Set default to List
-        self.test_type.pack(pady=(0, 10))
-
-
-        # Execute and Copy button
-        self.execute_and_copy_button = tk.Button(self.root, text="Execute Curl & Copy", command=self.execute_and_copy_curl)
-        self.execute_and_copy_button.pack(pady=(0, 10))
-
-        # Clear Curl Field button
-        self.clear_curl_button = tk.Button(self.root, text="Clear Curl Field", command=self.clear_curl_field)
-        self.clear_curl_button.pack(pady=(0, 10))
-
-        # Extract Variables from CURL button
-        self.extract_button = tk.Button(self.root, text="Extract Variables from CURL", command=self.extract_variables_from_curl)
-        self.extract_button.pack(pady=(0, 10))
-
-        self.formatted_structure_checkbox = tk.Checkbutton(
-            self.root, 
-            text="Show Formatted Structure", 
-            variable=self.show_formatted_structure,
-            command=self.toggle_formatted_structure
+from tkinter import ttk, messagebox, scrolledtext, filedialog
+from urllib.parse import urlparse, parse_qs, parse_qsl, unquote, urlencode
+
+from highlighter import Highlighter
+
+
+class CurlRequest:
+    """A curl command parsed into method, URL, headers and form/body data."""
+    def __init__(self, method="GET", url="", headers=None, fields=None, body=None, insecure=False,
+                 expected_status=None):
+        self.method = method
+        self.url = url
+        self.headers = headers or {}
+        self.fields = fields or []  # (name, value) pairs from -F
+        self.body = body  # raw string from -d/--data
+        self.insecure = insecure
+        self.expected_status = expected_status  # response status recorded with an imported request
+
+    @classmethod
+    def parse(cls, curl_command):
+        tokens = shlex.split(curl_command.replace("\\\n", " "))
+        if not tokens or tokens[0] != "curl":
+            raise ValueError("Not a curl command")
+        request = cls()
+        method = None
+        data = []
+        i = 1
+        while i < len(tokens):
+            token = tokens[i]
+            value = tokens[i + 1] if i + 1 < len(tokens) else ""
+            if token in ("-X", "--request"):
+                method = value.upper()
+                i += 1
+            elif token in ("-H", "--header"):
+                name, _, header_value = value.partition(":")
+                request.headers[name.strip()] = header_value.strip()
+                i += 1
+            elif token in ("-F", "--form"):
+                name, _, field_value = value.partition("=")
+                request.fields.append((name, field_value))
+                i += 1
+            elif token in ("-d", "--data", "--data-raw", "--data-binary", "--data-urlencode"):
+                data.append(value)
+                i += 1
+            elif token in ("-u", "--user"):
+                credentials = base64.b64encode(value.encode()).decode()
+                request.headers["Authorization"] = f"Basic {credentials}"
+                i += 1
+            elif token in ("-b", "--cookie"):
+                request.headers["Cookie"] = value
+                i += 1
+            elif token in ("-k", "--insecure"):
+                request.insecure = True
+            elif token == "--url":
+                request.url = value
+                i += 1
+            elif token.startswith("http"):
+                request.url = token
+            i += 1
+        if data:
+            request.body = "&".join(data)
+        request.method = method or ("POST" if data or request.fields else "GET")
+        return request
+
+    def to_dict(self):
+        return {
+            "method": self.method, "url": self.url, "headers": self.headers,
+            "fields": self.fields, "body": self.body, "insecure": self.insecure,
+            "expected_status": self.expected_status,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            data["method"], data["url"], data.get("headers"), [tuple(field) for field in data.get("fields", [])],
+            data.get("body"), data.get("insecure", False), data.get("expected_status")
         )
-        self.formatted_structure_checkbox.pack(pady=(10, 0))
-
-        # Output label and text area for formatted structure
-        self.formatted_structure_label = tk.Label(self.root, text="Formatted Structure:")
-        self.formatted_structure_label.pack(pady=(10, 0))
-        self.output_text = scrolledtext.ScrolledText(self.root, wrap=tk.WORD, width=110, height=15)
-        self.output_text.pack(padx=10, pady=(0, 10))
-
-        # PHP Code Output area (initially hidden)
-        self.query_output = scrolledtext.ScrolledText(self.root, wrap=tk.WORD, width=110, height=30)
-        self.query_output.pack(padx=10, pady=(0, 10))
-        self.query_output.pack_forget()  # Initially hide
 
-        # Checkbox to toggle raw JSON visibility
-        self.show_json_var = tk.BooleanVar()
-        self.show_json_checkbox = tk.Checkbutton(self.root, text="Show Raw JSON Output", variable=self.show_json_var, command=self.toggle_raw_json)
-        self.show_json_checkbox.pack(pady=(10, 0))
-
-        # Checkbox to toggle pretty JSON output
-        self.pretty_json_var = tk.BooleanVar()
-        self.pretty_json_checkbox = tk.Checkbutton(self.root, text="Toggle Pretty/Raw JSON", variable=self.pretty_json_var, command=self.toggle_json_format)
-        self.pretty_json_checkbox.pack(pady=(10, 0))
-
-        # Hidden raw JSON output area
-        self.raw_json_output = scrolledtext.ScrolledText(self.root, wrap=tk.WORD, width=110, height=15)
-        self.raw_json_output.pack_forget()
+    def copy(self, **changes):
+        request = CurlRequest(
+            self.method, self.url, dict(self.headers), list(self.fields), self.body, self.insecure,
+            self.expected_status
+        )
+        for name, value in changes.items():
+            setattr(request, name, value)
+        return request
+
+    def with_credentials(self, header_name, header_value):
+        """Copy of this request authenticated only by the given header."""
+        headers = {
+            name: value for name, value in self.headers.items()
+            if name.lower() not in ("authorization", "cookie")
+        }
+        headers[header_name] = header_value
+        return self.copy(headers=headers)
+
+    @property
+    def path(self):
+        parsed_url = urlparse(self.url)
+        return parsed_url.path + (f"?{parsed_url.query}" if parsed_url.query else "")
+
+    def form_items(self):
+        """(name, value) pairs sent by this request, from -F fields or a form/JSON body."""
+        if self.fields:
+            return list(self.fields)
+        if not self.body:
+            return []
+        try:
+            body = json.loads(self.body)
+        except ValueError:
+            return parse_qsl(self.body, keep_blank_values=True)
+        return [(str(name), str(value)) for name, value in body.items()] if isinstance(body, dict) else []
 
-    def toggle_formatted_structure(self):
-        if self.show_formatted_structure.get():
-            self.formatted_structure_label.pack(pady=(10, 0))
-            self.output_text.pack(padx=10, pady=(0, 10))
-        else:
-            self.formatted_structure_label.pack_forget()
-            self.output_text.pack_forget()
-    def execute_curl(self):
-        curl_command = self.curl_input.get("1.0", tk.END).strip()
-        if not curl_command.startswith("curl"):
-            messagebox.showerror("Error", "Please enter a valid curl command.")
+    def encode_body(self):
+        """
+        Return (body, extra headers) for sending this request. Multipart bodies with
+        @file fields are an iterator that streams the files from disk in chunks, with
+        the Content-Length computed up front.
+        """
+        if self.fields:
+            boundary = uuid.uuid4().hex
+            segments = []
+            for name, value in self.fields:
+                form_value = parse_form_value(value)
+                if form_value["path"] is not None:
+                    headers = (
+                        f"--{boundary}\r\nContent-Disposition: form-data; name=\"{name}\"; "
+                        f"filename=\"{form_value['filename']}\"\r\nContent-Type: {form_value['type']}\r\n\r\n"
+                    )
+                    segments += [headers.encode(), form_value, b"\r\n"]
+                else:
+                    content_type = f"Content-Type: {form_value['type']}\r\n" if form_value["type"] else ""
+                    segments.append(
+                        f"--{boundary}\r\nContent-Disposition: form-data; name=\"{name}\"\r\n"
+                        f"{content_type}\r\n{form_value['value']}\r\n".encode()
+                    )
+            segments.append(f"--{boundary}--\r\n".encode())
+            headers = {"Content-Type": f"multipart/form-data; boundary={boundary}"}
+            if all(isinstance(segment, bytes) for segment in segments):
+                return b"".join(segments), headers
+            headers["Content-Length"] = str(sum(
+                len(segment) if isinstance(segment, bytes) else segment["size"] for segment in segments
+            ))
+            return _iter_multipart(segments), headers
+        if self.body is not None:
+            headers = {}
+            if not any(name.lower() == "content-type" for name in self.headers):
+                headers["Content-Type"] = "application/x-www-form-urlencoded"
+            return self.body.encode(), headers
+        return None, {}
+
+
+def parse_form_value(value):
+    """
+    Split a curl -F value into its parts: "@path;type=mime;filename=name" is a file
+    upload, anything else a plain value with an optional ";type=".
+    Returns {"value", "path", "filename", "type", "size"}; path is None for plain values.
+    """
+    text, *modifiers = value.split(";")
+    options = dict(modifier.strip().partition("=")[::2] for modifier in modifiers)
+    if not text.startswith("@"):
+        # Only split off modifiers curl knows, so values containing ';' survive
+        if not all("=" in modifier for modifier in modifiers) or \
+                not options.keys() <= {"type", "filename", "headers", "encoder"}:
+            return {"value": value, "path": None, "filename": None, "type": None, "size": None}
+        return {"value": text, "path": None, "filename": None, "type": options.get("type"), "size": None}
+    path = os.path.expanduser(text[1:])
+    if not os.path.isfile(path):
+        raise ValueError(f"File to upload not found: {path}")
+    return {
+        "value": text,
+        "path": path,
+        "filename": options.get("filename", os.path.basename(path)),
+        "type": options.get("type") or mimetypes.guess_type(path)[0] or "application/octet-stream",
+        "size": os.path.getsize(path),
+    }
+
+
+def _iter_multipart(segments, chunk_size=1 << 16):
+    """Yield multipart body bytes, reading file segments from disk chunk by chunk."""
+    for segment in segments:
+        if isinstance(segment, bytes):
+            yield segment
+            continue
+        with open(segment["path"], "rb") as file:
+            while True:
+                chunk = file.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+
+
+class HttpResponse:
+    def __init__(self, status, headers, body, elapsed):
+        self.status = status
+        self.headers = headers  # names lower-cased, since HTTP header names are case-insensitive
+        self.body = body
+        self.elapsed = elapsed  # seconds from sending the request to reading the body
+
+    def json(self):
+        return json.loads(self.body.decode("utf-8"))
+
+
+class HttpClient:
+    """Keeps idle keep-alive connections per host so repeated requests skip the TCP/TLS setup."""
+    def __init__(self, timeout=30):
+        self.timeout = timeout
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    def _connect(self, scheme, netloc, insecure):
+        if scheme == "https":
+            context = ssl._create_unverified_context() if insecure else ssl.create_default_context()
+            return http.client.HTTPSConnection(netloc, timeout=self.timeout, context=context)
+        return http.client.HTTPConnection(netloc, timeout=self.timeout)
+
+    def _acquire(self, key, insecure):
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop(), True
+        return self._connect(key[0], key[1], insecure), False
+
+    def _release(self, key, connection):
+        with self._lock:
+            self._idle.setdefault(key, []).append(connection)
+
+    def send(self, request):
+        parsed_url = urlparse(request.url)
+        key = (parsed_url.scheme, parsed_url.netloc)
+        while True:
+            # Encoded per attempt: a streamed body can only be read once
+            body, extra_headers = request.encode_body()
+            headers = {**request.headers, **extra_headers}
+            connection, reused = self._acquire(key, request.insecure)
+            try:
+                start = time.perf_counter()
+                connection.request(request.method, request.path or "/", body=body, headers=headers)
+                response = connection.getresponse()
+                payload = response.read()
+                elapsed = time.perf_counter() - start
+            except (http.client.HTTPException, ConnectionError):
+                connection.close()
+                if reused:
+                    # The server closed an idle connection; retry once on a fresh one
+                    continue
+                raise
+            except Exception:
+                connection.close()
+                raise
+            if response.will_close:
+                connection.close()
+            else:
+                self._release(key, connection)
+            headers = {name.lower(): value for name, value in response.getheaders()}
+            return HttpResponse(response.status, headers, payload, elapsed)
+
+    def close(self):
+        with self._lock:
+            for connections in self._idle.values():
+                for connection in connections:
+                    connection.close()
+            self._idle.clear()
+
+
+def _retry_after_seconds(value):
+    """Seconds to wait from a Retry-After header (delta seconds or an HTTP date), or None."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RequestScheduler:
+    """
+    Polite front for HttpClient with the same send(request) interface: a token bucket
+    of rate requests/second per host, at most max_per_host requests in flight per host,
+    and retries of 429/503 responses after Retry-After, or exponential backoff with full
+    jitter when the server gives none. A throttled host is paused for every caller.
+    """
+    RETRY_STATUSES = (429, 503)
+
+    def __init__(self, client, rate=10.0, burst=None, max_per_host=4, max_retries=5,
+                 base_delay=0.5, max_delay=30.0):
+        self.client = client
+        self.rate = rate
+        self.burst = burst or max(1.0, rate)
+        self.max_per_host = max_per_host
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._lock = threading.Lock()
+        self._hosts = {}
+        self._metrics = {
+            "queued": 0, "in_flight": 0, "sent": 0, "retries": 0, "throttled": 0,
+            "wait_seconds": 0.0, "max_wait_seconds": 0.0,
+        }
+
+    def _host(self, key):
+        with self._lock:
+            host = self._hosts.get(key)
+            if host is None:
+                host = self._hosts[key] = {
+                    "slots": threading.BoundedSemaphore(self.max_per_host),
+                    "tokens": self.burst,
+                    "updated": time.monotonic(),
+                    "paused_until": 0.0,
+                }
+            return host
+
+    def _take_token(self, host):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                host["tokens"] = min(self.burst, host["tokens"] + (now - host["updated"]) * self.rate)
+                host["updated"] = now
+                delay = host["paused_until"] - now
+                if delay <= 0:
+                    if host["tokens"] >= 1:
+                        host["tokens"] -= 1
+                        return
+                    delay = (1 - host["tokens"]) / self.rate
+            time.sleep(delay)
+
+    def _backoff(self, attempt, response):
+        delay = _retry_after_seconds(response.headers.get("retry-after"))
+        if delay is None:
+            delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        return min(delay, self.max_delay)
+
+    def send(self, request):
+        host = self._host(urlparse(request.url).netloc)
+        start = time.monotonic()
+        with self._lock:
+            self._metrics["queued"] += 1
+        try:
+            host["slots"].acquire()
+        finally:
+            with self._lock:
+                self._metrics["queued"] -= 1
+        try:
+            attempt = 0
+            while True:
+                self._take_token(host)
+                with self._lock:
+                    waited = time.monotonic() - start
+                    self._metrics["wait_seconds"] += waited
+                    self._metrics["max_wait_seconds"] = max(self._metrics["max_wait_seconds"], waited)
+                    self._metrics["in_flight"] += 1
+                    self._metrics["sent"] += 1
+                try:
+                    response = self.client.send(request)
+                finally:
+                    with self._lock:
+                        self._metrics["in_flight"] -= 1
+                if response.status not in self.RETRY_STATUSES or attempt >= self.max_retries:
+                    return response
+                delay = self._backoff(attempt, response)
+                with self._lock:
+                    self._metrics["throttled"] += 1
+                    self._metrics["retries"] += 1
+                    host["paused_until"] = max(host["paused_until"], time.monotonic() + delay)
+                attempt += 1
+                start = time.monotonic()
+        finally:
+            host["slots"].release()
+
+    def metrics(self):
+        """Snapshot of queue depth, in-flight requests, retries and time spent waiting."""
+        with self._lock:
+            metrics = dict(self._metrics)
+        metrics["average_wait_seconds"] = metrics["wait_seconds"] / metrics["sent"] if metrics["sent"] else 0.0
+        return metrics
+
+    def close(self):
+        self.client.close()
+
+
+def percentile(values, p):
+    """Nearest-rank percentile of values, p in 0..100."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(p / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def measure_latency(client, request, runs=10, warmup=2):
+    """Send request warmup + runs times and return the timings of the measured runs, in ms."""
+    timings = []
+    for i in range(warmup + runs):
+        response = client.send(request)
+        if i >= warmup:
+            timings.append(response.elapsed * 1000)
+    return timings
+
+
+def parse_roles(text):
+    """
+    Parse one role per line as "[role] email Header: value", e.g.
+    "admin@pruebas.com Authorization: Bearer abc" or "viewer user@pruebas.com Cookie: session=xyz".
+    The email is the user the generated test acts as. The role name defaults to the
+    email's local part; repeated names get a _2, _3... suffix so each role stays distinct
+    even when several share a fixture email. Returns (role, email, header name, value).
+    """
+    roles = []
+    seen = {}
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        words = line.split(" ")
+        header_index = next((i for i, word in enumerate(words) if ":" in word), None)
+        if header_index not in (1, 2):
+            raise ValueError(f"Expected '[role] email Header: value', got: {line}")
+        email = words[header_index - 1]
+        role = words[0] if header_index == 2 else "".join(c if c.isalnum() else "_" for c in email.split("@")[0])
+        header_name, _, header_value = " ".join(words[header_index:]).partition(":")
+        if not header_value.strip():
+            raise ValueError(f"Expected '[role] email Header: value', got: {line}")
+        seen[role] = seen.get(role, 0) + 1
+        if seen[role] > 1:
+            role = f"{role}_{seen[role]}"
+        roles.append((role, email, header_name.strip(), header_value.strip()))
+    return roles
+
+
+def probe_roles(client, request, roles, max_workers=8):
+    """
+    Send request once per role, concurrently, and return (role, email) -> {"status", "json"}
+    in role order. "json" is None when the response body is not JSON.
+    """
+    def probe(role):
+        name, email, header_name, header_value = role
+        response = client.send(request.with_credentials(header_name, header_value))
+        try:
+            json_data = response.json()
+        except ValueError:
+            json_data = None
+        return (name, email), {"status": response.status, "json": json_data}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return dict(executor.map(probe, roles))
+
+
+def _result_count(json_data):
+    """Number of items in a list response or in its paginated "data" list, else None."""
+    if isinstance(json_data, dict) and isinstance(json_data.get("data"), list):
+        return len(json_data["data"])
+    if isinstance(json_data, list):
+        return len(json_data)
+    return None
+
+
+def probe_query_params(client, request, params=None, max_workers=4):
+    """
+    Probe each query parameter on its own with its valid value, an invalid value and an
+    empty value, and compare against the request without any parameters.
+
+    params maps name -> valid value and defaults to the request's own query string.
+    Returns name -> {"value", "affects", "valid", "invalid", "empty"}, where each variant
+    is {"status", "count", "structure"}; "affects" is True when any variant differs
+    from the unfiltered baseline.
+    """
+    parsed_url = urlparse(request.url)
+    if params is None:
+        params = {key: values[0] for key, values in parse_qs(parsed_url.query).items()}
+    base_url = parsed_url._replace(query="").geturl()
+    parse_json_structure = PhpTestGenerator().parse_json_structure
+
+    def probe(query):
+        url = f"{base_url}?{urlencode(query)}" if query else base_url
+        response = client.send(request.copy(url=url))
+        try:
+            json_data = response.json()
+        except ValueError:
+            json_data = None
+        return {
+            "status": response.status,
+            "count": _result_count(json_data),
+            "structure": parse_json_structure(json_data),
+        }
+
+    variants = [((None, None), {})]
+    for name, value in params.items():
+        variants += [
+            ((name, "valid"), {name: value}),
+            ((name, "invalid"), {name: "invalid"}),
+            ((name, "empty"), {name: ""}),
+        ]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        outcomes = dict(zip([key for key, _ in variants], executor.map(probe, [query for _, query in variants])))
+
+    baseline = outcomes[(None, None)]
+    results = {}
+    for name, value in params.items():
+        result = {"value": value}
+        for variant in ("valid", "invalid", "empty"):
+            result[variant] = outcomes[(name, variant)]
+        result["affects"] = any(result[variant] != baseline for variant in ("valid", "invalid", "empty"))
+        results[name] = result
+    return results
+
+
+def structure_to_json_schema(structure):
+    """
+    JSON Schema for a structure from parse_json_structure. Like assertJsonStructure, every
+    listed key is required and extra keys are allowed.
+    """
+    if isinstance(structure, dict):
+        if set(structure) == {'*'}:
+            return {"type": "array", "items": structure_to_json_schema(structure['*'])}
+        return {
+            "type": "object",
+            "required": list(structure),
+            "properties": {key: structure_to_json_schema(value) for key, value in structure.items()},
+        }
+    if isinstance(structure, list):
+        return {"type": "array"}
+    return {}
+
+
+def _emit_validator(schema, value, path, lines, indent, names):
+    """Append the Python checks for schema against the expression value to lines."""
+    pad = "    " * indent
+    schema_type = schema.get("type")
+    if schema_type == "object":
+        lines.append(f"{pad}if not isinstance({value}, dict):")
+        lines.append(f"{pad}    errors.append({path} + ': expected object')")
+        lines.append(f"{pad}else:")
+        for key in schema.get("required", []):
+            lines.append(f"{pad}    if {key!r} not in {value}:")
+            lines.append(f"{pad}        errors.append({path} + {'.' + key + ': missing'!r})")
+        for key, subschema in schema.get("properties", {}).items():
+            if not subschema.get("type"):
+                continue
+            child = f"v{len(names)}"
+            names.append(child)
+            lines.append(f"{pad}    if {key!r} in {value}:")
+            lines.append(f"{pad}        {child} = {value}[{key!r}]")
+            _emit_validator(subschema, child, f"{path} + {'.' + key!r}", lines, indent + 2, names)
+        lines.append(f"{pad}    pass")
+    elif schema_type == "array":
+        lines.append(f"{pad}if not isinstance({value}, list):")
+        lines.append(f"{pad}    errors.append({path} + ': expected array')")
+        items = schema.get("items", {})
+        if items.get("type"):
+            index, child = f"i{len(names)}", f"v{len(names)}"
+            names.append(child)
+            lines.append(f"{pad}else:")
+            lines.append(f"{pad}    for {index}, {child} in enumerate({value}):")
+            _emit_validator(items, child, f"{path} + '.' + str({index})", lines, indent + 2, names)
+
+
+@lru_cache(maxsize=128)
+def _compile_validator(schema_json):
+    schema = json.loads(schema_json)
+    lines = ["def validate(v0):", "    errors = []"]
+    _emit_validator(schema, "v0", "'$'", lines, 1, ["v0"])
+    lines.append("    return errors")
+    namespace = {}
+    exec(compile("\n".join(lines), "<json-schema-validator>", "exec"), namespace)
+    return namespace["validate"]
+
+
+def compile_validator(schema):
+    """
+    Compile schema into a function returning the list of violations for a decoded JSON
+    value (empty when valid). Validators are cached per schema, so compiling the same
+    schema again is free.
+    """
+    return _compile_validator(json.dumps(schema, sort_keys=True))
+
+
+def export_json_schema(json_data):
+    """Draft-07 JSON Schema document for the structure inferred from a response."""
+    structure = PhpTestGenerator().parse_json_structure(json_data)
+    return {"$schema": "http://json-schema.org/draft-07/schema#", **structure_to_json_schema(structure)}
+
+
+def iter_recorded_responses(paths):
+    """
+    Yield (source, decoded response) from JSON files, JSON-lines files (one response per
+    line) and directories of either.
+    """
+    for path in paths:
+        if os.path.isdir(path):
+            yield from iter_recorded_responses(
+                sorted(os.path.join(path, name) for name in os.listdir(path)
+                       if name.endswith((".json", ".jsonl")))
+            )
+            continue
+        with open(path, "r") as file:
+            if path.endswith(".jsonl"):
+                for number, line in enumerate(file, 1):
+                    if line.strip():
+                        yield f"{path}:{number}", json.loads(line)
+            else:
+                yield path, json.load(file)
+
+
+def iter_json_array(file, key, chunk_size=1 << 16):
+    """
+    Yield the elements of the first array stored under key in a JSON file, decoding one
+    element at a time so the whole document is never held in memory.
+    """
+    decoder = json.JSONDecoder()
+    start_pattern = re.compile(r'(?<!\\)"' + re.escape(key) + r'"\s*:\s*\[')
+    buffer = ""
+    while True:
+        match = start_pattern.search(buffer)
+        if match:
+            buffer = buffer[match.end():]
+            break
+        chunk = file.read(chunk_size)
+        if not chunk:
+            return
+        # Keep a tail in case the key is split across chunks
+        buffer = buffer[-(len(key) + 64):] + chunk
+
+    read_size = chunk_size
+    position = 0
+    while True:
+        while position < len(buffer) and buffer[position] in " \t\r\n,":
+            position += 1
+        if position < len(buffer) and buffer[position] == "]":
             return
-        
         try:
-            # Extract method and URL
-            method = "GET"
-            url = ""
-            data = []
-            parts = curl_command.split()
-            for i, part in enumerate(parts):
-                if part.startswith("http"):
-                    url = part
-                elif part == "-X" and i + 1 < len(parts) and parts[i + 1] in ["POST", "GET"]:
-                    method = parts[i + 1]
-                elif part == "-F" and i + 1 < len(parts):
-                    key_value = parts[i + 1].split("=", 1)
-                    if len(key_value) == 2:
-                        key, value = key_value
-                        data.append("'{}'=>'{}'".format(key.strip("'"), value.strip("'")))
-
-            # Execute the curl command and capture the response
-            result = subprocess.run(f"{curl_command} -w '\\n%{{http_code}}'", shell=True, capture_output=True, text=True)
-            if result.returncode != 0:
-                messagebox.showerror("Error", f"curl command failed with error: {result.stderr}")
-                return
-
-            # Extract the JSON string and status code from the output
-            output_parts = result.stdout.rsplit("\n", 1)
-            raw_json_string = output_parts[0].strip()
-            status_code = output_parts[1].strip()
-
-            # Display the status code
-            self.status_label.config(text=f"Status Code: {status_code}")
-
-            # Parse and format the JSON structure
-            json_data = json.loads(raw_json_string)
-            structure = self.parse_json_structure(json_data)
-            formatted_structure = self.format_structure(structure)
-            
-            if self.show_formatted_structure.get():
-                self.output_text.delete("1.0", tk.END)
-                self.output_text.insert(tk.END, formatted_structure)
-            # Generate and show the PHP tests
-            path = self.extract_path_from_curl(curl_command)
-            test_type = self.test_type.get()
-            php_tests = self.generate_php_tests(path, formatted_structure, test_type, data, json_data)
-            self.show_php_tests(php_tests)
-
+            element, end = decoder.raw_decode(buffer, position)
         except json.JSONDecodeError:
-            messagebox.showerror("Error", "Failed to parse JSON from curl output.")
-        except Exception as e:
-            messagebox.showerror("Error", f"An error occurred: {str(e)}")
-    def execute_and_copy_curl(self):
-        self.execute_curl()
-
-    def clear_curl_field(self):
-        self.curl_input.delete("1.0", tk.END)
-
-    def extract_variables_from_curl(self):
-        curl_command = self.curl_input.get("1.0", tk.END).strip()
-        request_type = self.request_type.get()
-
+            chunk = file.read(read_size)
+            if not chunk:
+                raise
+            buffer = buffer[position:] + chunk
+            position = 0
+            # Grow reads for large elements so retrying the decode stays linear overall
+            read_size = max(read_size, len(buffer))
+            continue
+        yield element
+        buffer = buffer[end:]
+        position = 0
+        read_size = chunk_size
+
+
+def endpoint_path(path):
+    """Resource path for a request path, without the trailing {id}/show or {id}/update."""
+    # Remove the ID and 'show' from the path for the show method
+    if path.endswith("/show") or path.endswith("/show'"):
+        parts = path.split('/')
+        return '/'.join(parts[:-2])  # Remove the last two parts (ID and 'show')
+
+    if path.endswith("/update") or path.endswith("/update'"):
+        parts = path.split('/')
+        return '/'.join(parts[:-2])
+    return path
+
+
+def guess_test_type(method, path):
+    if method in ("PUT", "PATCH") or path.rstrip('/').endswith("/update"):
+        return "Update"
+    if method == "POST":
+        return "Create"
+    if path.rstrip('/').endswith("/show"):
+        return "Show"
+    return "List"
+
+
+def _har_response_json(response):
+    content = response.get("content") or {}
+    text = content.get("text")
+    if not text or "json" not in (content.get("mimeType") or ""):
+        return None
+    if content.get("encoding") == "base64":
+        text = base64.b64decode(text).decode("utf-8")
+    try:
+        return json.loads(text)
+    except ValueError:
+        return None
+
+
+def har_entry_to_request(entry):
+    """(CurlRequest, recorded JSON response or None) for a HAR log entry."""
+    har_request = entry["request"]
+    response = entry.get("response") or {}
+    headers = {
+        header["name"]: header["value"] for header in har_request.get("headers", [])
+        if not header["name"].startswith(":") and header["name"].lower() not in ("content-length", "host")
+    }
+    # HAR uses status 0 for requests that got no response
+    request = CurlRequest(
+        har_request["method"].upper(), har_request["url"], headers, expected_status=response.get("status") or None
+    )
+    post_data = har_request.get("postData")
+    if post_data:
+        if "multipart/form-data" in (post_data.get("mimeType") or "") and post_data.get("params"):
+            request.fields = [(param["name"], param.get("value", "")) for param in post_data["params"]]
+            headers.pop(next((name for name in headers if name.lower() == "content-type"), None), None)
+        else:
+            request.body = post_data.get("text")
+    return request, _har_response_json(response)
+
+
+def _postman_substitute(text, variables):
+    return re.sub(r"\{\{(\w+)\}\}", lambda match: variables.get(match.group(1), match.group(0)), text or "")
+
+
+def postman_items_to_requests(item, variables):
+    """Yield (CurlRequest, example JSON response or None) for a Postman item or folder."""
+    if "item" in item:
+        for child in item["item"]:
+            yield from postman_items_to_requests(child, variables)
+        return
+    postman_request = item.get("request") or {}
+    url = postman_request.get("url") or ""
+    if isinstance(url, dict):
+        url = url.get("raw", "")
+    headers = {
+        header["key"]: _postman_substitute(header.get("value"), variables)
+        for header in postman_request.get("header", []) if not header.get("disabled")
+    }
+    request = CurlRequest(
+        postman_request.get("method", "GET").upper(), _postman_substitute(url, variables), headers
+    )
+    body = postman_request.get("body") or {}
+    if body.get("mode") == "formdata":
+        request.fields = [
+            (field["key"], _postman_substitute(field.get("value"), variables))
+            for field in body.get("formdata", []) if not field.get("disabled")
+        ]
+    elif body.get("mode") == "urlencoded":
+        request.body = urlencode([
+            (field["key"], _postman_substitute(field.get("value"), variables))
+            for field in body.get("urlencoded", []) if not field.get("disabled")
+        ])
+    elif body.get("mode") == "raw":
+        request.body = _postman_substitute(body.get("raw"), variables)
+    recorded = None
+    for example in item.get("response") or []:
         try:
-            if request_type == "POST":
-                self.parse_post_request(curl_command)
-            elif request_type == "GET":
-                self.parse_get_request(curl_command)
+            recorded = json.loads(example.get("body") or "")
+            request.expected_status = example.get("code")
+            break
+        except ValueError:
+            continue
+    yield request, recorded
+
+
+def iter_imported_requests(filename, variables=None):
+    """
+    Yield (CurlRequest, recorded JSON response or None) from a HAR file or a Postman
+    collection, reading entries one at a time. Postman {{variables}} are replaced from
+    variables; unknown ones are left as they are.
+    """
+    with open(filename, "r", encoding="utf-8") as file:
+        is_har = filename.endswith(".har") or file.read(4096).lstrip(" \t\r\n{").startswith('"log"')
+        file.seek(0)
+        if is_har:
+            for entry in iter_json_array(file, "entries"):
+                yield har_entry_to_request(entry)
+        else:
+            for item in iter_json_array(file, "item"):
+                yield from postman_items_to_requests(item, variables or {})
+
+
+def _generate_imported_tests(method, url, fields, json_data, prefix, fast, status=None):
+    """Process-pool worker: (inferred structure, PHP tests) for one imported request."""
+    path = urlparse(url).path
+    test_type = guess_test_type(method, path)
+    generator = PhpTestGenerator(prefix, fast)
+    data = [generator.form_data_entry(name, value) for name, value in fields]
+    structure = generator.parse_json_structure(json_data)
+    formatted_structure = generator.format_structure(structure)
+    return structure, generator.generate_php_tests(
+        endpoint_path(path), formatted_structure, test_type, data, json_data, status
+    )
+
+
+def generate_tests_from_imports(filenames, client=None, prefix="api/v1", fast=False, variables=None,
+                                max_workers=None):
+    """
+    Yield (CurlRequest, inferred structure, PHP tests) for every request in the given HAR/Postman files, in
+    file order. Requests with a recorded JSON response are not sent again; the others are
+    sent through client, or skipped when no client is given. Test generation runs on a
+    process pool with a bounded number of entries in flight.
+    """
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        window = (max_workers or os.cpu_count() or 1) * 4
+        pending = []
+        for filename in filenames:
+            for request, json_data in iter_imported_requests(filename, variables):
+                if json_data is None:
+                    if client is None:
+                        continue
+                    try:
+                        response = client.send(request)
+                        json_data = response.json()
+                    except (OSError, ValueError, http.client.HTTPException):
+                        continue
+                    request.expected_status = response.status
+                pending.append((request, executor.submit(
+                    _generate_imported_tests, request.method, request.url, request.form_items(), json_data,
+                    prefix, fast, request.expected_status
+                )))
+                if len(pending) >= window:
+                    request, future = pending.pop(0)
+                    yield (request, *future.result())
+        for request, future in pending:
+            yield (request, *future.result())
+
+
+_ID_SEGMENT_PATTERN = re.compile(
+    r"^(\d+|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12})$"
+)
+
+
+def normalize_path(path):
+    """Request path with numeric and UUID segments replaced by {id}, without the query."""
+    return "/".join(
+        "{id}" if _ID_SEGMENT_PATTERN.match(segment) else segment
+        for segment in urlparse(path).path.rstrip("/").split("/")
+    ) or "/"
+
+
+def structure_fingerprint(structure):
+    """Stable hash of an inferred structure; equal structures hash equally whatever the key order."""
+    return hashlib.sha1(json.dumps(structure, sort_keys=True).encode()).hexdigest()
+
+
+def diff_structures(old, new, path=""):
+    """
+    Compare two inferred structures and return (added, removed) lists of dotted key
+    paths, with '*' standing for array items.
+    """
+    added, removed = [], []
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key in old:
+            key_path = f"{path}.{key}" if path else key
+            if key not in new:
+                removed.append(key_path)
             else:
-                messagebox.showerror("Error", "Unknown request type selected.")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to extract variables from URL: {str(e)}")
-
-    def parse_get_request(self, curl_command):
-        start = curl_command.find("http")
-        url = curl_command[start:].split()[0]
-        parsed_url = urlparse(url)
-        query_params = parse_qs(parsed_url.query)
-        path = parsed_url.path
-
-        # Format the query parameters as individual PHP variables and append them to the URL
-        php_code = ""
-        for key, values in query_params.items():
-            var_name = self.camel_case(key)
-            php_code += f"${var_name} = '{unquote(values[0])}';\n"
-        
-        php_code += f"\n$response = $this->get('{path}?{list(query_params.keys())[0]}='.${self.camel_case(list(query_params.keys())[0])}"
-        for key in list(query_params.keys())[1:]:
-            var_name = self.camel_case(key)
-            php_code += f".'&{key}='.${var_name}"
-        php_code += ");"
-
-        # Generate and display PHP test methods
-        structure = self.output_text.get("1.0", tk.END).strip()  # Get the JSON structure
-        php_tests = self.generate_php_tests(path, structure, query_params)
-        self.show_php_tests(php_tests)
-
-
-    def parse_post_request(self, curl_command):
-        start = curl_command.find("http")
-        url = curl_command[start:].split()[0]
-        parsed_url = urlparse(url)
-        path = parsed_url.path
-
-        # Extract data fields from the curl command using -F option
-        data_segments = curl_command.split(" -F ")[1:]  # Extract data segments
-        php_array = "$data = [\n"
-        data = []
-        for segment in data_segments:
-            key, value = segment.split("=", 1)
-            key = key.strip().strip("'")
-            value = value.strip().strip("'")
-            php_array += f"    '{unquote(key)}' => '{unquote(value)}',\n"
-            data.append(f"'{key}' => '{value}'")
-        php_array = php_array.rstrip(",\n") + "\n];\n"
-
-        php_code = php_array + f"\n$response = $this->post('{path}', $data);"
-
-        # Display the PHP code in the output area
-        self.query_output.delete("1.0", tk.END)
-        self.query_output.insert(tk.END, php_code)
-        self.root.clipboard_clear()
-        self.root.clipboard_append(php_code)
+                child_added, child_removed = diff_structures(old[key], new[key], key_path)
+                added += child_added
+                removed += child_removed
+        added += [f"{path}.{key}" if path else key for key in new if key not in old]
+    elif isinstance(old, dict) != isinstance(new, dict):
+        # An object or array of objects became a scalar/list, or the other way around
+        if isinstance(old, dict):
+            removed += [f"{path}.{key}" if path else key for key in old]
+        else:
+            added += [f"{path}.{key}" if path else key for key in new]
+    return added, removed
+
+
+def rebase_request(request, base_url, prefix=""):
+    """
+    Copy of request sent to base_url instead of its own host. If base_url has a path, it
+    replaces prefix at the start of the request path (e.g. prefix "api/v1" and base URL
+    "https://staging.example.com/api/v2").
+    """
+    parsed_url = urlparse(request.url)
+    parsed_base = urlparse(base_url)
+    path = parsed_url.path
+    if parsed_base.path.strip("/"):
+        prefix = "/" + prefix.strip("/") if prefix.strip("/") else ""
+        if prefix and path.startswith(prefix):
+            path = path[len(prefix):]
+        path = parsed_base.path.rstrip("/") + path
+    url = parsed_url._replace(scheme=parsed_base.scheme, netloc=parsed_base.netloc, path=path).geturl()
+    return request.copy(url=url)
+
+
+def fan_out(client, request, environments, prefix="", max_workers=8):
+    """
+    Send request to every environment (name -> base URL) concurrently. Returns
+    name -> {"url", "status", "elapsed_ms", "structure", "error"} in environment order.
+    """
+    parse_json_structure = PhpTestGenerator().parse_json_structure
+
+    def send(item):
+        name, base_url = item
+        environment_request = rebase_request(request, base_url, prefix)
+        result = {"url": environment_request.url, "status": None, "elapsed_ms": None,
+                  "structure": None, "error": None}
+        try:
+            response = client.send(environment_request)
+            result["status"] = response.status
+            result["elapsed_ms"] = response.elapsed * 1000
+            result["structure"] = parse_json_structure(response.json())
+        except ValueError:
+            result["error"] = "response is not JSON"
+        except (OSError, http.client.HTTPException) as e:
+            result["error"] = str(e)
+        return name, result
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return dict(executor.map(send, environments.items()))
+
+
+def format_comparison(results):
+    """Side-by-side table of fan_out results, with structure differences against the first environment."""
+    names = list(results)
+    reference = results[names[0]]["structure"] if names else None
+    lines = [f"{'environment':<16}{'status':>7}{'ms':>10}  {'fingerprint':<14}differences vs {names[0] if names else '-'}"]
+    for name in names:
+        result = results[name]
+        if result["error"]:
+            lines.append(f"{name:<16}{result['status'] or '-':>7}{'-':>10}  {'-':<14}{result['error']}")
+            continue
+        added, removed = diff_structures(reference, result["structure"])
+        differences = ", ".join([f"+{key}" for key in added] + [f"-{key}" for key in removed]) or "none"
+        lines.append(
+            f"{name:<16}{result['status']:>7}{result['elapsed_ms']:>10.1f}  "
+            f"{structure_fingerprint(result['structure'])[:12]:<14}{differences}"
+        )
+    return "\n".join(lines)
+
+
+def parse_environments(text):
+    """Parse "name=base URL" entries, one per line or comma separated."""
+    environments = {}
+    for item in re.split(r"[,\n]", text):
+        name, _, base_url = item.strip().partition("=")
+        if name and base_url:
+            environments[name.strip()] = base_url.strip()
+    return environments
+
+
+class EndpointCatalog:
+    """
+    SQLite store of the last request, response metadata, structure and generated tests per
+    endpoint, keyed by method and normalized path.
+    """
+    COLUMNS = (
+        "method", "path", "url", "request", "status", "size", "elapsed_ms",
+        "fingerprint", "structure", "tests", "updated_at",
+    )
+
+    def __init__(self, filename="pather_catalog.sqlite3"):
+        self.filename = filename
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(filename, check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        with self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("""
+                CREATE TABLE IF NOT EXISTS endpoints (
+                    method TEXT NOT NULL,
+                    path TEXT NOT NULL,
+                    url TEXT,
+                    request TEXT,
+                    status INTEGER,
+                    size INTEGER,
+                    elapsed_ms REAL,
+                    fingerprint TEXT,
+                    structure TEXT,
+                    tests TEXT,
+                    updated_at REAL,
+                    PRIMARY KEY (method, path)
+                )
+            """)
+            self._connection.execute("CREATE INDEX IF NOT EXISTS endpoints_status ON endpoints (status)")
+            self._connection.execute("CREATE INDEX IF NOT EXISTS endpoints_fingerprint ON endpoints (fingerprint)")
+
+    def record(self, request, status=None, size=None, elapsed_ms=None, structure=None, tests=None):
+        """Insert or replace the entry for request's endpoint; None values keep what was stored."""
+        request_json = json.dumps(request.to_dict())
+        values = {
+            "method": request.method,
+            "path": normalize_path(request.url),
+            "url": request.url,
+            "request": request_json,
+            "status": status,
+            "size": size,
+            "elapsed_ms": elapsed_ms,
+            "fingerprint": structure_fingerprint(structure) if structure is not None else None,
+            "structure": json.dumps(structure) if structure is not None else None,
+            "tests": tests,
+            "updated_at": time.time(),
+        }
+        updates = ", ".join(
+            f"{column} = COALESCE(excluded.{column}, endpoints.{column})"
+            for column in self.COLUMNS if column not in ("method", "path")
+        )
+        with self._lock, self._connection:
+            self._connection.execute(
+                f"INSERT INTO endpoints ({', '.join(values)}) VALUES ({', '.join('?' * len(values))}) "
+                f"ON CONFLICT (method, path) DO UPDATE SET {updates}",
+                list(values.values()),
+            )
+
+    def get(self, method, path):
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT * FROM endpoints WHERE method = ? AND path = ?", (method, normalize_path(path))
+            ).fetchone()
+        return dict(row) if row else None
+
+    def search(self, text=None, method=None, status=None, limit=None):
+        """Entries whose path contains text, optionally filtered by method and status."""
+        conditions, parameters = [], []
+        if text:
+            # % and _ in the search text are literal characters, not wildcards
+            conditions.append("path LIKE ? ESCAPE '\\'")
+            parameters.append("%" + re.sub(r"([\\%_])", r"\\\1", text) + "%")
+        if method:
+            conditions.append("method = ?")
+            parameters.append(method.upper())
+        if status is not None:
+            conditions.append("status = ?")
+            parameters.append(status)
+        query = "SELECT * FROM endpoints"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY path, method"
+        if limit:
+            query += f" LIMIT {int(limit)}"
+        with self._lock:
+            return [dict(row) for row in self._connection.execute(query, parameters)]
+
+    def fingerprints(self):
+        """(method, path) -> stored structure fingerprint, for every endpoint that has one."""
+        with self._lock:
+            return {
+                (row["method"], row["path"]): row["fingerprint"]
+                for row in self._connection.execute(
+                    "SELECT method, path, fingerprint FROM endpoints WHERE fingerprint IS NOT NULL"
+                )
+            }
+
+    def requests(self):
+        """The last stored request of every endpoint."""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT request FROM endpoints WHERE request IS NOT NULL ORDER BY path, method"
+            ).fetchall()
+        return [CurlRequest.from_dict(json.loads(row["request"])) for row in rows]
+
+    def export_tests(self, filename, entries):
+        """
+        Write the stored tests of entries to one file, each under a method/path comment.
+        Fast-mode tests share a single copy of the helper block they call.
+        """
+        helpers = PhpTestGenerator.FAST_TEST_HELPERS
+        blocks = [
+            (entry, entry["tests"].replace(helpers, ""))
+            for entry in entries if entry["tests"]
+        ]
+        with open(filename, "w") as file:
+            if any(helpers in entry["tests"] for entry, _ in blocks):
+                file.write(helpers + "\n")
+            for entry, tests in blocks:
+                file.write(f"// {entry['method']} {entry['path']}{tests}\n")
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+def rerun_structures(client, requests, max_workers=8):
+    """Yield (request, inferred structure) for each request sent again; failures are skipped."""
+    parse_json_structure = PhpTestGenerator().parse_json_structure
+
+    def send(request):
+        try:
+            return request, parse_json_structure(client.send(request).json())
+        except (OSError, ValueError, http.client.HTTPException):
+            return request, None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for request, structure in executor.map(send, requests):
+            if structure is not None:
+                yield request, structure
+
+
+def detect_drift(catalog, observations, accept=False):
+    """
+    Compare (request, structure) observations with the structures stored in catalog.
+    Only endpoints whose fingerprint changed are loaded and diffed. Returns
+    (unchanged count, new endpoints, drifted) where drifted is a list of
+    (method, path, added, removed). With accept, observed structures become the new baseline.
+    """
+    stored = catalog.fingerprints()
+    unchanged, new_endpoints, drifted = 0, [], []
+    for request, structure in observations:
+        key = (request.method, normalize_path(request.url))
+        fingerprint = stored.get(key)
+        if fingerprint == structure_fingerprint(structure):
+            unchanged += 1
+            continue
+        if fingerprint is None:
+            new_endpoints.append(key)
+        else:
+            baseline = json.loads(catalog.get(*key)["structure"])
+            added, removed = diff_structures(baseline, structure)
+            drifted.append((*key, added, removed))
+        if accept:
+            catalog.record(request, structure=structure)
+    return unchanged, new_endpoints, drifted
+
+
+def format_drift_report(unchanged, new_endpoints, drifted):
+    lines = [f"{len(drifted)} drifted, {len(new_endpoints)} new, {unchanged} unchanged"]
+    for method, path, added, removed in drifted:
+        lines.append(f"{method} {path}")
+        lines += [f"    + {key}" for key in added]
+        lines += [f"    - {key}" for key in removed]
+    lines += [f"{method} {path} (no baseline)" for method, path in new_endpoints]
+    return "\n".join(lines)
+
+
+class ResponsePipeline:
+    """
+    Artifacts derived from one response body, each computed the first time a pane or an
+    export asks for it and kept afterwards. Checking only the status of a large response
+    never decodes or formats it.
+    """
+    def __init__(self, raw_text, generator, render_tests=None):
+        self.raw_text = raw_text
+        self.generator = generator
+        self.render_tests = render_tests  # called with the pipeline, returns PHP test text
+
+    @cached_property
+    def json_data(self):
+        return json.loads(self.raw_text)
+
+    @cached_property
+    def structure(self):
+        return self.generator.parse_json_structure(self.json_data)
+
+    @cached_property
+    def formatted_structure(self):
+        return self.generator.format_structure(self.structure)
+
+    @cached_property
+    def pretty_json(self):
+        return json.dumps(self.json_data, indent=4)
+
+    @cached_property
+    def php_tests(self):
+        return self.render_tests(self) if self.render_tests else ""
+
+    def computed(self, name):
+        """The artifact if something already needed it, else None."""
+        return self.__dict__.get(name)
+
+
+class PhpTestGenerator:
+    """Builds Laravel feature tests from a request path, payload and JSON response."""
+    def __init__(self, prefix="api/v1", fast=False):
+        self.prefix = prefix
+        self.fast = fast
+
+    def get_prefix(self):
+        return self.prefix
+
+    def use_fast_tests(self):
+        return self.fast
+
+    # In fast mode users and ids come from the cached helpers in FAST_TEST_HELPERS
+    # instead of loading whole tables on every test
+    def _user(self, email):
+        if self.use_fast_tests():
+            return f"$this->cachedUser('{email}')"
+        return f"User::where('email', '{email}')->first()"
+
+    def _first_id(self, model):
+        if self.use_fast_tests():
+            return f"$this->firstId({model}::class)"
+        return f"{model}::all()->first()->id"
+
+    def _last_id(self, model):
+        if self.use_fast_tests():
+            return f"$this->lastId({model}::class)"
+        return f"{model}::all()->last()->id"
+
+    FAST_TEST_HELPERS = """
+        // Requires: use Illuminate\\Foundation\\Testing\\DatabaseTransactions;
+        // Include once per test class
+        use DatabaseTransactions;
+
+        protected static array $cachedUsers = [];
+        // min/max ids are null while a table is empty, and null is not cached
+        protected static array $cachedIds = [];
+
+        protected function cachedUser(string $email): User
+        {
+            return static::$cachedUsers[$email] ??= User::where('email', $email)->firstOrFail();
+        }
+
+        protected function firstId(string $model): ?int
+        {
+            return static::$cachedIds[$model]['min'] ??= $model::query()->min('id');
+        }
+
+        protected function lastId(string $model): ?int
+        {
+            return static::$cachedIds[$model]['max'] ??= $model::query()->max('id');
+        }
+        """
 
-        # Generate and display PHP test methods
-        structure = self.output_text.get("1.0", tk.END).strip()  # Get the JSON structure
-        php_tests = self.generate_php_tests(path, structure, self.test_type.get(), data, json.loads(self.raw_json_output.get("1.0", tk.END)))
-        self.show_php_tests(php_tests)
+    def with_fast_helpers(self, tests):
+        """In fast mode, tests with the FAST_TEST_HELPERS block they call included exactly once."""
+        if not self.use_fast_tests():
+            return tests
+        return self.FAST_TEST_HELPERS + tests.replace(self.FAST_TEST_HELPERS, "")
+
+    def form_data_entry(self, name, value):
+        """PHP array entry for a form field; @file uploads become an UploadedFile fake of the same size and type."""
+        form_value = parse_form_value(value)
+        if form_value["path"] is None:
+            return f"'{name}'=>'{form_value['value']}'"
+        kilobytes = math.ceil(form_value["size"] / 1024)
+        return (
+            f"'{name}'=>\\Illuminate\\Http\\UploadedFile::fake()->create('{form_value['filename']}', {kilobytes}, "
+            f"'{form_value['type']}')"
+        )
 
-    def show_php_tests(self, php_tests):
-        # Show the PHP tests in the output area
-        self.query_output.pack(padx=10, pady=(0, 10))
-        self.query_output.delete("1.0", tk.END)
-        self.query_output.insert(tk.END, php_tests)
+    def stored_fields(self, data):
+        """Data entries that end up in a column; UploadedFile fakes never match one."""
+        return [entry for entry in data if 'UploadedFile::fake()' not in entry]
 
     def parse_json_structure(self, data):
         if isinstance(data, dict):
@@ -279,19 +1283,28 @@ class CurlJSONFormatterApp:
         components = snake_str.split('_')
         return components[0] + ''.join(x.title() for x in components[1:])
     
-    def generate_php_tests(self, path, structure, test_type, data=None, json_data=None):
+    def generate_php_tests(self, path, structure, test_type, data=None, json_data=None, status=None):
+        """
+        Tests for one endpoint. status, when known from a recorded response, replaces
+        the success status the authenticated test asserts by default.
+        """
         base_path = path.rstrip('/').split('/')[-1]
         
         if test_type == "List":
-            return self.generate_list_tests(path, structure, json_data)
+            tests = self.generate_list_tests(path, structure, json_data)
         elif test_type == "Create":
-            return self.generate_create_tests(path, data, json_data)
+            tests = self.generate_create_tests(path, data, json_data)
         elif test_type == "Show":
-            return self.generate_show_tests(path, json_data)
+            tests = self.generate_show_tests(path, json_data)
         elif test_type == "Update":
-            return self.generate_update_tests(path, data, json_data)
+            tests = self.generate_update_tests(path, data, json_data)
         else:
             raise ValueError(f"Unknown test type: {test_type}")
+        default_status = 201 if test_type == "Create" else 200
+        if status and status != default_status:
+            # The authenticated test comes first in every test type
+            tests = tests.replace(f"assertStatus({default_status})", f"assertStatus({status})", 1)
+        return self.with_fast_helpers(tests)
 
 
     def generate_list_tests(self, path, structure, json_data, query_params=None):
@@ -302,7 +1315,7 @@ class CurlJSONFormatterApp:
         authenticated_test = f"""
         public function test_list_{base_path}_authenticated()
         {{
-            $this->$user = $user = User::where('email', 'admin@pruebas.com')->first();
+            $this->$user = $user = {self._user('admin@pruebas.com')};
             $this->actingAs(Passport::actingAs($user));
 
             $response = $this->get('{path}');
@@ -319,7 +1332,7 @@ class CurlJSONFormatterApp:
         invalid_test = f"""
         public function test_list_{base_path}_invalid_{invalid_param}_authenticated()
         {{
-            $this->$user = $user = User::where('email', 'admin@pruebas.com')->first();
+            $this->$user = $user = {self._user('admin@pruebas.com')};
             $this->actingAs(Passport::actingAs($user));
 
             $response = $this->get('{path}?{invalid_param}=invalid');
@@ -359,7 +1372,7 @@ class CurlJSONFormatterApp:
         no_permission_test = f"""
         public function test_list_{base_path}_without_permission_authenticated()
         {{
-            $this->$user = $user = User::where('email', 'user@pruebas.com')->first();
+            $this->$user = $user = {self._user('user@pruebas.com')};
             $this->actingAs(Passport::actingAs($user));
 
             $response = $this->get('{path}');
@@ -395,6 +1408,7 @@ class CurlJSONFormatterApp:
         title_path = path.rstrip('/').replace('/', '_')
     
         data_str = "[\n            " + ",\n            ".join(data) + "\n        ,]"
+        stored_str = "[\n            " + ",\n            ".join(self.stored_fields(data)) + "\n        ,]"
     
         # Define generate_structure as a nested function
         def generate_structure(data, indent=3):
@@ -412,14 +1426,14 @@ class CurlJSONFormatterApp:
         formatted_structure = self.format_structure(structure)
         
         # Generate error messages for all fields
-        error_assertions = "\n".join([f"            '{key.split('=')[0]}' => 'El campo {key.split('=')[0].replace('_', ' ')} es requerido.'" for key in data])
-        json_path_assertions = "\n".join([f"            $response->assertJsonPath('data.{key.split('=>')[0]}', $data['{key.split('=>')[0]}']);" for key in data])
+        error_assertions = "\n".join([f"            '{key.split('=')[0]}' => 'El campo {key.split('=')[0].replace('_', ' ')} es requerido.'" for key in self.stored_fields(data)])
+        json_path_assertions = "\n".join([f"            $response->assertJsonPath('data.{key.split('=>')[0]}', $data['{key.split('=>')[0]}']);" for key in self.stored_fields(data)])
          
         # Test 1: Authenticated create test
         authenticated_test = f"""
         public function test_create_{title_path}_authenticated()
         {{
-            $user = User::where('email', 'admin@pruebas.com')->first();
+            $user = {self._user('admin@pruebas.com')};
             $this->actingAs(Passport::actingAs($user));
 
             // Test data
@@ -436,7 +1450,7 @@ class CurlJSONFormatterApp:
             {json_path_assertions}
 
             // Assert database contains the created record
-            $this->assertDatabaseHas('{base_path}s', {data_str});
+            $this->assertDatabaseHas('{base_path}s', {stored_str});
 
             // Assert the response data is not empty
             $this->assertNotTrue(count($response['data']) < 1, 'Response DATA is empty');
@@ -446,7 +1460,7 @@ class CurlJSONFormatterApp:
         no_permission_test = f"""
         public function test_create_{title_path}_without_permission_authenticated()
         {{
-            $user = User::where('email', 'user@pruebas.com')->first();
+            $user = {self._user('user@pruebas.com')};
             $this->actingAs(Passport::actingAs($user));
             $data = {data_str};
             $response = $this->post('{path}', $data);
@@ -463,7 +1477,7 @@ class CurlJSONFormatterApp:
         missing_info_test = f"""
         public function test_create_{title_path}_missing_info_authenticated()
         {{
-            $user = User::where('email', 'admin@pruebas.com')->first();
+            $user = {self._user('admin@pruebas.com')};
             $this->actingAs(Passport::actingAs($user));
             $data = [];
             $response = $this->post('{path}', $data);
@@ -516,9 +1530,9 @@ class CurlJSONFormatterApp:
         authenticated_test = f"""
         public function test_show_{title_path}_authenticated()
         {{
-            $this->$user = $user = User::where('email', 'admin@pruebas.com')->first();
+            $this->$user = $user = {self._user('admin@pruebas.com')};
             $this->actingAs(Passport::actingAs($user));
-            ${base_path}Id = {base_path.capitalize()}::all()->first()->id;
+            ${base_path}Id = {self._first_id(base_path.capitalize())};
             $response = $this->get('{path}/' . ${base_path}Id . '/show');
             $response->assertStatus(200);
             $response->assertJsonStructure({formatted_structure});
@@ -530,9 +1544,9 @@ class CurlJSONFormatterApp:
         invalid_id_test = f"""
         public function test_show_{title_path}_invalid_id_authenticated()
         {{
-            $this->$user = $user = User::where('email', 'admin@pruebas.com')->first();
+            $this->$user = $user = {self._user('admin@pruebas.com')};
             $this->actingAs(Passport::actingAs($user));
-            ${base_path}Id = {base_path.capitalize()}::all()->last()->id+9999;
+            ${base_path}Id = {self._last_id(base_path.capitalize())}+9999;
             $this->withoutExceptionHandling();
             $this->expectException(ModelNotFoundException::class);
             $response = $this->get('{path}/' . ${base_path}Id . '/show');
@@ -543,9 +1557,9 @@ class CurlJSONFormatterApp:
         no_permission_test = f"""
         public function test_show_{title_path}_without_permission_authenticated()
         {{
-            $this->$user = $user = User::where('email', 'user@pruebas.com')->first();
+            $this->$user = $user = {self._user('user@pruebas.com')};
             $this->actingAs(Passport::actingAs($user));
-            ${base_path}Id = {base_path.capitalize()}::all()->first()->id;
+            ${base_path}Id = {self._first_id(base_path.capitalize())};
             $response = $this->get('{path}/' . ${base_path}Id . '/show');
             $response->assertStatus(401);
             $response->assertJsonStructure([
@@ -561,7 +1575,7 @@ class CurlJSONFormatterApp:
         unauthenticated_test = f"""
         public function test_show_{title_path}_unauthenticated()
         {{
-            ${base_path}Id = {base_path.capitalize()}::all()->first()->id;
+            ${base_path}Id = {self._first_id(base_path.capitalize())};
             $response = $this->get('{path}/' . ${base_path}Id . '/show');
             $this->followRedirects($response)
                 ->assertStatus(404)
@@ -576,29 +1590,30 @@ class CurlJSONFormatterApp:
 
     def generate_update_tests(self, path, data, json_data):
         base_path = path.rstrip('/').split('/')[-1] # Get the base path (e.g., 'procedures')
-        title_path = path.replace(self.prefix_input.get(), "").rstrip('/').replace('/', '_')
+        title_path = path.replace(self.get_prefix(), "").rstrip('/').replace('/', '_')
         data_str = "[\n            " + ",\n            ".join(data) + "\n        ]"
+        stored_str = "[\n            " + ",\n            ".join(self.stored_fields(data)) + "\n        ]"
         
         structure = self.parse_json_structure(json_data)
         formatted_structure = self.format_structure(structure)
         
         # Generate error messages for all fields
-        error_assertions = "\n".join([f"            '{key.split('=')[0]}' => 'El campo {key.split('=')[0].replace('_', ' ')} es requerido.'" for key in data])
-        json_path_assertions = "\n".join([f"            ->assertJsonPath('data.{key.split('=>')[0]}', $data['{key.split('=>')[0]}'])" for key in data])
+        error_assertions = "\n".join([f"            '{key.split('=')[0]}' => 'El campo {key.split('=')[0].replace('_', ' ')} es requerido.'" for key in self.stored_fields(data)])
+        json_path_assertions = "\n".join([f"            ->assertJsonPath('data.{key.split('=>')[0]}', $data['{key.split('=>')[0]}'])" for key in self.stored_fields(data)])
         
         # Test 1: Authenticated update test
         authenticated_test = f"""
         public function test_update_{title_path}_by_id_authenticated()
         {{
-            $this->$user = $user = User::where('email', 'admin@pruebas.com')->first();
+            $this->$user = $user = {self._user('admin@pruebas.com')};
             $this->actingAs(Passport::actingAs($user));
-            ${base_path}Id = {base_path.capitalize()}::all()->last()->id;
+            ${base_path}Id = {self._last_id(base_path.capitalize())};
             $data = {data_str};
             $response = $this->post('{path}/' . ${base_path}Id . '/update', $data);
             $response->assertStatus(200);
             $response->assertJsonStructure({formatted_structure})
             {json_path_assertions};
-            $this->assertDatabaseHas('{base_path}', {data_str});
+            $this->assertDatabaseHas('{base_path}', {stored_str});
             $this->assertNotTrue(count($response['data'])<1,'Response DATA is empty');
         }}
         """
@@ -607,9 +1622,9 @@ class CurlJSONFormatterApp:
         no_permission_test = f"""
         public function test_update_{title_path}_by_id_without_permission_authenticated()
         {{
-            $this->$user = $user = User::where('email', 'user@pruebas.com')->first();
+            $this->$user = $user = {self._user('user@pruebas.com')};
             $this->actingAs(Passport::actingAs($user));
-            ${base_path}Id = {base_path.capitalize()}::all()->last()->id;
+            ${base_path}Id = {self._last_id(base_path.capitalize())};
             $data = {data_str};
             $response = $this->post('{path}/' . ${base_path}Id . '/update', $data);
             $response->assertStatus(401);
@@ -626,9 +1641,9 @@ class CurlJSONFormatterApp:
         missing_info_test = f"""
         public function test_update_{title_path}_by_id_missing_info_authenticated()
         {{
-            $this->$user = $user = User::where('email', 'admin@pruebas.com')->first();
+            $this->$user = $user = {self._user('admin@pruebas.com')};
             $this->actingAs(Passport::actingAs($user));
-            ${base_path}Id = {base_path.capitalize()}::all()->last()->id;
+            ${base_path}Id = {self._last_id(base_path.capitalize())};
             $data = [];
             $response = $this->post('{path}/' . ${base_path}Id . '/update', $data);
             $response->assertSessionHasErrors([
@@ -641,9 +1656,9 @@ class CurlJSONFormatterApp:
         invalid_id_test = f"""
         public function test_update_{title_path}_by_invalid_id_authenticated()
         {{
-            $this->$user = $user = User::where('email', 'admin@pruebas.com')->first();
+            $this->$user = $user = {self._user('admin@pruebas.com')};
             $this->actingAs(Passport::actingAs($user));
-            ${base_path}Id = {base_path.capitalize()}::all()->last()->id+999;
+            ${base_path}Id = {self._last_id(base_path.capitalize())}+999;
             $data = {data_str};
             $this->withoutExceptionHandling();
             $this->expectException(ModelNotFoundException::class);
@@ -667,22 +1682,654 @@ class CurlJSONFormatterApp:
         """
 
         return (authenticated_test + no_permission_test + missing_info_test + invalid_id_test + unauthenticated_test).replace("''", "'").replace("'_", "_").replace("_'","_")
-    def toggle_raw_json(self):
-        if self.show_json_var.get():
-            self.raw_json_output.pack(padx=10, pady=(0, 10))
-        else:
-            self.raw_json_output.pack_forget()
 
-    def toggle_json_format(self):
-        if self.pretty_json_var.get():
-            # Convert raw JSON to pretty JSON
-            raw_json = self.raw_json_output.get("1.0", tk.END).strip()
-            try:
-                pretty_json = json.dumps(json.loads(raw_json), indent=4)
-                self.raw_json_output.delete("1.0", tk.END)
-                self.raw_json_output.insert(tk.END, pretty_json)
-            except json.JSONDecodeError:
-                messagebox.showerror("Error", "Invalid JSON format.")
+    def generate_role_matrix_tests(self, path, method, results, data=None):
+        """One test per probed role asserting the status, and structure on success, it got."""
+        title_path = path.rstrip('/').split('?')[0].replace('/', '_')
+        if method == "GET":
+            request_code = f"$response = $this->get('{path}');"
+        else:
+            data_str = "[\n            " + ",\n            ".join(data or []) + "\n        ,]"
+            request_code = f"$data = {data_str};\n            $response = $this->{method.lower()}('{path}', $data);"
+        tests = ""
+        for (role, email), result in results.items():
+            role = "".join(c if c.isalnum() else "_" for c in role)
+            assertions = f"$response->assertStatus({result['status']});"
+            if 200 <= result["status"] < 300 and isinstance(result["json"], (dict, list)):
+                formatted_structure = self.format_structure(self.parse_json_structure(result["json"]))
+                assertions += f"\n            $response->assertJsonStructure(\n                 {formatted_structure});"
+            tests += f"""
+        public function test_{method.lower()}{title_path}_as_{role}()
+        {{
+            $user = {self._user(email)};
+            $this->actingAs(Passport::actingAs($user));
+
+            {request_code}
+
+            {assertions}
+        }}
+        """
+        return self.with_fast_helpers(tests)
+
+    def generate_filter_tests(self, path, results):
+        """Tests for the query parameters that probing showed to change the response."""
+        base_path = path.rstrip('/').split('?')[0]
+        title_path = base_path.replace('/', '_')
+        tests = ""
+        for name, result in results.items():
+            if not result["affects"]:
+                continue
+            param = "".join(c if c.isalnum() else "_" for c in name)
+            for variant, value in (("valid", result["value"]), ("invalid", "invalid"), ("empty", "")):
+                outcome = result[variant]
+                assertions = f"$response->assertStatus({outcome['status']});"
+                if outcome["count"] == 0:
+                    assertions += "\n            $this->assertTrue(count($response['data']) < 1, 'Response DATA is not empty');"
+                elif outcome["count"]:
+                    assertions += "\n            $this->assertNotTrue(count($response['data']) < 1, 'Response DATA is empty');"
+                tests += f"""
+        public function test_list{title_path}_filter_{param}_{variant}_authenticated()
+        {{
+            $user = {self._user('admin@pruebas.com')};
+            $this->actingAs(Passport::actingAs($user));
+
+            $response = $this->get('{base_path}?{urlencode({name: value})}');
+
+            {assertions}
+        }}
+        """
+        return self.with_fast_helpers(tests)
+
+    def generate_latency_test(self, path, p95_ms, multiplier=2.0):
+        """Test asserting the GET endpoint answers within multiplier x the measured p95."""
+        title_path = path.rstrip('/').split('?')[0].replace('/', '_')
+        budget_ms = math.ceil(p95_ms * multiplier)
+        return self.with_fast_helpers(f"""
+        public function test_get{title_path}_latency_budget()
+        {{
+            $user = {self._user('admin@pruebas.com')};
+            $this->actingAs(Passport::actingAs($user));
+
+            $start = microtime(true);
+            $response = $this->get('{path}');
+            $elapsedMs = (microtime(true) - $start) * 1000;
+
+            $response->assertSuccessful();
+            // Budget: {multiplier:g} x measured p95 of {p95_ms:.1f} ms
+            $this->assertLessThan({budget_ms}, $elapsedMs, "Took {{$elapsedMs}} ms, budget is {budget_ms} ms");
+        }}
+        """)
+
+
+class CurlJSONFormatterApp(PhpTestGenerator):
+    def __init__(self, root):
+        super().__init__()
+        self.root = root
+        self.history = []
+        self.future = []
+        self.show_formatted_structure = tk.BooleanVar(value=True)
+        self.http_client = HttpClient()
+        # Batch operations go through the scheduler; single timed requests use the client directly
+        self.scheduler = RequestScheduler(self.http_client)
+        self.pipeline = None
+        self.latency_tests = ""
+        # (generation, request, multiplier, timings, error) from the latency worker thread
+        self.latency_results = queue.Queue()
+        self.latency_generation = 0
+        self.latency_pending = False
+        self.catalog = EndpointCatalog()
+
+        self.setup_ui()
+
+        # Bindings for undo and redo on macOS
+        self.root.bind('<Command-z>', self.undo)
+        self.root.bind('<Command-Shift-Z>', self.redo)
+
+    def get_prefix(self):
+        return self.prefix_input.get()
+
+    def use_fast_tests(self):
+        return self.fast_tests_var.get()
+
+    def setup_ui(self):
+        self.root.title("Curl JSON Formatter")
+        self.root.geometry("1000x1000")
+        self.root.resizable(True, True)
+        
+         # Prefix input field
+        prefix_frame = tk.Frame(self.root)
+        prefix_frame.pack(fill=tk.X, padx=10, pady=10)
+        prefix_label = tk.Label(prefix_frame, text="Prefix:")
+        prefix_label.pack(side=tk.LEFT)
+        self.prefix_input = tk.Entry(prefix_frame)
+        self.prefix_input.pack(side=tk.RIGHT)
+        self.prefix_input.insert(0, "api/v1")  # Default value
+
+
+        # Status code label
+        self.status_label = tk.Label(self.root, text="Status Code: N/A", font=('Arial', 14))
+        self.status_label.pack(pady=(10, 0))
+
+        # Curl input label and text area
+        tk.Label(self.root, text="Enter curl command:").pack(pady=(10, 0))
+        self.curl_input = scrolledtext.ScrolledText(self.root, wrap=tk.WORD, width=110, height=8)
+        self.curl_input.pack(padx=10, pady=(0, 10))
+
+        # Request type selector
+        tk.Label(self.root, text="Select Request Type:").pack(pady=(10, 0))
+        self.request_type = ttk.Combobox(self.root, values=["GET", "POST"], state="readonly")
+        self.request_type.current(0)  # Set default to GET
+        self.request_type.pack(pady=(0, 10))
+        
+          # Test type selector
+        tk.Label(self.root, text="Select Test Type:").pack(pady=(10, 0))
+        self.test_type = ttk.Combobox(self.root, values=["List", "Create", "Show", "Update"], state="readonly")
+        self.test_type.current(0)  # Set default to List
+        self.test_type.pack(pady=(0, 10))
+
+        # Emit tests with cached users/ids and DatabaseTransactions instead of Model::all()
+        self.fast_tests_var = tk.BooleanVar(value=False)
+        self.fast_tests_checkbox = tk.Checkbutton(self.root, text="Fast Tests (cached fixtures)", variable=self.fast_tests_var)
+        self.fast_tests_checkbox.pack(pady=(0, 10))
+
+        # Render PHP tests after executing; off skips structure inference for hidden panes
+        self.generate_tests_var = tk.BooleanVar(value=True)
+        self.generate_tests_checkbox = tk.Checkbutton(self.root, text="Generate PHP Tests", variable=self.generate_tests_var, command=self.toggle_php_tests)
+        self.generate_tests_checkbox.pack(pady=(0, 10))
+
+        # Latency budget: time warm runs of GET requests and emit a test against the p95
+        latency_frame = tk.Frame(self.root)
+        latency_frame.pack(pady=(0, 10))
+        self.latency_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(latency_frame, text="Latency Budget Test", variable=self.latency_var).pack(side=tk.LEFT)
+        tk.Label(latency_frame, text="Runs:").pack(side=tk.LEFT)
+        self.latency_runs = tk.Spinbox(latency_frame, from_=3, to=100, width=4)
+        self.latency_runs.delete(0, tk.END)
+        self.latency_runs.insert(0, "10")
+        self.latency_runs.pack(side=tk.LEFT)
+        tk.Label(latency_frame, text="Budget x p95:").pack(side=tk.LEFT)
+        self.latency_multiplier = tk.Entry(latency_frame, width=5)
+        self.latency_multiplier.insert(0, "2.0")
+        self.latency_multiplier.pack(side=tk.LEFT)
+
+        # Role matrix: one "[role] email Header: value" per line, probed concurrently
+        tk.Label(self.root, text="Roles ([role] email Header: value, one per line):").pack(pady=(10, 0))
+        self.roles_input = scrolledtext.ScrolledText(self.root, wrap=tk.NONE, width=110, height=3)
+        self.roles_input.pack(padx=10, pady=(0, 5))
+        self.probe_roles_button = tk.Button(self.root, text="Probe Role Matrix", command=self.probe_role_matrix)
+        self.probe_roles_button.pack(pady=(0, 10))
+
+        # Query filter probing for List endpoints; empty uses the curl's own query string
+        filters_frame = tk.Frame(self.root)
+        filters_frame.pack(pady=(0, 10))
+        tk.Label(filters_frame, text="Filters (name=value, comma separated):").pack(side=tk.LEFT)
+        self.filters_input = tk.Entry(filters_frame, width=50)
+        self.filters_input.pack(side=tk.LEFT)
+        self.probe_filters_button = tk.Button(filters_frame, text="Probe Query Filters", command=self.probe_query_filters)
+        self.probe_filters_button.pack(side=tk.LEFT)
+
+        # Execute and Copy button
+        self.execute_and_copy_button = tk.Button(self.root, text="Execute Curl & Copy", command=self.execute_and_copy_curl)
+        self.execute_and_copy_button.pack(pady=(0, 10))
+
+        # Clear Curl Field button
+        self.clear_curl_button = tk.Button(self.root, text="Clear Curl Field", command=self.clear_curl_field)
+        self.clear_curl_button.pack(pady=(0, 10))
+
+        # Extract Variables from CURL button
+        self.extract_button = tk.Button(self.root, text="Extract Variables from CURL", command=self.extract_variables_from_curl)
+        self.extract_button.pack(pady=(0, 10))
+
+        # Export the inferred structure of the last response as JSON Schema
+        self.export_schema_button = tk.Button(self.root, text="Export JSON Schema", command=self.export_schema)
+        self.export_schema_button.pack(pady=(0, 10))
+
+        # Bulk import from HAR files and Postman collections
+        self.import_button = tk.Button(self.root, text="Import HAR/Postman", command=self.import_requests)
+        self.import_button.pack(pady=(0, 10))
+
+        # Endpoint catalog search and export
+        catalog_frame = tk.Frame(self.root)
+        catalog_frame.pack(pady=(0, 10))
+        tk.Label(catalog_frame, text="Catalog path:").pack(side=tk.LEFT)
+        self.catalog_search = tk.Entry(catalog_frame, width=40)
+        self.catalog_search.pack(side=tk.LEFT)
+        tk.Button(catalog_frame, text="Search Catalog", command=self.search_catalog).pack(side=tk.LEFT)
+        tk.Button(catalog_frame, text="Export Catalog Tests", command=self.export_catalog_tests).pack(side=tk.LEFT)
+        tk.Button(catalog_frame, text="Drift Report", command=self.drift_report).pack(side=tk.LEFT)
+
+        # Environments to compare, one "name=base URL" per line
+        tk.Label(self.root, text="Environments (name=base URL, one per line):").pack(pady=(10, 0))
+        self.environments_input = scrolledtext.ScrolledText(self.root, wrap=tk.NONE, width=110, height=3)
+        self.environments_input.pack(padx=10, pady=(0, 5))
+        self.compare_button = tk.Button(self.root, text="Compare Environments", command=self.compare_environments)
+        self.compare_button.pack(pady=(0, 10))
+
+        self.formatted_structure_checkbox = tk.Checkbutton(
+            self.root, 
+            text="Show Formatted Structure", 
+            variable=self.show_formatted_structure,
+            command=self.toggle_formatted_structure
+        )
+        self.formatted_structure_checkbox.pack(pady=(10, 0))
+
+        # Output label and text area for formatted structure
+        self.formatted_structure_label = tk.Label(self.root, text="Formatted Structure:")
+        self.formatted_structure_label.pack(pady=(10, 0))
+        self.output_text = scrolledtext.ScrolledText(self.root, wrap=tk.WORD, width=110, height=15)
+        self.output_text.pack(padx=10, pady=(0, 10))
+
+        # PHP Code Output area (initially hidden)
+        self.query_output = scrolledtext.ScrolledText(self.root, wrap=tk.WORD, width=110, height=30)
+        self.query_output.pack(padx=10, pady=(0, 10))
+        self.query_output.pack_forget()  # Initially hide
+
+        # Checkbox to toggle raw JSON visibility
+        self.show_json_var = tk.BooleanVar()
+        self.show_json_checkbox = tk.Checkbutton(self.root, text="Show Raw JSON Output", variable=self.show_json_var, command=self.toggle_raw_json)
+        self.show_json_checkbox.pack(pady=(10, 0))
+
+        # Checkbox to toggle pretty JSON output
+        self.pretty_json_var = tk.BooleanVar()
+        self.pretty_json_checkbox = tk.Checkbutton(self.root, text="Toggle Pretty/Raw JSON", variable=self.pretty_json_var, command=self.toggle_json_format)
+        self.pretty_json_checkbox.pack(pady=(10, 0))
+
+        # Hidden raw JSON output area
+        self.raw_json_output = scrolledtext.ScrolledText(self.root, wrap=tk.WORD, width=110, height=15)
+        self.raw_json_output.pack_forget()
+
+        # Syntax highlighting of the visible part of each output pane
+        self.highlighters = [
+            Highlighter(self.output_text, "php"),
+            Highlighter(self.query_output, "php"),
+            Highlighter(self.raw_json_output, "json"),
+        ]
+
+    def toggle_formatted_structure(self):
+        if self.show_formatted_structure.get():
+            self.formatted_structure_label.pack(pady=(10, 0))
+            self.output_text.pack(padx=10, pady=(0, 10))
+            self.render_panes()
+        else:
+            self.formatted_structure_label.pack_forget()
+            self.output_text.pack_forget()
+
+    def toggle_php_tests(self):
+        if self.generate_tests_var.get():
+            self.render_panes()
+        else:
+            self.query_output.pack_forget()
+
+    def render_panes(self):
+        """Fill the visible panes from the current pipeline, computing only what they show."""
+        if self.pipeline is None:
+            return
+        try:
+            if self.show_formatted_structure.get():
+                self.output_text.delete("1.0", tk.END)
+                self.output_text.insert(tk.END, self.pipeline.formatted_structure)
+            if self.show_json_var.get():
+                self.raw_json_output.delete("1.0", tk.END)
+                self.raw_json_output.insert(
+                    tk.END, self.pipeline.pretty_json if self.pretty_json_var.get() else self.pipeline.raw_text
+                )
+            if self.generate_tests_var.get():
+                self.show_php_tests(self.with_fast_helpers(self.pipeline.php_tests + self.latency_tests))
+        except json.JSONDecodeError:
+            messagebox.showerror("Error", "Failed to parse JSON from curl output.")
+    def execute_curl(self):
+        curl_command = self.curl_input.get("1.0", tk.END).strip()
+        if not curl_command.startswith("curl"):
+            messagebox.showerror("Error", "Please enter a valid curl command.")
+            return
+        
+        try:
+            # Extract method and URL
+            method = "GET"
+            url = ""
+            data = []
+            parts = curl_command.split()
+            for i, part in enumerate(parts):
+                if part.startswith("http"):
+                    url = part
+                elif part == "-X" and i + 1 < len(parts) and parts[i + 1] in ["POST", "GET"]:
+                    method = parts[i + 1]
+                elif part == "-F" and i + 1 < len(parts):
+                    key_value = parts[i + 1].split("=", 1)
+                    if len(key_value) == 2:
+                        key, value = key_value
+                        data.append(self.form_data_entry(key.strip("'"), value.strip("'")))
+
+            # Execute the curl command and capture the response
+            result = subprocess.run(f"{curl_command} -w '\\n%{{http_code}} %{{time_total}}'", shell=True, capture_output=True, text=True)
+            if result.returncode != 0:
+                messagebox.showerror("Error", f"curl command failed with error: {result.stderr}")
+                return
+
+            # Extract the JSON string and status code from the output
+            output_parts = result.stdout.rsplit("\n", 1)
+            raw_json_string = output_parts[0].strip()
+            status_code, _, time_total = output_parts[1].strip().partition(" ")
+
+            # Display the status code
+            self.status_label.config(text=f"Status Code: {status_code}")
+            if status_code in ("429", "503"):
+                messagebox.showerror("Error", f"The server is throttling requests (HTTP {status_code}). Try again shortly.")
+                return
+
+            # Derived artifacts are computed lazily, only for the panes that are shown
+            path = self.extract_path_from_curl(curl_command)
+            test_type = self.test_type.get()
+            self.pipeline = ResponsePipeline(
+                raw_json_string, self,
+                lambda pipeline: self.generate_php_tests(
+                    path, pipeline.formatted_structure, test_type, data, pipeline.json_data
+                ),
+            )
+            self.latency_tests = ""
+            if self.latency_var.get():
+                self.start_latency_measurement(curl_command)
+            self.render_panes()
+            self.record_in_catalog(
+                curl_command, int(status_code), len(raw_json_string), float(time_total or 0) * 1000,
+                self.pipeline.computed("structure"), self.pipeline.computed("php_tests")
+            )
+
+        except json.JSONDecodeError:
+            messagebox.showerror("Error", "Failed to parse JSON from curl output.")
+        except Exception as e:
+            messagebox.showerror("Error", f"An error occurred: {str(e)}")
+    LATENCY_POLL_MS = 100
+
+    def start_latency_measurement(self, curl_command):
+        """Time the request on a worker thread so sampling does not freeze the window."""
+        request = CurlRequest.parse(curl_command)
+        if request.method != "GET":
+            # Repeating writes would create or modify records on every run
+            messagebox.showwarning("Latency", "Latency is only measured for GET requests.")
+            return
+        runs = int(self.latency_runs.get())
+        multiplier = float(self.latency_multiplier.get())
+        self.latency_generation += 1
+        threading.Thread(
+            target=self.run_latency_measurement,
+            args=(self.latency_generation, request, runs, multiplier),
+            daemon=True,
+        ).start()
+        if not self.latency_pending:
+            self.latency_pending = True
+            self.root.after(self.LATENCY_POLL_MS, self.poll_latency)
+
+    def run_latency_measurement(self, generation, request, runs, multiplier):
+        """Worker thread body: sample the request and hand the timings to the UI thread."""
+        try:
+            timings, error = measure_latency(self.http_client, request, runs=runs), None
+        except (OSError, http.client.HTTPException) as e:
+            timings, error = None, e
+        self.latency_results.put((generation, request, multiplier, timings, error))
+
+    def poll_latency(self):
+        """Show the latest measurement; results of a superseded request are dropped."""
+        try:
+            while True:
+                generation, request, multiplier, timings, error = self.latency_results.get_nowait()
+                if generation != self.latency_generation:
+                    continue
+                self.latency_pending = False
+                if error is not None:
+                    messagebox.showerror("Error", f"Latency measurement failed: {error}")
+                    continue
+                p95_ms = percentile(timings, 95)
+                self.status_label.config(
+                    text=f"{self.status_label.cget('text')}  |  p50 {percentile(timings, 50):.1f} ms, p95 {p95_ms:.1f} ms"
+                )
+                self.latency_tests = self.generate_latency_test(request.path, p95_ms, multiplier)
+                if self.pipeline is not None and self.generate_tests_var.get():
+                    self.show_php_tests(self.with_fast_helpers(self.pipeline.php_tests + self.latency_tests))
+        except queue.Empty:
+            pass
+        if self.latency_pending:
+            self.root.after(self.LATENCY_POLL_MS, self.poll_latency)
+
+    def probe_role_matrix(self):
+        curl_command = self.curl_input.get("1.0", tk.END).strip()
+        try:
+            request = CurlRequest.parse(curl_command)
+            roles = parse_roles(self.roles_input.get("1.0", tk.END))
+            if not roles:
+                messagebox.showerror("Error", "Enter at least one role.")
+                return
+            results = probe_roles(self.scheduler, request, roles)
+        except Exception as e:
+            messagebox.showerror("Error", f"Role probing failed: {str(e)}")
+            return
+        self.status_label.config(
+            text=self.with_scheduler_metrics(
+                "Status Codes: " + ", ".join(f"{role} {result['status']}" for (role, _), result in results.items())
+            )
+        )
+        data = [self.form_data_entry(name, value) for name, value in request.fields]
+        self.show_php_tests(self.generate_role_matrix_tests(request.path, request.method, results, data))
+
+    def probe_query_filters(self):
+        curl_command = self.curl_input.get("1.0", tk.END).strip()
+        filters = self.filters_input.get().strip()
+        params = None
+        if filters:
+            params = {}
+            for item in filters.split(","):
+                name, _, value = item.strip().partition("=")
+                params[name] = value
+        try:
+            request = CurlRequest.parse(curl_command)
+            results = probe_query_params(self.scheduler, request, params)
+        except Exception as e:
+            messagebox.showerror("Error", f"Filter probing failed: {str(e)}")
+            return
+        ignored = [name for name, result in results.items() if not result["affects"]]
+        self.status_label.config(
+            text=self.with_scheduler_metrics(
+                f"Filters affecting results: {len(results) - len(ignored)}, ignored: {', '.join(ignored) or 'none'}"
+            )
+        )
+        self.show_php_tests(self.generate_filter_tests(request.path, results))
+
+    def import_requests(self):
+        filenames = filedialog.askopenfilenames(
+            filetypes=[("HAR / Postman", "*.har *.json"), ("All files", "*.*")]
+        )
+        if not filenames:
+            return
+        try:
+            php_tests = []
+            for request, structure, tests in generate_tests_from_imports(
+                filenames, self.scheduler, self.get_prefix(), self.use_fast_tests()
+            ):
+                self.catalog.record(request, status=request.expected_status, structure=structure, tests=tests)
+                php_tests.append(f"// {request.method} {urlparse(request.url).path}{tests}")
+        except Exception as e:
+            messagebox.showerror("Error", f"Import failed: {str(e)}")
+            return
+        self.status_label.config(text=self.with_scheduler_metrics(f"Imported {len(php_tests)} request(s)"))
+        self.show_php_tests(self.with_fast_helpers("\n".join(php_tests)))
+
+    def export_schema(self):
+        if self.pipeline is None:
+            messagebox.showerror("Error", "Execute a curl command first.")
+            return
+        try:
+            json_data = self.pipeline.json_data
+        except json.JSONDecodeError:
+            messagebox.showerror("Error", "The last response is not JSON.")
+            return
+        filename = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON Schema", "*.json")])
+        if not filename:
+            return
+        with open(filename, "w") as file:
+            json.dump(export_json_schema(json_data), file, indent=4)
+
+    def record_in_catalog(self, curl_command, status, size, elapsed_ms, structure, php_tests):
+        try:
+            request = CurlRequest.parse(curl_command)
+        except ValueError:
+            return  # Unparseable for the catalog, e.g. unbalanced quotes curl itself tolerated
+        self.catalog.record(request, status, size, elapsed_ms, structure, php_tests)
+
+    def search_catalog(self):
+        entries = self.catalog.search(self.catalog_search.get().strip())
+        lines = [
+            f"{entry['method']:<7}{entry['path']:<60}{entry['status'] or '-':>5}"
+            f"{entry['elapsed_ms'] or 0:>10.1f} ms  {(entry['fingerprint'] or '-')[:12]}"
+            for entry in entries
+        ]
+        self.status_label.config(text=f"Catalog: {len(entries)} endpoint(s)")
+        self.show_php_tests("\n".join(lines))
+
+    def export_catalog_tests(self):
+        filename = filedialog.asksaveasfilename(defaultextension=".php", filetypes=[("PHP", "*.php")])
+        if filename:
+            self.catalog.export_tests(filename, self.catalog.search(self.catalog_search.get().strip()))
+
+    def compare_environments(self):
+        curl_command = self.curl_input.get("1.0", tk.END).strip()
+        environments = parse_environments(self.environments_input.get("1.0", tk.END))
+        if not environments:
+            messagebox.showerror("Error", "Enter at least one environment.")
+            return
+        try:
+            request = CurlRequest.parse(curl_command)
+            results = fan_out(self.scheduler, request, environments, self.get_prefix())
+        except Exception as e:
+            messagebox.showerror("Error", f"Comparison failed: {str(e)}")
+            return
+        self.status_label.config(
+            text=self.with_scheduler_metrics(
+                "Status Codes: " + ", ".join(f"{name} {result['status'] or 'error'}" for name, result in results.items())
+            )
+        )
+        self.show_php_tests(format_comparison(results))
+
+    def drift_report(self):
+        try:
+            report = detect_drift(self.catalog, rerun_structures(self.scheduler, self.catalog.requests()))
+        except Exception as e:
+            messagebox.showerror("Error", f"Drift check failed: {str(e)}")
+            return
+        self.status_label.config(text=self.with_scheduler_metrics(f"Drift: {len(report[2])} endpoint(s) changed"))
+        self.show_php_tests(format_drift_report(*report))
+
+    def with_scheduler_metrics(self, text):
+        metrics = self.scheduler.metrics()
+        return (
+            f"{text}  |  sent {metrics['sent']}, retries {metrics['retries']}, "
+            f"queued {metrics['queued']}, max wait {metrics['max_wait_seconds']:.1f} s"
+        )
+
+    def execute_and_copy_curl(self):
+        self.execute_curl()
+
+    def clear_curl_field(self):
+        self.curl_input.delete("1.0", tk.END)
+
+    def extract_variables_from_curl(self):
+        curl_command = self.curl_input.get("1.0", tk.END).strip()
+        request_type = self.request_type.get()
+
+        try:
+            if request_type == "POST":
+                self.parse_post_request(curl_command)
+            elif request_type == "GET":
+                self.parse_get_request(curl_command)
+            else:
+                messagebox.showerror("Error", "Unknown request type selected.")
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to extract variables from URL: {str(e)}")
+
+    def parse_get_request(self, curl_command):
+        start = curl_command.find("http")
+        url = curl_command[start:].split()[0]
+        parsed_url = urlparse(url)
+        query_params = parse_qs(parsed_url.query)
+        path = parsed_url.path
+
+        # Format the query parameters as individual PHP variables and append them to the URL
+        php_code = ""
+        for key, values in query_params.items():
+            var_name = self.camel_case(key)
+            php_code += f"${var_name} = '{unquote(values[0])}';\n"
+        
+        php_code += f"\n$response = $this->get('{path}?{list(query_params.keys())[0]}='.${self.camel_case(list(query_params.keys())[0])}"
+        for key in list(query_params.keys())[1:]:
+            var_name = self.camel_case(key)
+            php_code += f".'&{key}='.${var_name}"
+        php_code += ");"
+
+        # Generate and display PHP test methods
+        structure = self.output_text.get("1.0", tk.END).strip()  # Get the JSON structure
+        php_tests = self.generate_php_tests(path, structure, query_params)
+        self.show_php_tests(php_tests)
+
+
+    def parse_post_request(self, curl_command):
+        start = curl_command.find("http")
+        url = curl_command[start:].split()[0]
+        parsed_url = urlparse(url)
+        path = parsed_url.path
+
+        # Extract data fields from the curl command using -F option
+        data_segments = curl_command.split(" -F ")[1:]  # Extract data segments
+        php_array = "$data = [\n"
+        data = []
+        for segment in data_segments:
+            key, value = segment.split("=", 1)
+            key = key.strip().strip("'")
+            value = value.strip().strip("'")
+            php_array += f"    '{unquote(key)}' => '{unquote(value)}',\n"
+            if value.startswith("@"):
+                data.append(self.form_data_entry(key, value))
+            else:
+                data.append(f"'{key}' => '{value}'")
+        php_array = php_array.rstrip(",\n") + "\n];\n"
+
+        php_code = php_array + f"\n$response = $this->post('{path}', $data);"
+
+        # Display the PHP code in the output area
+        self.query_output.delete("1.0", tk.END)
+        self.query_output.insert(tk.END, php_code)
+        self.root.clipboard_clear()
+        self.root.clipboard_append(php_code)
+
+        # Generate and display PHP test methods
+        structure = self.output_text.get("1.0", tk.END).strip()  # Get the JSON structure
+        json_data = self.pipeline.json_data if self.pipeline else json.loads(self.raw_json_output.get("1.0", tk.END))
+        php_tests = self.generate_php_tests(path, structure, self.test_type.get(), data, json_data)
+        self.show_php_tests(php_tests)
+
+    def show_php_tests(self, php_tests):
+        # Show the PHP tests in the output area
+        self.query_output.pack(padx=10, pady=(0, 10))
+        self.query_output.delete("1.0", tk.END)
+        self.query_output.insert(tk.END, php_tests)
+
+    def toggle_raw_json(self):
+        if self.show_json_var.get():
+            self.raw_json_output.pack(padx=10, pady=(0, 10))
+            self.render_panes()
+        else:
+            self.raw_json_output.pack_forget()
+
+    def toggle_json_format(self):
+        if self.pipeline is not None:
+            self.render_panes()
+        elif self.pretty_json_var.get():
+            # Convert raw JSON to pretty JSON
+            raw_json = self.raw_json_output.get("1.0", tk.END).strip()
+            try:
+                pretty_json = json.dumps(json.loads(raw_json), indent=4)
+                self.raw_json_output.delete("1.0", tk.END)
+                self.raw_json_output.insert(tk.END, pretty_json)
+            except json.JSONDecodeError:
+                messagebox.showerror("Error", "Invalid JSON format.")
         else:
             # Convert pretty JSON back to raw JSON
             pretty_json = self.raw_json_output.get("1.0", tk.END).strip()
@@ -697,17 +2344,7 @@ class CurlJSONFormatterApp:
         start = curl_command.find("http")
         url = curl_command[start:].split()[0]
         parsed_url = urlparse(url)
-        path = parsed_url.path
-        
-        # Remove the ID and 'show' from the path for the show method
-        if path.endswith("/show") or path.endswith("/show'"):
-            parts = path.split('/')
-            return '/'.join(parts[:-2])  # Remove the last two parts (ID and 'show')
-         
-        if path.endswith("/update") or path.endswith("/update'"):
-            parts = path.split('/')
-            return '/'.join(parts[:-2])  
-        return path
+        return endpoint_path(parsed_url.path)
 
     def undo(self, event=None):
         if self.history:
@@ -724,7 +2361,146 @@ class CurlJSONFormatterApp:
             self.curl_input.insert(tk.END, next_state)
 
 
-# Create the application window and run the app
-root = tk.Tk()
-app = CurlJSONFormatterApp(root)
-root.mainloop()
\ No newline at end of file
+def run_gui():
+    root = tk.Tk()
+    CurlJSONFormatterApp(root)
+    root.mainloop()
+
+
+def main(argv=None):
+    """
+    Launch the GUI, or export/validate JSON Schemas when --schema or --validate is given.
+    """
+    parser = argparse.ArgumentParser(description="Curl JSON Formatter")
+    parser.add_argument("--schema", metavar="RESPONSE",
+                        help="print the JSON Schema inferred from a recorded JSON response")
+    parser.add_argument("--validate", metavar="SCHEMA",
+                        help="validate responses against a JSON Schema file")
+    parser.add_argument("responses", nargs="*",
+                        help="with --validate, JSON/JSON-lines files or directories of them")
+    parser.add_argument("--curl", metavar="COMMAND",
+                        help="with --validate, also send this curl command and validate its response")
+    parser.add_argument("--import", dest="imports", nargs="+", metavar="FILE",
+                        help="generate tests for every request in HAR files or Postman collections")
+    parser.add_argument("--send", action="store_true",
+                        help="with --import, send requests that have no recorded response")
+    parser.add_argument("--var", action="append", default=[], metavar="NAME=VALUE",
+                        help="with --import, value for a Postman {{variable}}")
+    parser.add_argument("--prefix", default="api/v1", help="route prefix of the generated tests")
+    parser.add_argument("--fast", action="store_true", help="emit fast tests (cached fixtures)")
+    parser.add_argument("--workers", type=int, help="processes used for --import")
+    parser.add_argument("--catalog", metavar="FILE",
+                        help="endpoint catalog to record --import results in or to --search")
+    parser.add_argument("--search", metavar="TEXT", nargs="?", const="",
+                        help="list catalog endpoints whose path contains TEXT")
+    parser.add_argument("--method", help="with --search, only this HTTP method")
+    parser.add_argument("--status", type=int, help="with --search, only this status code")
+    parser.add_argument("--export-tests", metavar="FILE",
+                        help="with --search, write the stored tests of the matches to FILE")
+    parser.add_argument("--compare", metavar="COMMAND",
+                        help="send this curl command to every --env and compare the results")
+    parser.add_argument("--env", action="append", default=[], metavar="NAME=BASE_URL",
+                        help="with --compare, an environment base URL (repeatable)")
+    parser.add_argument("--drift", action="store_true",
+                        help="compare response structures against the --catalog baselines, replaying "
+                             "--import files or re-sending the stored requests")
+    parser.add_argument("--accept", action="store_true",
+                        help="with --drift, store the observed structures as the new baselines")
+    parser.add_argument("--rate", type=float, default=10.0,
+                        help="requests per second per host for batch operations (default: 10)")
+    parser.add_argument("--max-per-host", type=int, default=4,
+                        help="requests in flight per host for batch operations (default: 4)")
+    args = parser.parse_args(argv)
+
+    scheduler = RequestScheduler(HttpClient(), rate=args.rate, max_per_host=args.max_per_host)
+    try:
+        return _run_cli(args, scheduler)
+    finally:
+        metrics = scheduler.metrics()
+        if metrics["sent"]:
+            print(
+                f"{metrics['sent']} request(s) sent, {metrics['retries']} retried after 429/503, "
+                f"average wait {metrics['average_wait_seconds']:.2f} s, max {metrics['max_wait_seconds']:.2f} s",
+                file=sys.stderr,
+            )
+        scheduler.close()
+
+
+def _run_cli(args, scheduler):
+    if args.drift:
+        catalog = EndpointCatalog(args.catalog) if args.catalog else EndpointCatalog()
+        if args.imports:
+            variables = dict(item.partition("=")[::2] for item in args.var)
+            parse_json_structure = PhpTestGenerator().parse_json_structure
+            observations = (
+                (request, parse_json_structure(json_data))
+                for filename in args.imports
+                for request, json_data in iter_imported_requests(filename, variables)
+                if json_data is not None
+            )
+        else:
+            observations = rerun_structures(scheduler, catalog.requests())
+        unchanged, new_endpoints, drifted = detect_drift(catalog, observations, args.accept)
+        print(format_drift_report(unchanged, new_endpoints, drifted))
+        return 1 if drifted and not args.accept else 0
+    if args.compare:
+        results = fan_out(
+            scheduler, CurlRequest.parse(args.compare), parse_environments("\n".join(args.env)), args.prefix
+        )
+        print(format_comparison(results))
+        return 0
+    catalog = EndpointCatalog(args.catalog) if args.catalog else None
+    if args.imports:
+        variables = dict(item.partition("=")[::2] for item in args.var)
+        client = scheduler if args.send else None
+        count = 0
+        for request, structure, php_tests in generate_tests_from_imports(
+            args.imports, client, args.prefix, args.fast, variables, args.workers
+        ):
+            count += 1
+            if catalog:
+                catalog.record(request, status=request.expected_status, structure=structure, tests=php_tests)
+            else:
+                print(f"// {request.method} {urlparse(request.url).path}{php_tests}")
+        print(f"{count} request(s) imported", file=sys.stderr)
+        return 0
+    if args.search is not None:
+        catalog = catalog or EndpointCatalog()
+        entries = catalog.search(args.search, args.method, args.status)
+        if args.export_tests:
+            catalog.export_tests(args.export_tests, entries)
+        for entry in entries:
+            print(f"{entry['method']:<7}{entry['path']:<60}{entry['status'] or '-':>5}  {entry['fingerprint'] or '-'}")
+        return 0
+
+    if args.schema:
+        with open(args.schema, "r") as file:
+            print(json.dumps(export_json_schema(json.load(file)), indent=4))
+        return 0
+    if not args.validate:
+        run_gui()
+        return 0
+
+    with open(args.validate, "r") as file:
+        validate = compile_validator(json.load(file))
+    responses = iter_recorded_responses(args.responses)
+    if args.curl:
+        live_response = scheduler.send(CurlRequest.parse(args.curl)).json()
+        responses = itertools.chain([("curl", live_response)], responses)
+
+    checked = failed = 0
+    start = time.perf_counter()
+    for source, json_data in responses:
+        checked += 1
+        errors = validate(json_data)
+        if errors:
+            failed += 1
+            print(f"{source}: " + "; ".join(errors))
+    elapsed = time.perf_counter() - start
+    rate = f", {checked / elapsed:.0f}/s" if elapsed else ""
+    print(f"{checked} response(s) checked, {failed} invalid{rate}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,74 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+CONTROLLER = """<?php
+
+namespace App\\Http\\Controllers;
+
+class ProcedureController extends Controller
+{
+    public function index(Request $request)
+    {
+        $query = Procedure::query();
+        if ($request->name) { $query->where('name', $request->name); }
+        return ProcedureResource::collection($query->paginate());
+    }
+
+    public function store(Request $request)
+    {
+        $this->validate($request, [
+            'name' => 'required|string',
+            'patient_id' => 'required|integer',
+            'price' => 'numeric',
+            'performed_on' => 'date_format:Y-m-d',
+            'active' => 'boolean',
+            'notes' => 'nullable|string',
+        ]);
+        $procedure = new Procedure();
+        $procedure->name = $request->name;
+        $procedure->patient_id = $request->patient_id;
+        $procedure->price = $request->price;
+        $procedure->performed_on = $request->performed_on;
+        $procedure->active = $request->active;
+        $procedure->notes = $request->notes;
+        $procedure->save();
+        return new ProcedureResource($procedure);
+    }
+
+    public function update(Request $request, Procedure $procedure)
+    {
+        $this->validate($request, [
+            'name' => 'required|string',
+            'price' => 'numeric',
+        ]);
+        $procedure->name = $request->name;
+        $procedure->price = $request->price;
+        $procedure->save();
+        return new ProcedureResource($procedure);
+    }
+
+    public function show(Procedure $procedure)
+    {
+        return new ProcedureResource($procedure);
+    }
+
+    public function delete(Procedure $procedure)
+    {
+        $procedure->delete();
+        return response()->json(['status' => 'success', 'message' => 'Procedimiento borrado']);
+    }
+}
+"""
+
+
+@pytest.fixture
+def controller_dir(tmp_path):
+    """A controllers directory holding one resource controller."""
+    directory = tmp_path / "Controllers"
+    directory.mkdir()
+    (directory / "ProcedureController.php").write_text(CONTROLLER, encoding="utf-8")
+    return directory
@@ -0,0 +1,306 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import docsgenerator
+
+SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "docsgenerator.py")
+
+
+def _watch_once(directory, *extra, seed="0"):
+    env = dict(os.environ, PYTHONHASHSEED=seed)
+    subprocess.run(
+        [sys.executable, SCRIPT, "--watch", str(directory), "--once", "--route-prefix", "/api/v1", *extra],
+        check=True, cwd=str(directory), env=env, capture_output=True,
+    )
+
+
+def test_write_back_is_idempotent_across_hash_seeds(controller_dir):
+    controller = controller_dir / "ProcedureController.php"
+    _watch_once(controller_dir, "--write-back", seed="1")
+    first = controller.read_bytes()
+    mtime = os.stat(controller).st_mtime_ns
+    _watch_once(controller_dir, "--write-back", seed="2")
+    assert controller.read_bytes() == first
+    assert os.stat(controller).st_mtime_ns == mtime
+
+
+def test_fields_keep_source_order(controller_dir):
+    code = (controller_dir / "ProcedureController.php").read_text(encoding="utf-8")
+    details, _, _, _ = docsgenerator.extract_details_from_controller(code)
+    assert list(details)[:3] == ["name", "patient_id", "price"]
+
+
+def _merge(controller_dir, spec_filename):
+    watcher = docsgenerator.ControllerWatcher(
+        str(controller_dir), route_prefix="/api/v1", spec_filename=str(spec_filename)
+    )
+    watcher.run_once()
+    return json.loads(spec_filename.read_text(encoding="utf-8"))
+
+
+def test_remerging_unchanged_controllers_leaves_spec_identical(controller_dir, tmp_path):
+    spec_filename = tmp_path / "openapi.json"
+    _merge(controller_dir, spec_filename)
+    first = spec_filename.read_bytes()
+    _merge(controller_dir, spec_filename)
+    assert spec_filename.read_bytes() == first
+
+
+def test_merge_replaces_changed_operation_in_place(controller_dir, tmp_path):
+    spec_filename = tmp_path / "openapi.json"
+    before = _merge(controller_dir, spec_filename)
+    controller = controller_dir / "ProcedureController.php"
+    code = controller.read_text(encoding="utf-8")
+    controller.write_text(code.replace("'price' => 'numeric',", "'price' => 'required|numeric',", 1))
+    after = _merge(controller_dir, spec_filename)
+
+    changed = [
+        (route, method) for route, path_item in after["paths"].items()
+        for method, operation in path_item.items()
+        if before["paths"][route][method] != operation
+    ]
+    assert changed == [("/api/v1/procedure", "post")]
+    assert [list(item) for item in after["paths"].values()] == [list(item) for item in before["paths"].values()]
+    assert list(after["components"]["schemas"]) == list(before["components"]["schemas"])
+
+
+def test_background_tag_save_error_is_reported_once(tmp_path):
+    manager = docsgenerator.TagManager(str(tmp_path / "missing" / "tags.json"), save_delay=0)
+    manager.add_tag("Clinic")
+    manager._flush_quietly()
+    assert isinstance(manager.pop_error(), OSError)
+    assert manager.pop_error() is None
+    manager.filename = str(tmp_path / "tags.json")
+    manager.flush()
+
+
+def test_yaml_output_round_trips_through_safe_load(controller_dir, tmp_path):
+    yaml = pytest.importorskip("yaml")
+    spec = docsgenerator.OpenApiSpec()
+    code = (controller_dir / "ProcedureController.php").read_text(encoding="utf-8")
+    details, route_param, status, message = docsgenerator.extract_details_from_controller(code)
+    for operation_type in ("store", "index", "show"):
+        spec.add_operation(details, route_param, "procedure", "/api/v1", operation_type, status, message)
+    spec.schemas["Reserved"] = {
+        "type": "object",
+        "properties": {
+            word: {"type": "string", "example": word}
+            for word in ("on", "off", "yes", "no", "y", "n", "true", "false", "null", "Yes", "~", "1e3", "0x1f")
+        },
+        "example": {"ratio": 1e-05, "big": 1e+20, "half": 0.5, "count": 3, "missing": None, "flag": False},
+    }
+    spec.paths["/on"] = {"get": {"operationId": "on", "responses": {"200": {"description": "no"}}, "x-ref": {
+        "$ref": "#/components/schemas/Reserved"}}}
+    filename = tmp_path / "openapi.yaml"
+    spec.write(str(filename))
+    assert yaml.safe_load(filename.read_text(encoding="utf-8")) == spec.to_dict()
+
+
+def test_examples_match_the_resolved_type(controller_dir):
+    code = (controller_dir / "ProcedureController.php").read_text(encoding="utf-8")
+    details, _, _, _ = docsgenerator.extract_details_from_controller(code)
+    schema = {field: docsgenerator.field_schema(field, props, "procedure") for field, props in details.items()}
+    assert schema["patient_id"]["example"] == 1
+    assert isinstance(schema["price"]["example"], float)
+    assert schema["active"]["example"] is True
+    assert schema["performed_on"]["format"] == "date"
+
+
+def test_date_format_is_date_time_only_with_a_time_component():
+    assert docsgenerator.translate_rule("date_format:Y-m-d")["format"] == "date"
+    assert docsgenerator.translate_rule("date_format:d/m/Y")["format"] == "date"
+    assert docsgenerator.translate_rule("date_format:Y-m-d H:i:s")["format"] == "date-time"
+    assert docsgenerator.translate_rule("required|date_format:Y-m-d\\TH:i")["format"] == "date-time"
+
+
+def test_write_back_merges_into_an_existing_doc_comment(controller_dir):
+    controller = controller_dir / "ProcedureController.php"
+    code = controller.read_text(encoding="utf-8")
+    controller.write_text(code.replace(
+        "    public function show(",
+        "    /**\n     * Show one procedure.\n     *\n     * @param Procedure $procedure\n     */\n    public function show(",
+    ), encoding="utf-8")
+    _watch_once(controller_dir, "--write-back")
+    first = controller.read_text(encoding="utf-8")
+    show_doc = first[:first.index("public function show(")]
+    show_doc = show_doc[show_doc.rindex("/**"):]
+    assert show_doc.count("/**") == 1
+    assert "Show one procedure." in show_doc and "@param Procedure $procedure" in show_doc
+    assert 'operationId="show_procedure"' in show_doc
+    _watch_once(controller_dir, "--write-back")
+    assert controller.read_text(encoding="utf-8") == first
+
+
+def test_atomic_write_gives_new_files_the_umask_mode(tmp_path):
+    previous = os.umask(0o022)
+    try:
+        filename = tmp_path / "tags.json"
+        docsgenerator.atomic_write(str(filename), "[]")
+        assert os.stat(filename).st_mode & 0o777 == 0o644
+        os.chmod(filename, 0o600)
+        docsgenerator.atomic_write(str(filename), "[1]")
+        assert os.stat(filename).st_mode & 0o777 == 0o600
+    finally:
+        os.umask(previous)
+
+
+def test_every_validated_key_is_documented_and_responses_are_not_rules():
+    code = """<?php
+    class UserController extends Controller
+    {
+        public function store(Request $request)
+        {
+            $request->validate([
+                'email' => 'required|email',
+                'role' => ['required', Rule::in(['admin', 'user'])],
+            ]);
+            User::create($request->all());
+            return response()->json(['status' => 'success', 'message' => 'ok']);
+        }
+
+        public function rules(): array
+        {
+            return ['price' => 'numeric'];
+        }
+    }
+    """
+    assert docsgenerator.extract_rules(code) == {
+        "email": "required|email", "role": "required|in:admin,user", "price": "numeric",
+    }
+    details, _, _, _ = docsgenerator.extract_details_from_controller(code)
+    assert list(details) == ["email", "role", "price"]
+    assert details["email"]["format"] == "email" and details["role"]["enum"] == ["admin", "user"]
+
+
+def test_recorded_response_schema_reaches_the_docblock(controller_dir, tmp_path):
+    responses = tmp_path / "responses"
+    responses.mkdir()
+    (responses / "show_procedure.json").write_text(json.dumps(
+        {"data": {"id": 1, "name": "x", "deleted_at": None, "notes": None}}
+    ), encoding="utf-8")
+    (responses / "show_procedure.page2.json").write_text(json.dumps(
+        {"data": {"id": 2, "name": "y", "deleted_at": None, "notes": "z"}}
+    ), encoding="utf-8")
+    schemas = docsgenerator.infer_response_schemas(str(responses), processes=False)
+    data = schemas["show_procedure"]["properties"]["data"]
+    assert "deleted_at" not in data["properties"] and "deleted_at" not in data["required"]
+    assert data["properties"]["notes"] == {"type": "string", "nullable": True}
+
+    code = (controller_dir / "ProcedureController.php").read_text(encoding="utf-8")
+    results = docsgenerator.generate_all_operations(code, "procedure", response_schemas=schemas)
+    show_doc = results["show"]["doc"]
+    assert 'example="[...]"' not in show_doc
+    assert '@OA\\Property(property="notes", type="string", nullable=true)' in show_doc
+    assert 'example="[...]"' in results["index"]["doc"]
+
+
+def test_null_only_values_get_no_typeless_schema():
+    assert docsgenerator.infer_response_schema(None) == {}
+    assert docsgenerator.infer_response_schema([None]) == {"type": "array", "items": {}}
+    assert docsgenerator.infer_response_schema({"a": None}) == {"type": "object", "properties": {}}
+
+
+def test_headless_import_does_not_load_multiprocessing():
+    code = "import sys, docsgenerator; print('concurrent.futures' in sys.modules, 'multiprocessing' in sys.modules)"
+    output = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True,
+        cwd=os.path.dirname(SCRIPT),
+    ).stdout
+    assert output.split() == ["False", "False"]
+
+
+def test_tag_managers_in_several_processes_merge_their_changes(tmp_path):
+    filename = tmp_path / "tags.json"
+    script = (
+        "import sys, docsgenerator\n"
+        "manager = docsgenerator.TagManager(sys.argv[1], save_delay=60)\n"
+        "for index in range(5):\n"
+        "    manager.add_tag(f'{sys.argv[2]}{index}')\n"
+        "    manager.flush()\n"
+        "manager.delete_tag('Portal')\n"
+        "manager.flush()\n"
+    )
+    processes = [
+        subprocess.Popen([sys.executable, "-c", script, str(filename), prefix], cwd=os.path.dirname(SCRIPT))
+        for prefix in ("a", "b", "c", "d")
+    ]
+    assert [process.wait(timeout=60) for process in processes] == [0] * 4
+
+    names = [tag["name"] for tag in json.loads(filename.read_text(encoding="utf-8"))]
+    assert sorted(names) == sorted(["Backoffice"] + [f"{prefix}{index}" for prefix in "abcd" for index in range(5)])
+    assert docsgenerator.TagManager(str(filename)).get_route_prefix("c3") == "/api/v1/c3"
+
+
+def test_yaml_spec_is_merged_instead_of_rewritten(controller_dir, tmp_path):
+    yaml = pytest.importorskip("yaml")
+    spec_filename = tmp_path / "openapi.yaml"
+    json_spec = _merge(controller_dir, tmp_path / "openapi.json")
+    watcher = docsgenerator.ControllerWatcher(
+        str(controller_dir), route_prefix="/api/v1", spec_filename=str(spec_filename)
+    )
+    watcher.run_once()
+    assert yaml.safe_load(spec_filename.read_text(encoding="utf-8")) == json_spec
+    first = spec_filename.read_bytes()
+    mtime = os.stat(spec_filename).st_mtime_ns
+
+    spec = docsgenerator.OpenApiSpec.load(str(spec_filename))
+    assert set(spec.operations) == {operation["operationId"] for item in json_spec["paths"].values()
+                                    for operation in item.values()}
+    docsgenerator.ControllerWatcher(
+        str(controller_dir), route_prefix="/api/v1", spec_filename=str(spec_filename)
+    ).run_once()
+    assert spec_filename.read_bytes() == first
+    assert os.stat(spec_filename).st_mtime_ns == mtime
+
+
+def test_yaml_spec_without_pyyaml_is_rejected(tmp_path, monkeypatch):
+    spec_filename = tmp_path / "openapi.yml"
+    spec_filename.write_text("openapi: 3.0.3\n", encoding="utf-8")
+    monkeypatch.setitem(sys.modules, "yaml", None)
+    with pytest.raises(ValueError, match="PyYAML"):
+        docsgenerator.OpenApiSpec.load(str(spec_filename))
+
+
+def test_single_operation_docs_use_the_same_scope_as_generate_all(controller_dir):
+    code = (controller_dir / "ProcedureController.php").read_text(encoding="utf-8")
+    results = docsgenerator.generate_all_operations(code, "procedure", "/api/v1")
+    for operation_type, result in results.items():
+        assert docsgenerator.generate_operation_doc(
+            code, "procedure", "/api/v1", operation_type, "Backoffice"
+        ) == result["doc"]
+    update_doc = results["update"]["doc"]
+    assert 'property="name"' in update_doc and 'property="patient_id"' not in update_doc
+
+
+def test_write_back_keeps_tags_below_the_annotation_in_place(controller_dir):
+    controller = controller_dir / "ProcedureController.php"
+    code = controller.read_text(encoding="utf-8")
+    controller.write_text(code.replace(
+        "    public function show(",
+        "    /**\n"
+        "     * Show one procedure.\n"
+        "     *\n"
+        "     * @OA\\Get(\n"
+        "     *     path=\"/old\", description=\"Old (stale)\",\n"
+        "     *     @OA\\Response(response=200, description=\"ok\")\n"
+        "     * )\n"
+        "     *\n"
+        "     * @throws ModelNotFoundException\n"
+        "     * @return ProcedureResource\n"
+        "     */\n"
+        "    public function show(",
+    ), encoding="utf-8")
+    _watch_once(controller_dir, "--write-back")
+    first = controller.read_text(encoding="utf-8")
+    show_doc = first[first.rindex("/**", 0, first.index("public function show(")):first.index("public function show(")]
+    assert 'path="/old"' not in show_doc
+    lines = [line.strip() for line in show_doc.splitlines() if line.strip()]
+    annotation = lines.index("* @OA\\GET(")
+    assert lines.index("* Show one procedure.") < annotation < lines.index("* @throws ModelNotFoundException")
+    assert lines[-3:-1] == ["* @throws ModelNotFoundException", "* @return ProcedureResource"]
+    _watch_once(controller_dir, "--write-back")
+    assert controller.read_text(encoding="utf-8") == first
@@ -0,0 +1,393 @@
+import io
+import json
+import queue
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from unittest.mock import MagicMock
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+import pather
+
+HELPER_CALL = re.compile(r"\$this->(cachedUser|firstId|lastId)\(")
+
+
+def _fast_outputs():
+    generator = pather.PhpTestGenerator(prefix="/api/v1", fast=True)
+    json_data = {"data": [{"id": 1, "name": "x"}], "meta": {"total": 1}}
+    data = ["'name'=>'Foo'"]
+    outputs = {
+        test_type: generator.generate_php_tests("/api/v1/procedure", None, test_type, data, json_data)
+        for test_type in ("List", "Create", "Show", "Update")
+    }
+    outputs["role_matrix"] = generator.generate_role_matrix_tests(
+        "/api/v1/procedure", "GET",
+        {("admin", "admin@pruebas.com"): {"status": 200, "json": json_data},
+         ("guest", "guest@pruebas.com"): {"status": 403, "json": None}},
+    )
+    outcome = {"status": 200, "count": 1}
+    outputs["filters"] = generator.generate_filter_tests("/api/v1/procedure", {
+        "name": {"affects": True, "value": "x", "valid": outcome, "invalid": outcome, "empty": outcome},
+    })
+    outputs["latency"] = generator.generate_latency_test("/api/v1/procedure", 12.5)
+    outputs["combined"] = generator.with_fast_helpers(outputs["List"] + outputs["latency"])
+    return outputs
+
+
+@pytest.mark.parametrize("name, tests", sorted(_fast_outputs().items()))
+def test_fast_outputs_define_each_helper_they_call_once(name, tests):
+    for helper in set(HELPER_CALL.findall(tests)):
+        assert len(re.findall(rf"function {helper}\(", tests)) == 1, f"{name} calls {helper} without defining it once"
+
+
+def test_default_outputs_do_not_use_the_helpers():
+    generator = pather.PhpTestGenerator(prefix="/api/v1")
+    tests = generator.generate_latency_test("/api/v1/procedure", 10.0)
+    assert not HELPER_CALL.search(tests)
+    assert "function cachedUser" not in tests
+
+
+def test_har_import_carries_the_recorded_status(tmp_path):
+    har = {"log": {"entries": [{
+        "request": {
+            "method": "POST", "url": "https://api.example.com/api/v1/procedure", "headers": [],
+            "postData": {"mimeType": "application/json", "text": "{\"name\": \"x\"}"},
+        },
+        "response": {
+            "status": 422,
+            "content": {"mimeType": "application/json", "text": "{\"message\": \"invalid\"}"},
+        },
+    }]}}
+    filename = tmp_path / "session.har"
+    filename.write_text(json.dumps(har), encoding="utf-8")
+
+    (request, structure, tests), = pather.generate_tests_from_imports([str(filename)], max_workers=1)
+    assert request.expected_status == 422
+    assert "assertStatus(422)" in tests
+    assert "assertStatus(201)" not in tests
+    assert pather.CurlRequest.from_dict(request.to_dict()).expected_status == 422
+
+
+def test_roles_sharing_a_fixture_email_stay_distinct():
+    roles = pather.parse_roles(
+        "admin@pruebas.com Authorization: Bearer a\n"
+        "admin@pruebas.com Authorization: Bearer b\n"
+        "readonly admin@pruebas.com Cookie: session=xyz\n"
+    )
+    assert [role[:2] for role in roles] == [
+        ("admin", "admin@pruebas.com"), ("admin_2", "admin@pruebas.com"), ("readonly", "admin@pruebas.com"),
+    ]
+    assert roles[2][2:] == ("Cookie", "session=xyz")
+
+    class Client:
+        def send(self, request):
+            status = {"Bearer a": 200, "Bearer b": 403}.get(request.headers.get("Authorization"), 401)
+            return pather.HttpResponse(status, {}, b"{}", 0.0)
+
+    results = pather.probe_roles(Client(), pather.CurlRequest("GET", "http://localhost/api/v1/x"), roles)
+    assert [result["status"] for result in results.values()] == [200, 403, 401]
+    tests = pather.PhpTestGenerator().generate_role_matrix_tests("/api/v1/x", "GET", results)
+    assert all(f"_as_{role}()" in tests for role in ("admin", "admin_2", "readonly"))
+
+
+def test_upload_fields_are_streamed_with_an_exact_content_length(tmp_path):
+    upload = tmp_path / "scan.pdf"
+    upload.write_bytes(b"%PDF" + bytes(200000))
+    request = pather.CurlRequest(
+        "POST", "http://localhost/api/v1/x", fields=[("name", "Foo"), ("scan", f"@{upload};filename=x.pdf")]
+    )
+    body, headers = request.encode_body()
+    payload = b"".join(body)
+    assert int(headers["Content-Length"]) == len(payload)
+    assert b'filename="x.pdf"\r\nContent-Type: application/pdf' in payload
+    assert upload.read_bytes() in payload
+
+    plain = pather.parse_form_value("note;with;semicolons")
+    assert plain["path"] is None and plain["value"] == "note;with;semicolons"
+
+
+def test_missing_upload_file_is_rejected_while_parsing(tmp_path):
+    with pytest.raises(ValueError, match="missing.pdf"):
+        pather.parse_form_value(f"@{tmp_path / 'missing.pdf'}")
+
+
+def test_uploads_are_left_out_of_database_assertions(tmp_path):
+    upload = tmp_path / "scan.pdf"
+    upload.write_bytes(b"%PDF")
+    generator = pather.PhpTestGenerator(prefix="/api/v1")
+    data = ["'name'=>'Foo'", generator.form_data_entry("scan", f"@{upload}")]
+    json_data = {"data": {"id": 1, "name": "Foo"}}
+    for tests in (
+        generator.generate_create_tests("/api/v1/procedure", data, json_data),
+        generator.generate_update_tests("/api/v1/procedure", data, json_data),
+    ):
+        database_assertion = tests[tests.index("assertDatabaseHas"):]
+        database_assertion = database_assertion[:database_assertion.index(");")]
+        assert "UploadedFile" not in database_assertion and "'name'=>'Foo'" in database_assertion
+        assert "\\Illuminate\\Http\\UploadedFile::fake()" in tests
+
+
+class _FakeServer:
+    """HttpClient stand-in answering with scripted (status, headers) pairs and tracking concurrency."""
+    def __init__(self, replies=(), delay=0.0):
+        self.replies = list(replies)
+        self.delay = delay
+        self.sent = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def send(self, request):
+        with self.lock:
+            self.sent += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            status, headers = self.replies.pop(0) if self.replies else (200, {})
+        time.sleep(self.delay)
+        with self.lock:
+            self.in_flight -= 1
+        return pather.HttpResponse(status, headers, b"{}", self.delay)
+
+    def close(self):
+        pass
+
+
+def test_scheduler_caps_requests_in_flight_per_host():
+    server = _FakeServer(delay=0.02)
+    scheduler = pather.RequestScheduler(server, rate=1000, max_per_host=2)
+    request = pather.CurlRequest("GET", "http://localhost/api/v1/x")
+    with ThreadPoolExecutor(8) as executor:
+        statuses = list(executor.map(lambda _: scheduler.send(request).status, range(8)))
+    assert statuses == [200] * 8
+    assert server.max_in_flight == 2
+    assert scheduler.metrics()["sent"] == 8
+
+
+def test_scheduler_retries_throttled_responses_after_retry_after():
+    server = _FakeServer([(429, {"retry-after": "0.05"}), (503, {"retry-after": "0"})])
+    scheduler = pather.RequestScheduler(server, rate=1000, base_delay=10, max_delay=30)
+    start = time.monotonic()
+    response = scheduler.send(pather.CurlRequest("GET", "http://localhost/api/v1/x"))
+    assert response.status == 200 and server.sent == 3
+    # Retry-After was honoured instead of the 10 s jittered backoff
+    assert 0.05 <= time.monotonic() - start < 1
+    assert scheduler.metrics()["retries"] == 2
+
+    server = _FakeServer([(429, {})] * 3)
+    scheduler = pather.RequestScheduler(server, rate=1000, max_retries=2, base_delay=0.001)
+    assert scheduler.send(pather.CurlRequest("GET", "http://localhost/api/v1/x")).status == 429
+    assert server.sent == 3
+
+
+def test_http_client_lower_cases_response_header_names():
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(429)
+            self.send_header("RETRY-AFTER", "7")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.handle_request, daemon=True).start()
+    try:
+        client = pather.HttpClient(timeout=5)
+        response = client.send(pather.CurlRequest("GET", f"http://127.0.0.1:{server.server_port}/"))
+        client.close()
+    finally:
+        server.server_close()
+    assert response.headers["retry-after"] == "7"
+    assert pather.RequestScheduler(client, max_delay=30)._backoff(0, response) == 7.0
+
+
+def test_query_probe_flags_only_parameters_that_change_the_response():
+    rows = [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}]
+
+    class Client:
+        def send(self, request):
+            query = parse_qs(urlparse(request.url).query, keep_blank_values=True)
+            if query.get("name") == ["invalid"]:
+                return pather.HttpResponse(422, {}, b'{"message": "invalid"}', 0.0)
+            data = [row for row in rows if query.get("name", [""])[0] in ("", row["name"])]
+            return pather.HttpResponse(200, {}, json.dumps({"data": data}).encode(), 0.0)
+
+    request = pather.CurlRequest("GET", "http://localhost/api/v1/x?name=a&ignored=1")
+    results = pather.probe_query_params(Client(), request)
+    assert list(results) == ["name", "ignored"]
+    assert results["name"]["affects"] and not results["ignored"]["affects"]
+    assert results["name"]["valid"]["count"] == 1
+    assert results["name"]["invalid"]["status"] == 422
+    assert results["name"]["empty"]["count"] == 2
+
+    tests = pather.PhpTestGenerator().generate_filter_tests("/api/v1/x", results)
+    assert "name" in tests and "ignored" not in tests
+
+
+def test_exported_schema_validator_reports_structure_violations():
+    json_data = {"data": [{"id": 1, "owner": {"name": "x"}}], "meta": {"total": 1}}
+    schema = pather.export_json_schema(json_data)
+    assert schema["$schema"].startswith("http://json-schema.org/draft-07")
+    assert schema["properties"]["data"] == {"type": "array", "items": {
+        "type": "object", "required": ["id", "owner"], "properties": {
+            "id": {}, "owner": {"type": "object", "required": ["name"], "properties": {"name": {}}},
+        },
+    }}
+
+    validate = pather.compile_validator(schema)
+    assert validate(json_data) == []
+    assert validate({"data": [{"id": 2, "owner": {"name": "y"}, "extra": True}], "meta": {"total": 9}}) == []
+    assert validate({"data": [{"id": 1, "owner": {}}, {"owner": "x"}]}) == [
+        "$.meta: missing", "$.data.0.owner.name: missing", "$.data.1.id: missing", "$.data.1.owner: expected object",
+    ]
+    assert pather.compile_validator(pather.export_json_schema(json_data)) is validate
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 1 << 16])
+def test_json_array_is_streamed_across_chunk_boundaries(chunk_size):
+    entries = [{"request": {"url": f"https://x/{index}", "text": "\"quoted\" ] , [" * index}} for index in range(20)]
+    document = json.dumps({"log": {"version": "1.2", "entries": entries, "pages": [1]}}, indent=1)
+    assert list(pather.iter_json_array(io.StringIO(document), "entries", chunk_size)) == entries
+    assert list(pather.iter_json_array(io.StringIO(document), "missing", chunk_size)) == []
+    assert list(pather.iter_json_array(io.StringIO('{"entries": []}'), "entries", chunk_size)) == []
+
+
+def test_har_multipart_and_postman_items_become_requests(tmp_path):
+    har = {"log": {"entries": [{
+        "request": {
+            "method": "post", "url": "https://api.example.com/api/v1/procedure",
+            "headers": [{"name": "Content-Type", "value": "multipart/form-data; boundary=x"}],
+            "postData": {"mimeType": "multipart/form-data", "params": [{"name": "name", "value": "Foo"}]},
+        },
+        "response": {"status": 0, "content": {}},
+    }]}}
+    har_file = tmp_path / "session.har"
+    har_file.write_text(json.dumps(har), encoding="utf-8")
+    postman = {"info": {}, "item": [{"name": "folder", "item": [{
+        "request": {"method": "GET", "url": {"raw": "{{base}}/api/v1/procedure"}, "header": []},
+        "response": [{"code": 200, "body": "{\"data\": []}"}],
+    }]}]}
+    postman_file = tmp_path / "collection.json"
+    postman_file.write_text(json.dumps(postman), encoding="utf-8")
+
+    (har_request, har_json), = pather.iter_imported_requests(str(har_file))
+    assert (har_request.method, har_request.fields, har_request.headers) == ("POST", [("name", "Foo")], {})
+    assert har_request.expected_status is None and har_json is None
+    (postman_request, postman_json), = pather.iter_imported_requests(
+        str(postman_file), {"base": "https://api.example.com"}
+    )
+    assert postman_request.url == "https://api.example.com/api/v1/procedure"
+    assert postman_json == {"data": []}
+
+
+def test_requests_are_rebased_onto_each_environment():
+    request = pather.CurlRequest("GET", "http://localhost:8000/api/v1/procedure?page=2", {"Accept": "json"})
+    assert pather.rebase_request(request, "https://staging.example.com").url == \
+        "https://staging.example.com/api/v1/procedure?page=2"
+    assert pather.rebase_request(request, "https://new.example.com/api/v2/", "api/v1").url == \
+        "https://new.example.com/api/v2/procedure?page=2"
+    assert pather.rebase_request(request, "https://staging.example.com").headers == {"Accept": "json"}
+    assert request.url == "http://localhost:8000/api/v1/procedure?page=2"
+
+
+def test_fan_out_collects_one_result_per_environment_in_order():
+    class Client:
+        def send(self, request):
+            host = urlparse(request.url).netloc
+            if host == "down":
+                raise ConnectionRefusedError("refused")
+            body = {"data": [{"id": 1}]} if host == "a" else {"data": [{"id": 1, "name": "x"}]}
+            return pather.HttpResponse(200, {}, json.dumps(body).encode(), 0.01 if host == "a" else 0.02)
+
+    results = pather.fan_out(
+        Client(), pather.CurlRequest("GET", "http://localhost/api/v1/x"),
+        {"local": "http://a", "staging": "http://b", "broken": "http://down"},
+    )
+    assert list(results) == ["local", "staging", "broken"]
+    assert results["staging"]["url"] == "http://b/api/v1/x"
+    assert results["staging"]["structure"] == {"data": {"*": {"id": None, "name": None}}}
+    assert results["broken"]["error"] == "refused" and results["broken"]["status"] is None
+    assert "+data.*.name" in pather.format_comparison(results).splitlines()[2]
+
+
+def test_drift_is_reported_only_for_changed_structures(tmp_path):
+    catalog = pather.EndpointCatalog(str(tmp_path / "catalog.sqlite3"))
+    list_request = pather.CurlRequest("GET", "http://localhost/api/v1/procedure")
+    show_request = pather.CurlRequest("GET", "http://localhost/api/v1/procedure/12/show")
+    catalog.record(list_request, structure={"data": {"*": {"id": None, "name": None}}})
+    catalog.record(show_request, structure={"data": {"id": None}})
+
+    observations = [
+        (list_request, {"data": {"*": {"id": None, "title": None}}}),
+        (pather.CurlRequest("GET", "http://localhost/api/v1/procedure/99/show"), {"data": {"id": None}}),
+        (pather.CurlRequest("GET", "http://localhost/api/v1/patient"), {"data": []}),
+    ]
+    unchanged, new_endpoints, drifted = pather.detect_drift(catalog, observations)
+    assert unchanged == 1
+    assert new_endpoints == [("GET", "/api/v1/patient")]
+    assert drifted == [("GET", "/api/v1/procedure", ["data.*.title"], ["data.*.name"])]
+
+    pather.detect_drift(catalog, observations, accept=True)
+    assert pather.detect_drift(catalog, observations) == (3, [], [])
+    catalog.close()
+
+
+def test_fast_id_helpers_allow_an_empty_table():
+    helpers = pather.PhpTestGenerator.FAST_TEST_HELPERS
+    assert "function firstId(string $model): ?int" in helpers
+    assert "function lastId(string $model): ?int" in helpers
+
+
+def test_latency_is_measured_off_the_ui_thread_and_polled():
+    app = pather.CurlJSONFormatterApp.__new__(pather.CurlJSONFormatterApp)
+    app.root = MagicMock()
+    app.latency_runs, app.latency_multiplier = MagicMock(), MagicMock()
+    app.latency_runs.get.return_value = "3"
+    app.latency_multiplier.get.return_value = "2.0"
+    app.status_label = MagicMock()
+    app.status_label.cget.return_value = "Status Code: 200"
+    app.generate_tests_var = MagicMock()
+    app.fast_tests_var = MagicMock()
+    app.fast_tests_var.get.return_value = False
+    app.pipeline = None
+    app.latency_tests = ""
+    app.latency_results = queue.Queue()
+    app.latency_generation = 0
+    app.latency_pending = False
+    ui_thread = threading.get_ident()
+    sampled_on = []
+
+    class Client:
+        def send(self, request):
+            sampled_on.append(threading.get_ident())
+            return pather.HttpResponse(200, {}, b"{}", 0.005)
+
+    app.http_client = Client()
+    app.start_latency_measurement("curl http://localhost/api/v1/procedure")
+    app.root.after.assert_called_once_with(app.LATENCY_POLL_MS, app.poll_latency)
+    for _ in range(200):
+        if not app.latency_results.empty():
+            break
+        time.sleep(0.01)
+    app.poll_latency()
+
+    assert len(sampled_on) == 5 and ui_thread not in sampled_on
+    assert not app.latency_pending
+    assert "test_get_api_v1_procedure_latency_budget" in app.latency_tests
+    assert "assertLessThan(10," in app.latency_tests
+
+
+def test_catalog_search_treats_wildcards_literally(tmp_path):
+    catalog = pather.EndpointCatalog(str(tmp_path / "catalog.sqlite3"))
+    for path in ("/api/v1/medical_record", "/api/v1/medicalxrecord", "/api/v1/100%", "/api/v1/1000", "/api/v1/a\\b"):
+        catalog.record(pather.CurlRequest("GET", f"http://localhost{path}"), status=200)
+    assert [entry["path"] for entry in catalog.search("medical_")] == ["/api/v1/medical_record"]
+    assert [entry["path"] for entry in catalog.search("100%")] == ["/api/v1/100%"]
+    assert [entry["path"] for entry in catalog.search("a\\b")] == ["/api/v1/a\\b"]
+    assert len(catalog.search("api")) == 5
+    catalog.close()